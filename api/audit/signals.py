@@ -6,6 +6,8 @@ from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 from django.forms.models import model_to_dict
 
+from core.tracing import traced
+
 from .middleware import get_current_ip, get_current_user
 from .models import AuditLog
 
@@ -41,6 +43,7 @@ def _get_clean_dict(instance):
 
 
 @receiver(pre_save)
+@traced("audit.capture_old_state")
 def capture_old_state(sender, instance, **kwargs):
     if sender.__name__ in IGNORED_MODELS:
         return
@@ -57,6 +60,7 @@ def capture_old_state(sender, instance, **kwargs):
 
 
 @receiver(post_save)
+@traced("audit.log_save")
 def log_save(sender, instance, created, **kwargs):
     if sender.__name__ in IGNORED_MODELS:
         return
@@ -105,6 +109,7 @@ def log_save(sender, instance, created, **kwargs):
 
 
 @receiver(post_delete)
+@traced("audit.log_delete")
 def log_delete(sender, instance, **kwargs):
     if sender.__name__ in IGNORED_MODELS:
         return
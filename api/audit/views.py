@@ -1,6 +1,10 @@
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, permissions, viewsets
 
+from core.db_routers import ReplicaReadMixin
+from core.filters import DateRangeFilterBackend
+from core.streaming import StreamingListMixin
+
 from .models import AuditLog
 from .serializers import AuditLogSerializer
 
@@ -14,7 +18,9 @@ class IsAdminUser(permissions.BasePermission):
         )
 
 
-class AuditLogViewSet(viewsets.ReadOnlyModelViewSet):
+class AuditLogViewSet(
+    ReplicaReadMixin, StreamingListMixin, viewsets.ReadOnlyModelViewSet
+):
     """
     Read-only view for audit logs. Only accessible by Admins.
     """
@@ -25,10 +31,12 @@ class AuditLogViewSet(viewsets.ReadOnlyModelViewSet):
 
     filter_backends = [
         DjangoFilterBackend,
+        DateRangeFilterBackend,
         filters.SearchFilter,
         filters.OrderingFilter,
     ]
     filterset_fields = ["action", "table_name", "actor", "ip_address"]
+    date_range_field = "timestamp"
     # NOTE: Searching JSON fields can be backend-dependent; we keep them out
     # of default search for reliability (esp. SQLite). Users can still search
     # by record/table/action/actor/ip.
@@ -41,10 +49,3 @@ class AuditLogViewSet(viewsets.ReadOnlyModelViewSet):
         "actor__full_name",
     ]
     ordering_fields = ["timestamp", "action", "table_name"]
-
-    def get_queryset(self):
-        queryset = super().get_queryset()
-        start_date = self.request.query_params.get("start_date")
-        if start_date:
-            queryset = queryset.filter(timestamp__gte=start_date)
-        return queryset
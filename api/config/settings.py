@@ -39,17 +39,20 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "core.middleware.MetricsMiddleware",
+    "core.middleware.TracingMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "core.middleware.ProfilingMiddleware",
     "audit.middleware.AuditMiddleware",
     "core.middleware.NoCacheMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
-    "djangorestframework_camel_case.middleware.CamelCaseMiddleWare",
+    "core.middleware.CamelCaseQueryParamsMiddleware",
 ]
 
 ROOT_URLCONF = "config.urls"
@@ -79,13 +82,64 @@ WSGI_APPLICATION = "config.wsgi.application"
 DATABASE_URL = config("DATABASE_URL")
 DATABASES = {"default": dj_database_url.config(default=config("DATABASE_URL"))}
 
-# Cache Configuration (Required for Rate Limiting)
-CACHES = {
-    "default": {
-        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
-        "LOCATION": "unique-snowflake",
+# Optional read replica for reports, dashboards and log browsing
+# (see core.db_routers). Writes and everything else stay on "default".
+REPLICA_DATABASE_URL = config("REPLICA_DATABASE_URL", default="")
+if REPLICA_DATABASE_URL:
+    DATABASES["replica"] = {
+        **dj_database_url.parse(REPLICA_DATABASE_URL),
+        "TEST": {"MIRROR": "default"},
     }
+DATABASE_ROUTERS = ["core.db_routers.ReplicaRouter"]
+
+# `?pool_size=N` on a DATABASE_URL (optionally with pool_max_lifetime and
+# pool_timeout, in seconds) switches that database to a pooled backend
+# wrapper; see core.db_backends.pool.
+POOLED_ENGINES = {
+    "django.db.backends.mysql": "core.db_backends.mysql_pooled",
+    "django.db.backends.sqlite3": "core.db_backends.sqlite3_pooled",
 }
+for _database in DATABASES.values():
+    options = _database.get("OPTIONS", {})
+    if "pool_size" in options and _database["ENGINE"] in POOLED_ENGINES:
+        _database["ENGINE"] = POOLED_ENGINES[_database["ENGINE"]]
+
+# Worker threads (each with its own DB connection) used to evaluate
+# independent dashboard sections concurrently; 1 runs them in-line.
+SECTION_MAX_WORKERS = config("SECTION_MAX_WORKERS", default=4, cast=int)
+
+# Cache Configuration (Required for Rate Limiting)
+# Shared by every worker so throttles, resource versions and cached values
+# agree across processes:
+#   redis://host:6379/0         production (Redis or any Redis-compatible server)
+#   sqlite:////path/cache.db    single node; all workers share the file
+#   locmem://                   per-process, for tests
+CACHE_URL = config(
+    "CACHE_URL", default=f"sqlite:///{BASE_DIR / '.cache' / 'cache.sqlite3'}"
+)
+if CACHE_URL.startswith(("redis://", "rediss://", "unix://")):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": CACHE_URL,
+            "KEY_PREFIX": "bakery",
+        }
+    }
+elif CACHE_URL.startswith("sqlite:///"):
+    CACHES = {
+        "default": {
+            "BACKEND": "core.cache_backends.SQLiteCache",
+            "LOCATION": CACHE_URL.removeprefix("sqlite:///"),
+            "OPTIONS": {"MAX_ENTRIES": 100_000},
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "unique-snowflake",
+        }
+    }
 
 # Password validation
 
@@ -114,6 +168,15 @@ STATIC_ROOT = os.path.join(BASE_DIR, "static")
 MEDIA_URL = ""
 MEDIA_ROOT = os.path.join(BASE_DIR, "media")
 
+# Finished Excel exports, reused until the data they cover changes
+EXPORT_CACHE_DIR = config(
+    "EXPORT_CACHE_DIR", default=os.path.join(MEDIA_ROOT, "exports")
+)
+# Worker processes building export sheets in parallel (0 builds them
+# in-process), and the address-space cap of each worker in MB (0: none)
+EXPORT_WORKERS = config("EXPORT_WORKERS", default=0, cast=int)
+EXPORT_WORKER_MEMORY_MB = config("EXPORT_WORKER_MEMORY_MB", default=1024, cast=int)
+
 # User Model
 
 AUTH_USER_MODEL = "users.User"
@@ -133,6 +196,23 @@ CORS_ALLOW_CREDENTIALS = True
 THROTTLE_ANON_RATE = config("THROTTLE_ANON_RATE", default="100/hour")
 THROTTLE_USER_RATE = config("THROTTLE_USER_RATE", default="1000/hour")
 
+# Request metrics (see core.metrics). Each worker flushes its totals to
+# METRICS_DIR at most every METRICS_FLUSH_INTERVAL seconds.
+METRICS_DIR = config("METRICS_DIR", default=os.path.join(BASE_DIR, ".metrics"))
+METRICS_FLUSH_INTERVAL = config("METRICS_FLUSH_INTERVAL", default=5, cast=float)
+METRICS_TOKEN = config("METRICS_TOKEN", default="")
+
+# On-demand request profiles (see core.profiling)
+PROFILE_DIR = config("PROFILE_DIR", default=os.path.join(BASE_DIR, ".profiles"))
+PROFILE_KEEP = config("PROFILE_KEEP", default=50, cast=int)
+
+# Request tracing (see core.tracing). TRACING_EXPORTER is "json" or "otlp".
+TRACING_SAMPLE_RATE = config("TRACING_SAMPLE_RATE", default=0.0, cast=float)
+TRACING_EXPORTER = config("TRACING_EXPORTER", default="json")
+TRACING_FILE = config(
+    "TRACING_FILE", default=os.path.join(BASE_DIR, ".traces", "traces.jsonl")
+)
+
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
         # Custom JWT auth that sets user in thread locals for audit logging
@@ -145,16 +225,19 @@ REST_FRAMEWORK = {
     "DEFAULT_PARSER_CLASSES": (
         "djangorestframework_camel_case.parser.CamelCaseFormParser",
         "djangorestframework_camel_case.parser.CamelCaseMultiPartParser",
-        "djangorestframework_camel_case.parser.CamelCaseJSONParser",
+        "core.parsers.CamelCaseORJSONParser",
     ),
     "DEFAULT_PAGINATION_CLASS": "core.pagination.CustomPagination",
     "PAGE_SIZE": 10,
     "EXCEPTION_HANDLER": "core.exceptions.custom_exception_handler",
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
-    "DEFAULT_FILTER_BACKENDS": ["django_filters.rest_framework.DjangoFilterBackend"],
+    "DEFAULT_FILTER_BACKENDS": [
+        "django_filters.rest_framework.DjangoFilterBackend",
+        "core.filters.DateRangeFilterBackend",
+    ],
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle",
+        "core.throttling.SharedAnonRateThrottle",
+        "core.throttling.SharedUserRateThrottle",
     ],
     "DEFAULT_THROTTLE_RATES": {
         "anon": THROTTLE_ANON_RATE,
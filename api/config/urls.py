@@ -11,7 +11,14 @@ from django.views.generic import TemplateView
 from django.views.static import serve
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 
-from core.views import bakery_settings, health_check, owner_dashboard
+from core.views import (
+    bakery_settings,
+    health_check,
+    owner_dashboard,
+    profile_detail,
+    profile_list,
+    prometheus_metrics,
+)
 
 
 @require_http_methods(["GET"])
@@ -36,10 +43,19 @@ urlpatterns = [
     path("admin/", admin.site.urls),
     # Health Check
     path("api/v1/health/", health_check, name="health_check"),
+    # Prometheus metrics (Admin, or X-Metrics-Token)
+    path("api/v1/metrics/", prometheus_metrics, name="metrics"),
     # Dashboard aggregates (Admin/Owner)
     path("api/v1/dashboard/owner/", owner_dashboard, name="owner_dashboard"),
     # Bakery Settings
     path("api/v1/core/bakery-settings/", bakery_settings, name="bakery_settings"),
+    # Request profiles (Admin)
+    path("api/v1/core/profiles/", profile_list, name="profile_list"),
+    path(
+        "api/v1/core/profiles/<str:profile_id>/",
+        profile_detail,
+        name="profile_detail",
+    ),
     # API Version 1
     path("api/v1/users/", include("users.urls")),
     path("api/v1/audit/", include("audit.urls")),
@@ -7,4 +7,7 @@ class CoreConfig(AppConfig):
 
     def ready(self):
         # Register signals
-        pass
+        from .conditional import track_resource
+        from .models import BakerySettings
+
+        track_resource("bakery-settings", BakerySettings)
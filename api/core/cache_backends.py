@@ -0,0 +1,203 @@
+"""
+SQLite-file cache backend.
+
+A stand-in for Redis on a single node: every worker process opens the same
+SQLite file, so throttle counters, resource versions and cached values are
+shared between processes. Writes that read first (`add`, `incr`) run under
+`BEGIN IMMEDIATE`, which makes them atomic across processes. Put the file
+on tmpfs (e.g. /dev/shm) to keep it in shared memory.
+"""
+
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_entry (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    expires REAL
+) WITHOUT ROWID
+"""
+
+# Writes between culls, per process.
+CULL_EVERY = 200
+
+
+class SQLiteCache(BaseCache):
+    def __init__(self, location, params):
+        super().__init__(params)
+        self._path = location
+        self._local = threading.local()
+        self._writes = 0
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        # A connection inherited across fork() must not be reused.
+        if conn is None or self._local.pid != os.getpid():
+            directory = os.path.dirname(self._path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self._path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(SCHEMA)
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    @contextmanager
+    def _write(self):
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        self._writes += 1
+        if self._writes % CULL_EVERY == 0:
+            self._cull()
+
+    @staticmethod
+    def _dumps(value):
+        return pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def _loads(value):
+        return pickle.loads(value)
+
+    @staticmethod
+    def _live(expires, now=None):
+        return expires is None or expires > (now or time.time())
+
+    def _fetch(self, conn, key):
+        row = conn.execute(
+            "SELECT value, expires FROM cache_entry WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None or not self._live(row[1]):
+            return None
+        return row
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._write() as conn:
+            if self._fetch(conn, key) is not None:
+                return False
+            conn.execute(
+                "INSERT OR REPLACE INTO cache_entry VALUES (?, ?, ?)",
+                (key, self._dumps(value), self.get_backend_timeout(timeout)),
+            )
+        return True
+
+    def get(self, key, default=None, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        row = self._fetch(self._connection(), key)
+        return default if row is None else self._loads(row[0])
+
+    def get_many(self, keys, version=None):
+        key_map = {self.make_and_validate_key(k, version=version): k for k in keys}
+        if not key_map:
+            return {}
+        placeholders = ",".join("?" * len(key_map))
+        rows = self._connection().execute(
+            f"SELECT key, value, expires FROM cache_entry "
+            f"WHERE key IN ({placeholders})",
+            list(key_map),
+        )
+        now = time.time()
+        return {
+            key_map[key]: self._loads(value)
+            for key, value, expires in rows
+            if self._live(expires, now)
+        }
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._write() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO cache_entry VALUES (?, ?, ?)",
+                (key, self._dumps(value), self.get_backend_timeout(timeout)),
+            )
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        expires = self.get_backend_timeout(timeout)
+        rows = [
+            (self.make_and_validate_key(key, version=version), self._dumps(v), expires)
+            for key, v in data.items()
+        ]
+        with self._write() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO cache_entry VALUES (?, ?, ?)", rows
+            )
+        return []
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._write() as conn:
+            if self._fetch(conn, key) is None:
+                return False
+            conn.execute(
+                "UPDATE cache_entry SET expires = ? WHERE key = ?",
+                (self.get_backend_timeout(timeout), key),
+            )
+        return True
+
+    def delete(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._write() as conn:
+            cursor = conn.execute("DELETE FROM cache_entry WHERE key = ?", (key,))
+        return cursor.rowcount > 0
+
+    def delete_many(self, keys, version=None):
+        rows = [(self.make_and_validate_key(k, version=version),) for k in keys]
+        with self._write() as conn:
+            conn.executemany("DELETE FROM cache_entry WHERE key = ?", rows)
+
+    def has_key(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        return self._fetch(self._connection(), key) is not None
+
+    def incr(self, key, delta=1, version=None):
+        """Atomic across processes: read and write share one write lock."""
+        key = self.make_and_validate_key(key, version=version)
+        with self._write() as conn:
+            row = self._fetch(conn, key)
+            if row is None:
+                raise ValueError(f"Key '{key}' not found.")
+            value = self._loads(row[0]) + delta
+            conn.execute(
+                "UPDATE cache_entry SET value = ? WHERE key = ?",
+                (self._dumps(value), key),
+            )
+        return value
+
+    def clear(self):
+        with self._write() as conn:
+            conn.execute("DELETE FROM cache_entry")
+
+    def close(self, **kwargs):
+        # Connections are per thread and reused across requests.
+        pass
+
+    def _cull(self):
+        conn = self._connection()
+        conn.execute(
+            "DELETE FROM cache_entry WHERE expires IS NOT NULL AND expires <= ?",
+            (time.time(),),
+        )
+        (count,) = conn.execute("SELECT COUNT(*) FROM cache_entry").fetchone()
+        if count > self._max_entries and self._cull_frequency:
+            # Drop the entries closest to expiry; entries without one go last.
+            conn.execute(
+                "DELETE FROM cache_entry WHERE key IN ("
+                "SELECT key FROM cache_entry "
+                "ORDER BY expires IS NULL, expires LIMIT ?)",
+                (count // self._cull_frequency,),
+            )
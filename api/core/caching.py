@@ -0,0 +1,174 @@
+"""
+Namespaced cache keys with version-based invalidation.
+
+Every namespace has a version number kept in the shared cache. Keys built
+with `namespaced_key()` embed it, so `bump_namespace()` invalidates every
+entry of a namespace at once, on every worker, without deleting anything;
+stale entries simply age out.
+
+`single_flight` builds on the same cache to coalesce expensive reads.
+"""
+
+import contextvars
+import hashlib
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+
+from django.core.cache import cache
+from django.db import connections
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+logger = logging.getLogger(__name__)
+
+NAMESPACE_VERSION_KEY = "ns-version:{}"
+
+_refresh_executor = None
+_refresh_executor_lock = threading.Lock()
+
+
+def namespace_version(namespace):
+    """
+    Current version of `namespace`. Seeded from the clock so a cache flush
+    never hands out a version number that was used before.
+    """
+    key = NAMESPACE_VERSION_KEY.format(namespace)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def namespace_versions(namespaces):
+    """`namespace_version()` for many namespaces, in one cache round trip."""
+    keys = {
+        NAMESPACE_VERSION_KEY.format(namespace): namespace for namespace in namespaces
+    }
+    found = cache.get_many(keys)
+    versions = {keys[key]: version for key, version in found.items()}
+    for namespace in namespaces:
+        if namespace not in versions:
+            versions[namespace] = namespace_version(namespace)
+    return versions
+
+
+def bump_namespace(*namespaces):
+    """Invalidate every key of each namespace (atomic cache.incr)."""
+    for namespace in namespaces:
+        key = NAMESPACE_VERSION_KEY.format(namespace)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, time.time_ns(), timeout=None)
+
+
+def namespaced_key(namespace, key):
+    return f"{namespace}:{namespace_version(namespace)}:{key}"
+
+
+def _request_key(request):
+    """Requests coalesce when path, caller role and query parameters match."""
+    role = getattr(request.user, "role", None)
+    params = sorted(request.query_params.lists())
+    raw = f"{request.path}|{role}|{params}"
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def _get_refresh_executor():
+    global _refresh_executor
+    with _refresh_executor_lock:
+        if _refresh_executor is None:
+            _refresh_executor = ThreadPoolExecutor(
+                max_workers=2, thread_name_prefix="swr-refresh"
+            )
+        return _refresh_executor
+
+
+def _refresh_in_background(compute, lock_key):
+    def run():
+        try:
+            compute()
+        except Exception:
+            logger.exception("Background refresh failed")
+        finally:
+            cache.delete(lock_key)
+            for conn in connections.all(initialized_only=True):
+                conn.close()
+
+    # Carries replica routing (core.db_routers) into the refresh.
+    _get_refresh_executor().submit(contextvars.copy_context().run, run)
+
+
+def _cached_response(entry, state):
+    response = Response(entry["data"])
+    response["X-Cache"] = state
+    return response
+
+
+def single_flight(namespace, ttl=15, stale_ttl=300, lock_timeout=60, wait_timeout=30):
+    """
+    Collapse concurrent identical GETs of an expensive read endpoint into a
+    single computation, across workers, using locks held in the shared cache.
+
+    A result counts as fresh for `ttl` seconds. For `stale_ttl` more seconds
+    it is still served, while one caller refreshes it in the background.
+    When there is no result yet, one caller computes it and the others
+    poll the cache for up to `wait_timeout` seconds. Only 200 responses
+    are cached. The X-Cache response header says which path was taken.
+
+    Works on `@api_view` functions (place it below `@api_view`) and on
+    APIView handler methods.
+    """
+
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(*args, **kwargs):
+            request = args[1] if isinstance(args[0], APIView) else args[0]
+            if request.method not in ("GET", "HEAD"):
+                return view_func(*args, **kwargs)
+
+            key = namespaced_key(namespace, _request_key(request))
+            lock_key = f"{key}:lock"
+
+            def compute():
+                response = view_func(*args, **kwargs)
+                if response.status_code == status.HTTP_200_OK:
+                    entry = {"data": response.data, "fresh_until": time.time() + ttl}
+                    cache.set(key, entry, ttl + stale_ttl)
+                return response
+
+            entry = cache.get(key)
+            if entry is not None:
+                if entry["fresh_until"] > time.time():
+                    return _cached_response(entry, "HIT")
+                if cache.add(lock_key, 1, lock_timeout):
+                    _refresh_in_background(compute, lock_key)
+                return _cached_response(entry, "STALE")
+
+            deadline = time.monotonic() + wait_timeout
+            delay = 0.02
+            while True:
+                if cache.add(lock_key, 1, lock_timeout):
+                    try:
+                        response = compute()
+                    finally:
+                        cache.delete(lock_key)
+                    response["X-Cache"] = "MISS"
+                    return response
+                time.sleep(delay)
+                delay = min(delay * 2, 0.2)
+                entry = cache.get(key)
+                if entry is not None:
+                    return _cached_response(entry, "COALESCED")
+                if time.monotonic() > deadline:
+                    # The leader is stuck; don't make this caller wait forever.
+                    return view_func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,59 @@
+from functools import lru_cache
+
+from django.utils.encoding import force_str
+from django.utils.functional import Promise
+from djangorestframework_camel_case import util
+from djangorestframework_camel_case.settings import api_settings
+
+OPTIONS = api_settings.JSON_UNDERSCOREIZE
+# ignore_fields / ignore_keys need per-key bookkeeping; defer to the library.
+HAS_IGNORES = bool(OPTIONS.get("ignore_fields") or OPTIONS.get("ignore_keys"))
+
+
+@lru_cache(maxsize=4096)
+def camelize_key(key):
+    return util.camelize_re.sub(util.underscore_to_camel, key)
+
+
+@lru_cache(maxsize=4096)
+def underscoreize_key(key):
+    return util.camel_to_underscore(key, **OPTIONS)
+
+
+def _camel_key(key):
+    if isinstance(key, Promise):
+        key = force_str(key)
+    if isinstance(key, str) and "_" in key:
+        return camelize_key(key)
+    return key
+
+
+def camelize(data):
+    """
+    Same output as `djangorestframework_camel_case.util.camelize`, but only
+    dicts, lists and tuples are walked; other values are left for the JSON
+    encoder.
+    """
+    if HAS_IGNORES:
+        return util.camelize(data, **OPTIONS)
+    if isinstance(data, dict):
+        return {_camel_key(key): camelize(value) for key, value in data.items()}
+    if isinstance(data, (list, tuple)):
+        return [camelize(item) for item in data]
+    return data
+
+
+def underscoreize(data):
+    """Inverse of `camelize` for decoded JSON request bodies."""
+    if HAS_IGNORES:
+        return util.underscoreize(data, **OPTIONS)
+    if isinstance(data, dict):
+        return {
+            underscoreize_key(key) if isinstance(key, str) else key: underscoreize(
+                value
+            )
+            for key, value in data.items()
+        }
+    if isinstance(data, list):
+        return [underscoreize(item) for item in data]
+    return data
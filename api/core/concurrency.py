@@ -0,0 +1,97 @@
+"""
+Concurrent evaluation of independent ORM sections.
+
+Django's async ORM still runs every query of a request on that request's
+single sync thread, so awaiting several querysets with asyncio.gather()
+gives no overlap. Dashboards instead hand independent sections to a small
+shared thread pool; each worker thread has its own database connection.
+"""
+
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from .tracing import span
+
+_executor = None
+_executor_lock = threading.Lock()
+_in_section = contextvars.ContextVar("in_section", default=False)
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.SECTION_MAX_WORKERS,
+                thread_name_prefix="sections",
+            )
+        return _executor
+
+
+def _close_old_connections():
+    # What Django does around each request: worker threads outlive any one
+    # section, so their connections are closed (or handed back to the pool)
+    # unless CONN_MAX_AGE keeps them, and dropped once they go bad.
+    for conn in connections.all(initialized_only=True):
+        conn.close_if_unusable_or_obsolete()
+
+
+def _run_section(name, func, execute_wrappers):
+    _in_section.set(True)
+    _close_old_connections()
+    try:
+        with ExitStack() as stack:
+            # Carry the caller's query hooks (metrics, profiling) over to this
+            # thread's connections.
+            for alias, wrappers in execute_wrappers.items():
+                for wrapper in wrappers:
+                    stack.enter_context(connections[alias].execute_wrapper(wrapper))
+            with span(f"section.{name}"):
+                return func()
+    finally:
+        _close_old_connections()
+
+
+def _run_inline(sections):
+    return {name: func() for name, func in sections.items()}
+
+
+def run_sections(sections):
+    """
+    Evaluate `{name: callable}` and return `{name: result}`.
+
+    Sections run in parallel on separate connections. They run in-line
+    instead when concurrency is disabled, when called from inside another
+    section, or while the caller has a transaction open (other connections
+    could not see its uncommitted writes).
+    """
+    if (
+        settings.SECTION_MAX_WORKERS <= 1
+        or len(sections) <= 1
+        or _in_section.get()
+        or any(conn.in_atomic_block for conn in connections.all(initialized_only=True))
+    ):
+        return _run_inline(sections)
+
+    execute_wrappers = {
+        conn.alias: list(conn.execute_wrappers)
+        for conn in connections.all(initialized_only=True)
+        if conn.execute_wrappers
+    }
+    executor = _get_executor()
+    futures = {
+        name: executor.submit(
+            contextvars.copy_context().run,
+            _run_section,
+            name,
+            func,
+            execute_wrappers,
+        )
+        for name, func in sections.items()
+    }
+    return {name: future.result() for name, future in futures.items()}
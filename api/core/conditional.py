@@ -0,0 +1,106 @@
+import hashlib
+from functools import wraps
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+from .caching import bump_namespace, namespace_version
+
+CACHEABLE_METHODS = ("GET", "HEAD")
+
+
+def get_resource_version(name):
+    """Current version of a named resource (a cache namespace version)."""
+    return namespace_version(name)
+
+
+def bump_resource_version(*names):
+    bump_namespace(*names)
+
+
+def track_resource(name, *models):
+    """
+    Bump `name` after any save/delete of `models` commits. Call from an
+    AppConfig.ready().
+    """
+
+    def receiver(sender, **kwargs):
+        transaction.on_commit(lambda: bump_resource_version(name))
+
+    for model in models:
+        dispatch_uid = f"track_resource:{name}:{model._meta.label}"
+        post_save.connect(receiver, sender=model, weak=False, dispatch_uid=dispatch_uid)
+        post_delete.connect(
+            receiver, sender=model, weak=False, dispatch_uid=dispatch_uid
+        )
+
+
+def compute_etag(request, resources):
+    """
+    Strong ETag from the resource versions plus everything else the body
+    depends on: the absolute URL, the user and the negotiated format.
+    """
+    user = getattr(request, "user", None)
+    parts = [f"{name}={get_resource_version(name)}" for name in resources]
+    parts += [
+        request.build_absolute_uri(),
+        str(getattr(user, "pk", None)),
+        request.META.get("HTTP_ACCEPT", ""),
+    ]
+    return quote_etag(hashlib.sha1("|".join(parts).encode()).hexdigest())
+
+
+def _conditional_response(request, resources, handler, *args, **kwargs):
+    if request.method not in CACHEABLE_METHODS:
+        return handler(request, *args, **kwargs)
+
+    etag = compute_etag(request, resources)
+    if_none_match = request.META.get("HTTP_IF_NONE_MATCH")
+    if if_none_match and (
+        if_none_match.strip() == "*" or etag in parse_etags(if_none_match)
+    ):
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = handler(request, *args, **kwargs)
+        if response.status_code != status.HTTP_200_OK:
+            return response
+    response["ETag"] = etag
+    return response
+
+
+def conditional_etag(*resources):
+    """
+    Decorator for `@api_view` functions: answers `If-None-Match` with a 304
+    before the view body runs. Place it below `@api_view`.
+    """
+
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            return _conditional_response(request, resources, view_func, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+class ConditionalGetMixin:
+    """
+    ViewSet mixin adding versioned ETags to `list` and `retrieve`. Set
+    `etag_resources` to the resource names the response is built from.
+    """
+
+    etag_resources = ()
+
+    def list(self, request, *args, **kwargs):
+        return _conditional_response(
+            request, self.etag_resources, super().list, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return _conditional_response(
+            request, self.etag_resources, super().retrieve, *args, **kwargs
+        )
@@ -0,0 +1,14 @@
+from django.db.backends.mysql.base import Database
+from django.db.backends.mysql.base import DatabaseWrapper as MySQLDatabaseWrapper
+
+from ..pool import PooledDatabaseWrapperMixin
+
+
+class DatabaseWrapper(PooledDatabaseWrapperMixin, MySQLDatabaseWrapper):
+    @staticmethod
+    def ping(conn):
+        try:
+            conn.ping(False)
+        except Database.Error:
+            return False
+        return True
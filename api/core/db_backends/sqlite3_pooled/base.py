@@ -0,0 +1,16 @@
+from django.db.backends.sqlite3.base import Database
+from django.db.backends.sqlite3.base import DatabaseWrapper as SQLiteDatabaseWrapper
+
+from ..pool import PooledDatabaseWrapperMixin
+
+
+class DatabaseWrapper(PooledDatabaseWrapperMixin, SQLiteDatabaseWrapper):
+    """Pooled SQLite, a local stand-in for benchmarking the MySQL pool."""
+
+    @staticmethod
+    def ping(conn):
+        try:
+            conn.execute("SELECT 1")
+        except Database.Error:
+            return False
+        return True
@@ -0,0 +1,106 @@
+"""
+Read-replica routing.
+
+When REPLICA_DATABASE_URL is configured, reads issued inside a
+`read_from_replica()` scope (or a view using `ReplicaReadMixin` /
+`@replica_reads`) go to the "replica" alias. Everything else, and every
+write, stays on "default". Once a scope has written, or while a transaction
+is open on the primary, its remaining reads are pinned to the primary so
+the request always sees its own writes.
+"""
+
+import contextvars
+import functools
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from rest_framework.permissions import SAFE_METHODS
+
+REPLICA_ALIAS = "replica"
+
+_scope = contextvars.ContextVar("replica_scope", default=None)
+
+
+class _ReplicaScope:
+    __slots__ = ("pinned",)
+
+    def __init__(self):
+        self.pinned = False
+
+
+def replica_configured():
+    return REPLICA_ALIAS in settings.DATABASES
+
+
+@contextmanager
+def read_from_replica():
+    """Route reads in this block to the replica (no-op without one)."""
+    if _scope.get() is not None:
+        yield
+        return
+    token = _scope.set(_ReplicaScope())
+    try:
+        yield
+    finally:
+        _scope.reset(token)
+
+
+def reads_from_replica():
+    """True while reads in this context go to the replica."""
+    scope = _scope.get()
+    return scope is not None and not scope.pinned and replica_configured()
+
+
+def pin_to_primary():
+    """Send the rest of the current scope's reads to the primary."""
+    scope = _scope.get()
+    if scope is not None:
+        scope.pinned = True
+
+
+def replica_reads(view_func):
+    """Function-view decorator: safe-method requests read from the replica."""
+
+    @functools.wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        if request.method not in SAFE_METHODS:
+            return view_func(request, *args, **kwargs)
+        with read_from_replica():
+            return view_func(request, *args, **kwargs)
+
+    return wrapper
+
+
+class ReplicaReadMixin:
+    """APIView/ViewSet mixin: safe-method requests read from the replica."""
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in SAFE_METHODS:
+            return super().dispatch(request, *args, **kwargs)
+        with read_from_replica():
+            return super().dispatch(request, *args, **kwargs)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        scope = _scope.get()
+        if scope is None or scope.pinned or not replica_configured():
+            return None
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            scope.pinned = True
+            return None
+        instance = hints.get("instance")
+        if instance is not None and instance._state.db == DEFAULT_DB_ALIAS:
+            return DEFAULT_DB_ALIAS
+        return REPLICA_ALIAS
+
+    def db_for_write(self, model, **hints):
+        pin_to_primary()
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {DEFAULT_DB_ALIAS, REPLICA_ALIAS}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
@@ -0,0 +1,140 @@
+from datetime import datetime, time, timedelta
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+
+def local_day_start(day):
+    """Aware datetime for local midnight at the start of `day`."""
+    return timezone.make_aware(
+        datetime.combine(day, time.min), timezone.get_current_timezone()
+    )
+
+
+def aware_date_range(start_date, end_date):
+    """
+    Turn an inclusive range of local dates into an aware, half-open
+    [start, end) datetime range. Filtering a DateTimeField with
+    `__gte`/`__lt` on these bounds keeps the column sargable, unlike
+    `__date` lookups which cast every row.
+    """
+    return local_day_start(start_date), local_day_start(end_date + timedelta(days=1))
+
+
+def date_range_kwargs(field, start=None, end=None):
+    """
+    Build queryset filter kwargs bounding a DateTimeField by local dates.
+
+    `start`/`end` may be dates (whole local days, end inclusive) or
+    datetimes (used as exact inclusive bounds; naive values are treated
+    as local time). Either bound may be None.
+    """
+    kwargs = {}
+    if start is not None:
+        if isinstance(start, datetime):
+            kwargs[f"{field}__gte"] = _make_aware(start)
+        else:
+            kwargs[f"{field}__gte"] = local_day_start(start)
+    if end is not None:
+        if isinstance(end, datetime):
+            kwargs[f"{field}__lte"] = _make_aware(end)
+        else:
+            kwargs[f"{field}__lt"] = local_day_start(end + timedelta(days=1))
+    return kwargs
+
+
+def parse_date_or_datetime(value, param="date"):
+    """Parse `YYYY-MM-DD` or an ISO datetime, raising a 400 on bad input."""
+    if value in (None, ""):
+        return None
+    try:
+        parsed = parse_date(value) or parse_datetime(value)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise ValidationError({param: ["Use YYYY-MM-DD or an ISO 8601 datetime."]})
+    return parsed
+
+
+def _make_aware(value):
+    if timezone.is_naive(value):
+        return timezone.make_aware(value, timezone.get_current_timezone())
+    return value
+
+
+def _as_date(value):
+    if isinstance(value, datetime):
+        return timezone.localtime(_make_aware(value)).date()
+    return value
+
+
+def _is_date_only_field(model, path):
+    """True when the (possibly related) field at `path` is a plain DateField."""
+    field = None
+    for name in path.split("__"):
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return False
+        if field.is_relation and field.related_model is not None:
+            model = field.related_model
+    return isinstance(field, models.DateField) and not isinstance(
+        field, models.DateTimeField
+    )
+
+
+class DateRangeFilterBackend(BaseFilterBackend):
+    """
+    Filters by `?start_date=` / `?end_date=` on the view's
+    `date_range_field`. Local dates become aware half-open ranges so the
+    underlying index is used; DateField columns are compared directly.
+    Views without `date_range_field` are left untouched.
+    """
+
+    start_param = "start_date"
+    end_param = "end_date"
+
+    def filter_queryset(self, request, queryset, view):
+        field = getattr(view, "date_range_field", None)
+        if not field:
+            return queryset
+
+        start = parse_date_or_datetime(
+            request.query_params.get(self.start_param), self.start_param
+        )
+        end = parse_date_or_datetime(
+            request.query_params.get(self.end_param), self.end_param
+        )
+        if start is None and end is None:
+            return queryset
+
+        if _is_date_only_field(queryset.model, field):
+            kwargs = {}
+            if start is not None:
+                kwargs[f"{field}__gte"] = _as_date(start)
+            if end is not None:
+                kwargs[f"{field}__lte"] = _as_date(end)
+            return queryset.filter(**kwargs)
+
+        return queryset.filter(**date_range_kwargs(field, start, end))
+
+    def get_schema_operation_parameters(self, view):
+        if not getattr(view, "date_range_field", None):
+            return []
+        return [
+            {
+                "name": param,
+                "required": False,
+                "in": "query",
+                "description": description,
+                "schema": {"type": "string"},
+            }
+            for param, description in (
+                (self.start_param, "Local start date (YYYY-MM-DD), inclusive."),
+                (self.end_param, "Local end date (YYYY-MM-DD), inclusive."),
+            )
+        ]
@@ -0,0 +1,113 @@
+import statistics
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.signals import request_finished, request_started
+from django.db import connections
+
+from production.models import Product
+from sales.models import PaymentMethod
+
+
+def _percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class Command(BaseCommand):
+    help = (
+        "Replay request-shaped database work (connect, a few POS lookups, "
+        "close at request end) from concurrent threads and report per-request "
+        "latency. Run it with and without `?pool_size=N` on DATABASE_URL to "
+        "compare plain and pooled connections."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--threads", type=int, default=4, help="Concurrent workers (default: 4)."
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=200,
+            help="Requests per worker (default: 200).",
+        )
+        parser.add_argument(
+            "--database", default="default", help="Database alias (default)."
+        )
+
+    def handle(self, *args, **options):
+        alias = options["database"]
+        if alias not in connections:
+            raise CommandError(f"Unknown database alias {alias!r}.")
+        if options["threads"] < 1 or options["requests"] < 1:
+            raise CommandError("--threads and --requests must be at least 1.")
+
+        latencies = []
+        errors = []
+        lock = threading.Lock()
+
+        def simulate_request():
+            # request_started/request_finished drive close_old_connections(),
+            # exactly as for a real request with CONN_MAX_AGE=0.
+            request_started.send(sender=self.__class__)
+            try:
+                list(Product.objects.using(alias).filter(is_active=True)[:20])
+                list(PaymentMethod.objects.using(alias).filter(is_active=True))
+            finally:
+                request_finished.send(sender=self.__class__)
+
+        def worker():
+            local = []
+            for _ in range(options["requests"]):
+                start = time.perf_counter()
+                try:
+                    simulate_request()
+                except Exception as exc:
+                    with lock:
+                        errors.append(repr(exc))
+                    continue
+                local.append(time.perf_counter() - start)
+            with lock:
+                latencies.extend(local)
+
+        connections[alias].close()
+        threads = [threading.Thread(target=worker) for _ in range(options["threads"])]
+        wall_start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        wall_time = time.perf_counter() - wall_start
+
+        conn = connections[alias]
+        latencies.sort()
+        ms = [value * 1000 for value in latencies]
+        self.stdout.write(
+            f"{conn.settings_dict['ENGINE']} ({conn.vendor}), "
+            f"{options['threads']} threads x {options['requests']} requests"
+        )
+        if ms:
+            self.stdout.write(
+                f"  per request: mean {statistics.mean(ms):.3f} ms, "
+                f"p50 {_percentile(ms, 50):.3f} ms, "
+                f"p95 {_percentile(ms, 95):.3f} ms, "
+                f"p99 {_percentile(ms, 99):.3f} ms"
+            )
+        self.stdout.write(
+            f"  throughput: {len(latencies) / wall_time:.0f} requests/s "
+            f"over {wall_time:.2f} s"
+        )
+        if getattr(conn, "is_pooled", False):
+            stats = conn.pool.stats()
+            self.stdout.write(
+                f"  pool: size {stats['size']}, opened {stats['opened']}, "
+                f"checkouts {stats['checkouts']}, "
+                f"total wait {stats['wait_seconds'] * 1000:.1f} ms"
+            )
+        if errors:
+            self.stdout.write(self.style.ERROR(f"  {len(errors)} errors: {errors[0]}"))
@@ -0,0 +1,339 @@
+import json
+import re
+from collections import defaultdict
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+# Endpoints hit on every dashboard load or list screen. `{start}`/`{end}`
+# are replaced with a 30 day window ending today.
+HOT_ENDPOINTS = [
+    "/api/v1/dashboard/owner/",
+    "/api/v1/reports/dashboard-stats/",
+    "/api/v1/sales/sales/?start_date={start}&end_date={end}",
+    "/api/v1/sales/closing/",
+    "/api/v1/production/runs/?start_date={start}&end_date={end}",
+    "/api/v1/inventory/purchases/?start_date={start}&end_date={end}",
+    "/api/v1/inventory/adjustments/?start_date={start}&end_date={end}",
+    "/api/v1/users/shift-assignments/?start_date={start}&end_date={end}",
+    "/api/v1/users/attendance/?start_date={start}&end_date={end}",
+    "/api/v1/users/leaves/",
+    "/api/v1/users/payroll-records/",
+    "/api/v1/treasury/transactions/?start_date={start}&end_date={end}",
+    "/api/v1/audit/?start_date={start}&end_date={end}",
+    "/api/v1/reports/export/?start_date={start}&end_date={end}",
+]
+
+QUOTE = '[`"]?'
+COLUMN = rf"{QUOTE}(\w+){QUOTE}\.{QUOTE}(\w+){QUOTE}"
+EQUALITY_RE = re.compile(rf"{COLUMN}\s*(?:=|IN\b|IS\b)", re.IGNORECASE)
+RANGE_RE = re.compile(rf"{COLUMN}\s*(?:>=|<=|>|<|BETWEEN\b)", re.IGNORECASE)
+JOIN_RE = re.compile(rf"=\s*{COLUMN}", re.IGNORECASE)
+ORDER_RE = re.compile(rf"{COLUMN}(?:\s+(?:ASC|DESC))?", re.IGNORECASE)
+SQLITE_SCAN_RE = re.compile(r"^SCAN (\w+)(?: AS \w+)?$")
+SQLITE_TEMP_RE = re.compile(r"USE TEMP B-TREE FOR (ORDER BY|GROUP BY|DISTINCT)")
+
+
+class Command(BaseCommand):
+    help = (
+        "Capture the SQL issued by hot API endpoints, EXPLAIN it against the "
+        "current data and flag full scans and filesorts with index suggestions."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--url",
+            action="append",
+            dest="urls",
+            help="Endpoint to analyse (repeatable). Defaults to the hot endpoints.",
+        )
+        parser.add_argument(
+            "--analyze",
+            action="store_true",
+            help="Refresh planner statistics (ANALYZE) before explaining.",
+        )
+        parser.add_argument(
+            "--min-rows",
+            type=int,
+            default=500,
+            help="Ignore scans of tables smaller than this (default: 500).",
+        )
+        parser.add_argument(
+            "--show-sql",
+            action="store_true",
+            help="Print the SQL of every flagged query.",
+        )
+        parser.add_argument(
+            "--json", action="store_true", help="Emit the report as JSON."
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor not in ("sqlite", "mysql"):
+            raise CommandError(
+                f"EXPLAIN parsing is only implemented for SQLite and MySQL, "
+                f"not {connection.vendor}."
+            )
+
+        today = timezone.localdate()
+        window = {
+            "start": (today - timedelta(days=29)).isoformat(),
+            "end": today.isoformat(),
+        }
+        urls = [url.format(**window) for url in options["urls"] or HOT_ENDPOINTS]
+        self._row_counts = {}
+
+        if options["analyze"]:
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE")
+
+        # Everything (including a throwaway admin, if needed) is rolled back.
+        with transaction.atomic():
+            user = self._admin_user()
+            endpoints = [self._analyse(user, url, options["min_rows"]) for url in urls]
+            transaction.set_rollback(True)
+
+        suggestions = self._suggest(endpoints)
+        if options["json"]:
+            self.stdout.write(
+                json.dumps(
+                    {
+                        "vendor": connection.vendor,
+                        "endpoints": endpoints,
+                        "suggestions": suggestions,
+                    },
+                    indent=2,
+                )
+            )
+            return
+        self._print_report(endpoints, suggestions, options["show_sql"])
+
+    def _admin_user(self):
+        User = get_user_model()
+        user = User.objects.filter(role="admin", is_active=True).first()
+        if user is None:
+            user = User.objects.create_user(
+                username="index-advisor", password=None, role="admin"
+            )
+        return user
+
+    def _analyse(self, user, url, min_rows):
+        host = next(
+            (h.lstrip(".") for h in settings.ALLOWED_HOSTS if h != "*"), "localhost"
+        )
+        request = APIRequestFactory(SERVER_NAME=host).get(url)
+        force_authenticate(request, user=user)
+        match = resolve(url.split("?")[0])
+        with CaptureQueriesContext(connection) as ctx:
+            response = match.func(request, *match.args, **match.kwargs)
+
+        seen = set()
+        findings = []
+        for query in ctx.captured_queries:
+            sql = query["sql"]
+            if not sql.lstrip().upper().startswith("SELECT") or sql in seen:
+                continue
+            seen.add(sql)
+            issues = [
+                issue
+                for issue in self._explain(sql)
+                if self._row_count(issue["table"]) >= min_rows
+            ]
+            if issues:
+                findings.append({"sql": sql, "issues": issues})
+
+        return {
+            "url": url,
+            "status": response.status_code,
+            "queries": len(ctx.captured_queries),
+            "findings": findings,
+        }
+
+    def _explain(self, sql):
+        """Return the full scans / filesorts reported by the planner."""
+        issues = []
+        with connection.cursor() as cursor:
+            if connection.vendor == "sqlite":
+                cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+                sorted_table = self._sorted_table(sql)
+                for row in cursor.fetchall():
+                    detail = row[-1]
+                    scan = SQLITE_SCAN_RE.match(detail)
+                    if scan:
+                        issues.append(self._issue("full_scan", scan.group(1), detail))
+                    elif SQLITE_TEMP_RE.search(detail) and sorted_table:
+                        issues.append(self._issue("filesort", sorted_table, detail))
+            else:
+                cursor.execute(f"EXPLAIN {sql}")
+                columns = [col[0] for col in cursor.description]
+                for values in cursor.fetchall():
+                    row = dict(zip(columns, values))
+                    table, extra = row.get("table"), row.get("Extra") or ""
+                    if not table or table.startswith("<"):
+                        continue
+                    if row.get("type") == "ALL":
+                        issues.append(
+                            self._issue(
+                                "full_scan", table, f"type=ALL rows={row['rows']}"
+                            )
+                        )
+                    if "Using filesort" in extra or "Using temporary" in extra:
+                        issues.append(self._issue("filesort", table, extra))
+        return issues
+
+    def _issue(self, kind, table, detail):
+        return {"kind": kind, "table": table, "detail": detail}
+
+    def _sorted_table(self, sql):
+        """Table owning the first GROUP BY / ORDER BY column, else the FROM table."""
+        _, tail_at = self._clause_bounds(sql)
+        match = ORDER_RE.search(sql[tail_at:]) or re.search(
+            rf"\bFROM\s+{QUOTE}(\w+){QUOTE}", sql, re.IGNORECASE
+        )
+        return match.group(1) if match else None
+
+    def _suggest(self, endpoints):
+        """
+        Propose a composite index per flagged table: equality columns first,
+        then the GROUP BY / ORDER BY key for filesorts, then join and range
+        columns. Proposals an existing index already serves are skipped.
+        """
+        proposals = defaultdict(lambda: {"hits": 0, "urls": set()})
+        for endpoint in endpoints:
+            for finding in endpoint["findings"]:
+                for issue in finding["issues"]:
+                    columns = self._candidate_columns(
+                        finding["sql"], issue["table"], issue["kind"]
+                    )
+                    if not columns or self._is_covered(
+                        issue["table"], columns, issue["kind"]
+                    ):
+                        continue
+                    proposal = proposals[(issue["table"], tuple(columns))]
+                    proposal["hits"] += 1
+                    proposal["urls"].add(endpoint["url"])
+
+        suggestions = []
+        for (table, columns), proposal in proposals.items():
+            model = self._model_for(table)
+            fields = [self._field_name(model, column) for column in columns]
+            suggestions.append(
+                {
+                    "table": table,
+                    "model": model._meta.label if model else None,
+                    "fields": fields,
+                    "rows": self._row_count(table),
+                    "hits": proposal["hits"],
+                    "urls": sorted(proposal["urls"]),
+                }
+            )
+        return sorted(suggestions, key=lambda s: s["hits"], reverse=True)
+
+    def _candidate_columns(self, sql, table, kind):
+        where_at, tail_at = self._clause_bounds(sql)
+        where = sql[where_at:tail_at] if where_at != -1 else ""
+        joins = sql[:where_at] if where_at != -1 else sql[:tail_at]
+        sort = sql[tail_at:]
+
+        columns = []
+
+        def add(matches):
+            for tbl, col in matches:
+                if tbl == table and col not in columns and col != "id":
+                    columns.append(col)
+
+        add(EQUALITY_RE.findall(where))
+        # A grouped/sorted table is read in index order, so the sort key
+        # leads; otherwise join keys are the lookups that matter.
+        if kind == "filesort":
+            before = len(columns)
+            add(ORDER_RE.findall(sort))
+            if len(columns) == before:
+                # Sorting on another table's (or a computed) column.
+                return []
+        add(EQUALITY_RE.findall(joins))
+        add(JOIN_RE.findall(joins))
+        add(RANGE_RE.findall(where))
+        return columns
+
+    def _clause_bounds(self, sql):
+        """Offsets of the outer WHERE and of the first GROUP BY / ORDER BY."""
+        upper = sql.upper()
+        where_at = upper.find(" WHERE ")
+        tails = [upper.rfind(" GROUP BY "), upper.rfind(" ORDER BY ")]
+        tails = [i for i in tails if i != -1]
+        return where_at, min(tails) if tails else len(sql)
+
+    def _is_covered(self, table, columns, kind):
+        # Lookups only need the same leading column set; sorts need the order.
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, table)
+        for constraint in constraints.values():
+            existing = constraint["columns"] or []
+            leading = existing[: len(columns)]
+            if leading == columns or (
+                kind == "full_scan" and set(leading) == set(columns)
+            ):
+                return True
+        return False
+
+    def _model_for(self, table):
+        for model in apps.get_models():
+            if model._meta.db_table == table:
+                return model
+        return None
+
+    def _field_name(self, model, column):
+        if model is None:
+            return column
+        for field in model._meta.concrete_fields:
+            if field.column == column:
+                return field.name
+        return column
+
+    def _row_count(self, table):
+        # Subquery aliases (T3, U0) are not real tables and count as empty.
+        if table not in self._row_counts:
+            count = 0
+            if table in connection.introspection.table_names():
+                with connection.cursor() as cursor:
+                    quoted = connection.ops.quote_name(table)
+                    cursor.execute(f"SELECT COUNT(*) FROM {quoted}")
+                    count = cursor.fetchone()[0]
+            self._row_counts[table] = count
+        return self._row_counts[table]
+
+    def _print_report(self, endpoints, suggestions, show_sql):
+        for endpoint in endpoints:
+            flagged = len(endpoint["findings"])
+            line = (
+                f"{endpoint['url']} [{endpoint['status']}] "
+                f"{endpoint['queries']} queries, {flagged} flagged"
+            )
+            self.stdout.write(self.style.WARNING(line) if flagged else line)
+            for finding in endpoint["findings"]:
+                for issue in finding["issues"]:
+                    self.stdout.write(
+                        f"  {issue['kind']:<9} {issue['table']}: {issue['detail']}"
+                    )
+                if show_sql:
+                    self.stdout.write(f"    {finding['sql']}")
+
+        self.stdout.write("")
+        if not suggestions:
+            self.stdout.write(self.style.SUCCESS("No index suggestions."))
+            return
+        self.stdout.write(self.style.WARNING("Suggested indexes:"))
+        for suggestion in suggestions:
+            target = suggestion["model"] or suggestion["table"]
+            self.stdout.write(
+                f"  {target}: models.Index(fields={suggestion['fields']!r})"
+                f"  # {suggestion['hits']} hits, {suggestion['rows']} rows"
+            )
@@ -0,0 +1,146 @@
+import io
+import json
+import pstats
+from collections import Counter
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.urls import Resolver404, resolve
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core.profiling import run_profiled, save_profile
+
+
+class Command(BaseCommand):
+    help = (
+        "Replay one API URL against the local database under cProfile and "
+        "report the hottest functions and the SQL it ran."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("url", help="Path and query, e.g. /api/v1/reports/export/")
+        parser.add_argument("--method", default="GET", help="HTTP method (GET).")
+        parser.add_argument("--data", help="JSON request body for POST/PUT/PATCH.")
+        parser.add_argument(
+            "--user",
+            help="Username to run as (default: the first active admin).",
+        )
+        parser.add_argument(
+            "--top", type=int, default=25, help="Functions to list (default: 25)."
+        )
+        parser.add_argument(
+            "--sort",
+            default="cumulative",
+            choices=["cumulative", "tottime", "calls"],
+            help="Function sort order (default: cumulative).",
+        )
+        parser.add_argument(
+            "--queries",
+            type=int,
+            default=15,
+            help="Slowest queries to list (default: 15).",
+        )
+        parser.add_argument(
+            "--commit",
+            action="store_true",
+            help="Keep writes made by the request (rolled back by default).",
+        )
+        parser.add_argument(
+            "--no-save",
+            action="store_true",
+            help="Do not store the profile under PROFILE_DIR.",
+        )
+
+    def handle(self, *args, **options):
+        url = options["url"]
+        method = options["method"].upper()
+        try:
+            match = resolve(url.split("?")[0])
+        except Resolver404:
+            raise CommandError(f"No view matches {url}.")
+
+        user = self._user(options["user"])
+        host = next(
+            (h.lstrip(".") for h in settings.ALLOWED_HOSTS if h != "*"), "localhost"
+        )
+        request = APIRequestFactory(SERVER_NAME=host).generic(
+            method,
+            url,
+            options["data"] or "",
+            content_type="application/json",
+        )
+        force_authenticate(request, user=user)
+
+        def call_view():
+            response = match.func(request, *match.args, **match.kwargs)
+            if hasattr(response, "render"):
+                response.render()
+            return response
+
+        with transaction.atomic():
+            response, profiler, queries, duration = run_profiled(call_view)
+            if not options["commit"]:
+                transaction.set_rollback(True)
+
+        self._report(response, profiler, queries, duration, options)
+
+        if not options["no_save"]:
+            summary = save_profile(
+                profiler,
+                queries,
+                duration,
+                method=method,
+                path=url,
+                status=response.status_code,
+                user=user.username,
+                source="profile_url",
+            )
+            self.stdout.write(self.style.SUCCESS(f"Saved profile {summary['id']}"))
+
+    def _user(self, username):
+        User = get_user_model()
+        if username:
+            try:
+                return User.objects.get(username=username)
+            except User.DoesNotExist:
+                raise CommandError(f"User {username!r} does not exist.")
+        user = User.objects.filter(role="admin", is_active=True).first()
+        if user is None:
+            raise CommandError("No active admin user; pass --user.")
+        return user
+
+    def _report(self, response, profiler, queries, duration, options):
+        query_ms = sum(q["duration_ms"] for q in queries)
+        self.stdout.write(
+            f"{options['method'].upper()} {options['url']} -> "
+            f"{response.status_code} in {duration * 1000:.1f} ms, "
+            f"{len(queries)} queries ({query_ms:.1f} ms)"
+        )
+
+        stream = io.StringIO()
+        stats = pstats.Stats(profiler, stream=stream)
+        stats.sort_stats(options["sort"]).print_stats(options["top"])
+        self.stdout.write(stream.getvalue())
+
+        if not queries:
+            return
+        self.stdout.write(self.style.WARNING("Slowest queries:"))
+        slowest = sorted(queries, key=lambda q: q["duration_ms"], reverse=True)
+        for query in slowest[: options["queries"]]:
+            self.stdout.write(
+                f"  {query['duration_ms']:8.2f} ms  {query['origin'] or '-'}\n"
+                f"             {query['sql'][:200]}"
+            )
+
+        repeated = Counter(q["sql"] for q in queries).most_common(5)
+        repeated = [(sql, count) for sql, count in repeated if count > 1]
+        if repeated:
+            self.stdout.write(self.style.WARNING("Repeated statements (N+1?):"))
+            for sql, count in repeated:
+                origins = {q["origin"] for q in queries if q["sql"] == sql}
+                self.stdout.write(
+                    f"  x{count}  {json.dumps(sorted(o or '-' for o in origins))}\n"
+                    f"        {sql[:200]}"
+                )
@@ -308,11 +308,13 @@ class Command(BaseCommand):
         for i in range(count):
             theoretical = Decimal("5.000") + Decimal(i) / Decimal("10")
             actual = theoretical + Decimal("0.300")
+            ingredient = ingredients[i % len(ingredients)]
             production_models.IngredientUsage.objects.create(
                 production_run=runs[i % len(runs)],
-                ingredient=ingredients[i % len(ingredients)],
+                ingredient=ingredient,
                 theoretical_amount=theoretical,
                 actual_amount=actual,
+                unit_cost=ingredient.average_cost_per_unit,
             )
 
     def _seed_payment_methods(self, count):
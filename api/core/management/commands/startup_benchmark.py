@@ -0,0 +1,172 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Median wall time for a fresh worker to import settings, apps, the WSGI
+# application and the URLconf (see README "Startup budget").
+STARTUP_BUDGET_MS = 400
+
+# Heavy libraries that must stay behind their call sites, never loaded by
+# worker startup.
+LAZY_PACKAGES = ("openpyxl", "pywebpush", "py_vapid", "http_ece", "PIL", "numpy")
+
+# What a worker does before it can serve its first request. Peak RSS comes
+# from getrusage(), which Windows lacks; it prints "-" there.
+STARTUP_SNIPPET = """
+import sys, time
+start = time.perf_counter()
+from config.wsgi import application
+from django.urls import get_resolver
+get_resolver().url_patterns
+elapsed_ms = (time.perf_counter() - start) * 1000
+try:
+    import resource
+except ImportError:
+    rss_mb = "-"
+else:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    rss_mb = rss / 1024 / 1024 if sys.platform == "darwin" else rss / 1024
+print(elapsed_ms, rss_mb)
+"""
+
+
+def parse_importtime(stderr):
+    """`-X importtime` output as a list of (module, self_us, cumulative_us, depth)."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|", 2)
+        stripped = name.lstrip()
+        depth = (len(name) - len(stripped) - 1) // 2
+        rows.append((stripped, int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure worker cold start (settings, apps, WSGI app and URLconf) in "
+        "fresh interpreters with `python -X importtime` and compare it with the "
+        "startup budget."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--runs", type=int, default=5, help="Fresh interpreters (default: 5)."
+        )
+        parser.add_argument(
+            "--top", type=int, default=15, help="Packages to list (default: 15)."
+        )
+        parser.add_argument(
+            "--budget-ms",
+            type=float,
+            default=STARTUP_BUDGET_MS,
+            help=f"Startup budget in ms (default: {STARTUP_BUDGET_MS}).",
+        )
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Exit non-zero if over budget or a lazy package was imported.",
+        )
+        parser.add_argument("--json", action="store_true", help="Emit JSON.")
+
+    def handle(self, *args, **options):
+        if options["runs"] < 1:
+            raise CommandError("--runs must be at least 1.")
+
+        wall_times = []
+        rss = []
+        rows = []
+        for _ in range(options["runs"]):
+            wall_ms, rss_mb, rows = self._run_once()
+            wall_times.append(wall_ms)
+            if rss_mb is not None:
+                rss.append(rss_mb)
+
+        by_package = defaultdict(int)
+        for name, self_us, _, _ in rows:
+            by_package[name.split(".")[0]] += self_us
+        lazy_violations = [
+            pkg
+            for pkg in LAZY_PACKAGES
+            if any(name.split(".")[0] == pkg for name, *_ in rows)
+        ]
+        median_ms = statistics.median(wall_times)
+        result = {
+            "runs": len(wall_times),
+            "median_ms": round(median_ms, 1),
+            "min_ms": round(min(wall_times), 1),
+            "max_ms": round(max(wall_times), 1),
+            "budget_ms": options["budget_ms"],
+            "peak_rss_mb": round(statistics.median(rss), 1) if rss else None,
+            "modules": len(rows),
+            "top_packages": [
+                {"package": pkg, "self_ms": round(us / 1000, 1)}
+                for pkg, us in sorted(
+                    by_package.items(), key=lambda item: item[1], reverse=True
+                )[: options["top"]]
+            ],
+            "lazy_violations": lazy_violations,
+        }
+
+        if options["json"]:
+            self.stdout.write(json.dumps(result, indent=2))
+        else:
+            self._report(result)
+
+        over_budget = median_ms > options["budget_ms"]
+        if options["check"] and (over_budget or lazy_violations):
+            raise CommandError("Startup budget check failed.")
+
+    def _run_once(self):
+        env = {**os.environ, "DJANGO_SETTINGS_MODULE": settings.SETTINGS_MODULE}
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", STARTUP_SNIPPET],
+            cwd=settings.BASE_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        if proc.returncode != 0:
+            raise CommandError(f"Startup failed:\n{proc.stderr[-2000:]}")
+        wall_ms, rss_mb = proc.stdout.strip().splitlines()[-1].split()
+        rss_mb = None if rss_mb == "-" else float(rss_mb)
+        return float(wall_ms), rss_mb, parse_importtime(proc.stderr)
+
+    def _report(self, result):
+        rss = (
+            f", {result['peak_rss_mb']} MB peak RSS"
+            if result["peak_rss_mb"] is not None
+            else ""
+        )
+        self.stdout.write(
+            f"Worker startup over {result['runs']} runs: "
+            f"median {result['median_ms']} ms "
+            f"(min {result['min_ms']}, max {result['max_ms']}), "
+            f"{result['modules']} modules{rss}"
+        )
+        self.stdout.write("Top packages by self import time:")
+        for row in result["top_packages"]:
+            self.stdout.write(f"  {row['self_ms']:8.1f} ms  {row['package']}")
+
+        if result["lazy_violations"]:
+            self.stdout.write(
+                self.style.WARNING(
+                    "Imported at startup but should be lazy: "
+                    + ", ".join(result["lazy_violations"])
+                )
+            )
+        if result["median_ms"] > result["budget_ms"]:
+            self.stdout.write(
+                self.style.ERROR(f"Over the {result['budget_ms']} ms budget.")
+            )
+        else:
+            self.stdout.write(
+                self.style.SUCCESS(f"Within the {result['budget_ms']} ms budget.")
+            )
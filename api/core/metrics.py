@@ -0,0 +1,334 @@
+"""
+Per-route request metrics kept in process memory.
+
+Each worker periodically writes its totals to
+`<METRICS_DIR>/<pid>-<start>.json` (the start time keeps a reused pid from
+overwriting an older worker's file); the metrics endpoint merges every
+worker's file so the numbers cover all processes behind the load balancer,
+Prometheus multiprocess-style.
+
+Files of workers that have exited are folded into `exited.json` on the
+next flush and removed, so their totals stay counted (counters never go
+backwards) without the directory growing with every restart.
+"""
+
+import json
+import os
+import shutil
+import threading
+import time
+from bisect import bisect_left
+
+from django.conf import settings
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+SIZE_BUCKETS = (1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+POOL_WAIT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5)
+
+ROUTE_LABELS = ("method", "route")
+
+# name -> (help, buckets, label names)
+HISTOGRAMS = {
+    "http_request_duration_seconds": (
+        "Request latency by route.",
+        LATENCY_BUCKETS,
+        ROUTE_LABELS,
+    ),
+    "http_request_db_queries": (
+        "SQL queries per request by route.",
+        QUERY_BUCKETS,
+        ROUTE_LABELS,
+    ),
+    "http_response_size_bytes": (
+        "Response body size by route.",
+        SIZE_BUCKETS,
+        ROUTE_LABELS,
+    ),
+    "db_pool_wait_seconds": (
+        "Time spent checking a connection out of the pool.",
+        POOL_WAIT_BUCKETS,
+        ("alias",),
+    ),
+}
+# name -> (help, label names)
+COUNTERS = {
+    "http_requests_total": (
+        "Requests by route and status code.",
+        (*ROUTE_LABELS, "status"),
+    ),
+    "http_request_db_seconds_total": ("Time spent in SQL by route.", ROUTE_LABELS),
+    "db_pool_connections_opened_total": (
+        "New database connections opened by the pool.",
+        ("alias",),
+    ),
+    "db_pool_connections_closed_total": (
+        "Pooled connections closed, by reason.",
+        ("alias", "reason"),
+    ),
+    "db_pool_timeouts_total": (
+        "Checkouts that gave up waiting for a free connection.",
+        ("alias",),
+    ),
+}
+
+_lock = threading.Lock()
+_histograms = {name: {} for name in HISTOGRAMS}
+_counters = {name: {} for name in COUNTERS}
+_last_flush = 0.0
+# This process's file name and the pid it was made for (see `_own_file`).
+_own_pid = None
+_file_name = None
+
+EXITED_FILE = "exited.json"
+PRUNE_LOCK = "prune.lock"
+# A prune lock older than this was left by a crashed worker.
+PRUNE_LOCK_TIMEOUT = 60
+
+
+def _observe(name, labels, value):
+    buckets = HISTOGRAMS[name][1]
+    series = _histograms[name].get(labels)
+    if series is None:
+        series = _histograms[name][labels] = {
+            "buckets": [0] * (len(buckets) + 1),
+            "sum": 0,
+            "count": 0,
+        }
+    series["buckets"][bisect_left(buckets, value)] += 1
+    series["sum"] += value
+    series["count"] += 1
+
+
+def _inc(name, labels, value=1):
+    _counters[name][labels] = _counters[name].get(labels, 0) + value
+
+
+def record_request(method, route, status, duration, queries, query_time, size):
+    """Record one finished request and flush to disk if due."""
+    global _last_flush
+    labels = (method, route)
+    with _lock:
+        _observe("http_request_duration_seconds", labels, duration)
+        _observe("http_request_db_queries", labels, queries)
+        if size is not None:
+            _observe("http_response_size_bytes", labels, size)
+        _inc("http_requests_total", (method, route, str(status)))
+        _inc("http_request_db_seconds_total", labels, query_time)
+
+        now = time.monotonic()
+        if now - _last_flush >= settings.METRICS_FLUSH_INTERVAL:
+            _last_flush = now
+            _flush()
+
+
+def observe(name, labels, value):
+    """Record one histogram observation (flushed with the next request)."""
+    with _lock:
+        _observe(name, labels, value)
+
+
+def inc(name, labels, value=1):
+    """Increment a counter (flushed with the next request)."""
+    with _lock:
+        _inc(name, labels, value)
+
+
+def _own_file():
+    """
+    This process's file name, made on first use and again whenever the pid
+    changes, so workers forked from a preloaded master don't share one.
+    """
+    global _own_pid, _file_name
+    pid = os.getpid()
+    if pid != _own_pid:
+        _own_pid, _file_name = pid, f"{pid}-{time.time_ns()}.json"
+    return _file_name
+
+
+def _after_fork():
+    # Totals recorded before the fork stay counted in the parent's file,
+    # and the parent's lock may have been held by another thread.
+    global _lock
+    _lock = threading.Lock()
+    for series in (*_histograms.values(), *_counters.values()):
+        series.clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork)
+
+
+def _snapshot():
+    return _dump(_histograms, _counters)
+
+
+def _write_json(path, data):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+def _flush():
+    directory = settings.METRICS_DIR
+    try:
+        os.makedirs(directory, exist_ok=True)
+        own = _own_file()
+        _write_json(os.path.join(directory, own), _snapshot())
+        _prune_exited(directory, own)
+    except OSError:
+        # Metrics must never break a request.
+        pass
+
+
+def _file_pid(name):
+    """Pid of a worker file (`<pid>-<start>.json` or `<pid>.json`), or None."""
+    stem = name.removesuffix(".json").split("-", 1)[0]
+    return int(stem) if name.endswith(".json") and stem.isdigit() else None
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _prune_exited(directory, own):
+    """Fold the files of exited workers into EXITED_FILE and delete them."""
+    if os.name != "posix":
+        # os.kill(pid, 0) is only a liveness probe on POSIX.
+        return
+    exited = [
+        name
+        for name in os.listdir(directory)
+        if (pid := _file_pid(name)) is not None and name != own and not _pid_alive(pid)
+    ]
+    if not exited:
+        return
+
+    lock = os.path.join(directory, PRUNE_LOCK)
+    try:
+        if time.time() - os.path.getmtime(lock) > PRUNE_LOCK_TIMEOUT:
+            shutil.rmtree(lock, ignore_errors=True)
+    except OSError:
+        pass
+    try:
+        os.mkdir(lock)
+    except FileExistsError:
+        return  # another worker is pruning
+    try:
+        paths = [os.path.join(directory, name) for name in exited]
+        snapshots = []
+        for path in [os.path.join(directory, EXITED_FILE), *paths]:
+            try:
+                with open(path) as f:
+                    snapshots.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+        _write_json(os.path.join(directory, EXITED_FILE), _dump(*_merge(snapshots)))
+        for path in paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+    finally:
+        os.rmdir(lock)
+
+
+def _worker_snapshots():
+    """
+    This process's live totals plus the last flush of every other worker
+    and the folded totals of exited ones.
+    """
+    with _lock:
+        own = _own_file()
+        snapshots = [_snapshot()]
+    try:
+        names = os.listdir(settings.METRICS_DIR)
+    except OSError:
+        names = []
+    for name in names:
+        if name == own or (name != EXITED_FILE and _file_pid(name) is None):
+            continue
+        try:
+            with open(os.path.join(settings.METRICS_DIR, name)) as f:
+                snapshots.append(json.load(f))
+        except (OSError, ValueError):
+            continue
+    return snapshots
+
+
+def _merge(snapshots):
+    histograms = {name: {} for name in HISTOGRAMS}
+    counters = {name: {} for name in COUNTERS}
+    for snapshot in snapshots:
+        for name, rows in snapshot.get("histograms", {}).items():
+            if name not in histograms:
+                continue
+            for labels, series in rows:
+                merged = histograms[name].setdefault(
+                    tuple(labels),
+                    {"buckets": [0] * len(series["buckets"]), "sum": 0, "count": 0},
+                )
+                for i, value in enumerate(series["buckets"]):
+                    merged["buckets"][i] += value
+                merged["sum"] += series["sum"]
+                merged["count"] += series["count"]
+        for name, rows in snapshot.get("counters", {}).items():
+            if name not in counters:
+                continue
+            for labels, value in rows:
+                key = tuple(labels)
+                counters[name][key] = counters[name].get(key, 0) + value
+    return histograms, counters
+
+
+def _dump(histograms, counters):
+    """Merged totals back in the per-worker file format."""
+    return {
+        "histograms": {
+            name: [[list(labels), series] for labels, series in data.items()]
+            for name, data in histograms.items()
+        },
+        "counters": {
+            name: [[list(labels), value] for labels, value in data.items()]
+            for name, data in counters.items()
+        },
+    }
+
+
+def _label_str(names, values):
+    pairs = []
+    for name, value in zip(names, values):
+        escaped = str(value).replace("\\", "\\\\").replace('"', '\\"')
+        pairs.append(f'{name}="{escaped}"')
+    return ",".join(pairs)
+
+
+def render_prometheus():
+    """All workers' metrics in the Prometheus text exposition format."""
+    histograms, counters = _merge(_worker_snapshots())
+    lines = []
+
+    for name, (help_text, buckets, label_names) in HISTOGRAMS.items():
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+        for labels, series in sorted(histograms[name].items()):
+            base = _label_str(label_names, labels)
+            cumulative = 0
+            for bound, value in zip((*buckets, "+Inf"), series["buckets"]):
+                cumulative += value
+                lines.append(f'{name}_bucket{{{base},le="{bound}"}} {cumulative}')
+            lines.append(f"{name}_sum{{{base}}} {series['sum']}")
+            lines.append(f"{name}_count{{{base}}} {series['count']}")
+
+    for name, (help_text, label_names) in COUNTERS.items():
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+        for labels, value in sorted(counters[name].items()):
+            lines.append(f"{name}{{{_label_str(label_names, labels)}}} {value}")
+
+    return "\n".join(lines) + "\n"
@@ -1,18 +1,182 @@
+import time
+from contextlib import ExitStack
+
+from django.db import connections
+from django.http import QueryDict
 from django.utils.deprecation import MiddlewareMixin
+from rest_framework.exceptions import APIException
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from . import metrics
+from .camel_case import underscoreize_key
+from .profiling import ProfilerBusy, run_profiled, save_profile
+from .tracing import start_trace
+
+
+class MetricsMiddleware:
+    """
+    Records latency, SQL query count/time, response size and status per
+    resolved route (URL name) for the Prometheus endpoint in core.metrics.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not request.path.startswith("/api/"):
+            return self.get_response(request)
+
+        db = {"queries": 0, "seconds": 0.0}
+
+        def count_queries(execute, sql, params, many, context):
+            start = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                db["queries"] += 1
+                db["seconds"] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for conn in connections.all():
+                stack.enter_context(conn.execute_wrapper(count_queries))
+            response = self.get_response(request)
+        duration = time.perf_counter() - start
+
+        match = getattr(request, "resolver_match", None)
+        route = (match.view_name or match.route) if match else "unmatched"
+        size = None if response.streaming else len(response.content)
+        metrics.record_request(
+            request.method,
+            route,
+            response.status_code,
+            duration,
+            db["queries"],
+            db["seconds"],
+            size,
+        )
+        return response
 
 
 class NoCacheMiddleware(MiddlewareMixin):
     """
     Middleware to prevent caching of API responses.
-    Adds no-cache headers to all API responses.
+    Adds no-cache headers to all API responses. Responses carrying an ETag
+    (see core.conditional) may be stored but must be revalidated.
     """
 
     def process_response(self, request, response):
         # Only apply to API endpoints
         if request.path.startswith("/api/"):
+            if response.has_header("ETag"):
+                response["Cache-Control"] = "private, no-cache"
+                return response
+
             # Prevent caching
             response["Cache-Control"] = "no-store, no-cache, must-revalidate, max-age=0"
             response["Pragma"] = "no-cache"
             response["Expires"] = "0"
 
         return response
+
+
+class CamelCaseQueryParamsMiddleware:
+    """
+    Rewrites camelCase query parameter names to snake_case, like
+    `djangorestframework_camel_case`'s middleware but with cached key
+    conversion.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        query = QueryDict(mutable=True)
+        for key, values in request.GET.lists():
+            query.setlist(underscoreize_key(key), values)
+        request.GET = query
+        return self.get_response(request)
+
+
+class ProfilingMiddleware:
+    """
+    Profiles a single request when an admin sends `X-Profile: 1` or
+    `?_profile=1`. The stored profile id is returned in `X-Profile-Id`;
+    see core.profiling and /api/v1/core/profiles/.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not self._wants_profile(request):
+            return self.get_response(request)
+        user = self._admin_user(request)
+        if user is None:
+            return self.get_response(request)
+
+        try:
+            response, profiler, queries, duration = run_profiled(
+                self.get_response, request
+            )
+        except ProfilerBusy:
+            return self.get_response(request)
+
+        summary = save_profile(
+            profiler,
+            queries,
+            duration,
+            method=request.method,
+            path=request.get_full_path(),
+            status=response.status_code,
+            user=user.username,
+            source="request",
+        )
+        response["X-Profile-Id"] = summary["id"]
+        return response
+
+    def _wants_profile(self, request):
+        return (
+            request.headers.get("X-Profile") == "1"
+            or request.GET.get("_profile") == "1"
+        )
+
+    def _admin_user(self, request):
+        # JWT auth normally runs inside DRF, after middleware; check it here.
+        user = getattr(request, "user", None)
+        if user is None or not user.is_authenticated:
+            try:
+                auth = JWTAuthentication().authenticate(request)
+            except APIException:
+                auth = None
+            user = auth[0] if auth else None
+        if user is not None and getattr(user, "role", None) == "admin":
+            return user
+        return None
+
+
+class TracingMiddleware:
+    """
+    Opens a trace for each /api/ request, sampled at TRACING_SAMPLE_RATE.
+    Sampled responses carry the trace id in `X-Trace-Id`.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not request.path.startswith("/api/"):
+            return self.get_response(request)
+
+        with start_trace(
+            f"{request.method} {request.path}", **{"http.method": request.method}
+        ) as root:
+            response = self.get_response(request)
+            match = getattr(request, "resolver_match", None)
+            if match:
+                root.set_attribute("http.route", match.view_name or match.route)
+            root.set_attribute("http.status_code", response.status_code)
+
+        if root.trace_id:
+            response["X-Trace-Id"] = root.trace_id
+        return response
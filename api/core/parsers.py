@@ -0,0 +1,24 @@
+import codecs
+
+import orjson
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+from .camel_case import underscoreize
+
+
+class CamelCaseORJSONParser(JSONParser):
+    """Decodes JSON bodies with orjson and snake_cases the keys."""
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+
+        try:
+            data = stream.read()
+            if codecs.lookup(encoding).name != "utf-8":
+                data = data.decode(encoding)
+            return underscoreize(orjson.loads(data))
+        except ValueError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
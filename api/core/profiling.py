@@ -0,0 +1,209 @@
+"""
+On-demand profiling of single requests.
+
+A profiled request runs under cProfile with every SQL statement captured
+(timing plus the project frame that issued it). Results are stored under
+PROFILE_DIR as `<id>.prof` (pstats) and `<id>.json` (summary + queries).
+"""
+
+import cProfile
+import io
+import json
+import os
+import pstats
+import threading
+import time
+import traceback
+import uuid
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+
+PROFILE_ID_LENGTH = 32
+
+# cProfile can only have one active profiler per process.
+_profiler_lock = threading.Lock()
+
+
+class ProfilerBusy(Exception):
+    """Another request is already being profiled in this process."""
+
+
+def _profile_dir():
+    return settings.PROFILE_DIR
+
+
+def _origin():
+    """Innermost stack frame from project code (not site-packages)."""
+    base_dir = str(settings.BASE_DIR)
+    for frame in reversed(traceback.extract_stack()[:-2]):
+        filename = frame.filename
+        if (
+            filename.startswith(base_dir)
+            and "site-packages" not in filename
+            and not filename.endswith(
+                (
+                    "core/profiling.py",
+                    "core/middleware.py",
+                    "core/management/commands/profile_url.py",
+                )
+            )
+        ):
+            return (
+                f"{os.path.relpath(filename, base_dir)}:{frame.lineno} in {frame.name}"
+            )
+    return None
+
+
+def run_profiled(func, *args, **kwargs):
+    """
+    Call `func` under cProfile while recording every SQL statement.
+    Returns `(result, profiler, queries, duration)`; raises ProfilerBusy
+    (before calling `func`) if a profile is already running.
+    """
+    if not _profiler_lock.acquire(blocking=False):
+        raise ProfilerBusy
+    try:
+        return _run_profiled(func, *args, **kwargs)
+    finally:
+        _profiler_lock.release()
+
+
+def _run_profiled(func, *args, **kwargs):
+    queries = []
+
+    def capture(execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            queries.append(
+                {
+                    "sql": sql,
+                    "params": repr(params)[:500],
+                    "many": many,
+                    "alias": context["connection"].alias,
+                    "duration_ms": round((time.perf_counter() - start) * 1000, 3),
+                    "origin": _origin(),
+                }
+            )
+
+    profiler = cProfile.Profile()
+    start = time.perf_counter()
+    with ExitStack() as stack:
+        for conn in connections.all():
+            stack.enter_context(conn.execute_wrapper(capture))
+        profiler.enable()
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            profiler.disable()
+    duration = time.perf_counter() - start
+    return result, profiler, queries, duration
+
+
+def top_functions(profiler, limit=30, sort="cumulative"):
+    stats = pstats.Stats(profiler, stream=io.StringIO())
+    stats.sort_stats(sort)
+    rows = []
+    for func in stats.fcn_list[:limit]:
+        calls, primitive_calls, total, cumulative, _ = stats.stats[func]
+        filename, lineno, name = func
+        rows.append(
+            {
+                "function": f"{filename}:{lineno}({name})",
+                "calls": calls,
+                "primitive_calls": primitive_calls,
+                "total_ms": round(total * 1000, 3),
+                "cumulative_ms": round(cumulative * 1000, 3),
+            }
+        )
+    return rows
+
+
+def save_profile(profiler, queries, duration, **meta):
+    """Write the pstats dump and JSON summary, pruning old profiles."""
+    directory = _profile_dir()
+    os.makedirs(directory, exist_ok=True)
+    profile_id = uuid.uuid4().hex
+    profiler.dump_stats(os.path.join(directory, f"{profile_id}.prof"))
+
+    summary = {
+        "id": profile_id,
+        "created_at": timezone.now().isoformat(),
+        "duration_ms": round(duration * 1000, 3),
+        "query_count": len(queries),
+        "query_time_ms": round(sum(q["duration_ms"] for q in queries), 3),
+        **meta,
+        "top_functions": top_functions(profiler),
+        "queries": queries,
+    }
+    with open(os.path.join(directory, f"{profile_id}.json"), "w") as f:
+        json.dump(summary, f, default=str)
+
+    _prune(directory)
+    return summary
+
+
+def _prune(directory):
+    summaries = sorted(
+        (name for name in os.listdir(directory) if name.endswith(".json")),
+        key=lambda name: os.path.getmtime(os.path.join(directory, name)),
+        reverse=True,
+    )
+    for name in summaries[settings.PROFILE_KEEP :]:
+        profile_id = name[: -len(".json")]
+        for suffix in (".json", ".prof"):
+            try:
+                os.remove(os.path.join(directory, profile_id + suffix))
+            except OSError:
+                pass
+
+
+def _is_profile_id(profile_id):
+    return len(profile_id) == PROFILE_ID_LENGTH and all(
+        c in "0123456789abcdef" for c in profile_id
+    )
+
+
+def list_profiles():
+    """Stored profile summaries, newest first, without query/function detail."""
+    directory = _profile_dir()
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return []
+    profiles = []
+    for name in names:
+        if not name.endswith(".json"):
+            continue
+        try:
+            with open(os.path.join(directory, name)) as f:
+                summary = json.load(f)
+        except (OSError, ValueError):
+            continue
+        summary.pop("queries", None)
+        summary.pop("top_functions", None)
+        profiles.append(summary)
+    return sorted(profiles, key=lambda p: p["created_at"], reverse=True)
+
+
+def load_profile(profile_id):
+    """Full summary for `profile_id`, or None."""
+    if not _is_profile_id(profile_id):
+        return None
+    try:
+        with open(os.path.join(_profile_dir(), f"{profile_id}.json")) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def profile_stats_path(profile_id):
+    """Path of the raw pstats dump for `profile_id`, or None."""
+    if not _is_profile_id(profile_id):
+        return None
+    path = os.path.join(_profile_dir(), f"{profile_id}.prof")
+    return path if os.path.exists(path) else None
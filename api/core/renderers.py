@@ -1,10 +1,61 @@
-from io import BytesIO
+import csv
+import datetime
+import decimal
+from io import BytesIO, StringIO
 
-from djangorestframework_camel_case.render import CamelCaseJSONRenderer
-from rest_framework.renderers import BaseRenderer
+import orjson
+from django.utils.encoding import force_str
+from django.utils.functional import Promise
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
 
+from .camel_case import camelize
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+
+
+def _orjson_default(obj):
+    """Types orjson lacks, encoded the way DRF's JSONEncoder does."""
+    if isinstance(obj, decimal.Decimal):
+        return float(obj)
+    if isinstance(obj, Promise):
+        return force_str(obj)
+    if isinstance(obj, datetime.timedelta):
+        return str(obj.total_seconds())
+    # Querysets, generators and the like may hold dicts needing camelCase.
+    return camelize(JSONEncoder().default(obj))
+
+
+class CamelCaseORJSONRenderer(JSONRenderer):
+    """
+    camelCase JSON renderer: keys are converted in one pass through a
+    memoized key map and the result is encoded with orjson. orjson has no
+    hook for rewriting dict keys, so that pass has to come first; other
+    values are left to orjson and `_orjson_default`. Falls back to DRF's
+    encoder for indented output or values orjson rejects.
+    """
 
-class CustomCamelCaseJSONRenderer(CamelCaseJSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        data = camelize(data)
+        renderer_context = renderer_context or {}
+        indent = self.get_indent(accepted_media_type, renderer_context)
+        if indent is None and self.compact and not self.ensure_ascii:
+            try:
+                ret = orjson.dumps(data, default=_orjson_default, option=ORJSON_OPTIONS)
+            except orjson.JSONEncodeError:
+                pass
+            else:
+                # Same strict-javascript-subset escaping as JSONRenderer.
+                return ret.replace("\u2028".encode(), b"\\u2028").replace(
+                    "\u2029".encode(), b"\\u2029"
+                )
+        return super().render(data, accepted_media_type, renderer_context)
+
+
+class CustomCamelCaseJSONRenderer(CamelCaseORJSONRenderer):
     def render(self, data, accepted_media_type=None, renderer_context=None):
         response = renderer_context.get("response")
         # Check if the response is successful (2xx status code) and is not a
@@ -55,3 +106,79 @@ class ExcelRenderer(BaseRenderer):
         workbook.save(buffer)
         buffer.seek(0)
         return buffer.getvalue()
+
+
+def csv_lines(headers, rows):
+    """CSV text for `headers` and then each of `rows`, one line at a time."""
+    buffer = StringIO()
+    writer = csv.writer(buffer)
+
+    def line(values):
+        writer.writerow(values)
+        text = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return text
+
+    yield line(headers)
+    for row in rows:
+        yield line(row)
+
+
+def csv_value(value):
+    """A cell: blank for None, camelCase JSON for nested data."""
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        return camel_json(value).decode()
+    return value
+
+
+class CSVRenderer(BaseRenderer):
+    """
+    text/csv for `{"headers": [...], "rows": [...]}` payloads. Any other
+    payload (e.g. an error) is written as camelCase key,value lines.
+    """
+
+    media_type = "text/csv"
+    format = "csv"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return ""
+        if isinstance(data, dict) and "headers" in data and "rows" in data:
+            return "".join(csv_lines(data["headers"], data["rows"]))
+        if isinstance(data, dict):
+            rows = ((key, csv_value(value)) for key, value in camelize(data).items())
+            return "".join(csv_lines(["key", "value"], rows))
+        return "".join(csv_lines(["value"], ([csv_value(item)] for item in data)))
+
+
+def camel_json(data):
+    """`data` as compact camelCase JSON bytes."""
+    return orjson.dumps(camelize(data), default=_orjson_default, option=ORJSON_OPTIONS)
+
+
+def ndjson_line(data):
+    """One camelCase JSON document followed by a newline."""
+    return camel_json(data) + b"\n"
+
+
+class NDJSONRenderer(BaseRenderer):
+    """
+    Newline-delimited JSON: one line per item of a list payload, or a
+    single line for anything else (e.g. an error).
+    """
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        if isinstance(data, list):
+            return b"".join(ndjson_line(item) for item in data)
+        return ndjson_line(data)
@@ -0,0 +1,94 @@
+"""
+Unpaginated bulk downloads for list endpoints.
+
+`StreamingListMixin` lets a viewset's list action answer `?format=ndjson`
+or `?format=csv` with the whole filtered queryset, streamed: rows are read
+with `.iterator(chunk_size=...)`, serialized one chunk at a time and
+written as they are produced, so memory stays flat however many rows match.
+There is no pagination, COUNT query or response envelope. Any other format
+goes through the normal paginated list.
+"""
+
+import contextvars
+from itertools import islice
+
+from django.http import StreamingHttpResponse
+from rest_framework.settings import api_settings
+
+from .camel_case import camelize_key
+from .renderers import CSVRenderer, NDJSONRenderer, csv_lines, csv_value, ndjson_line
+
+
+def _in_context(context, iterator):
+    """
+    Advance `iterator` inside `context`, so reads made while the response
+    streams still see the request's replica routing (core.db_routers).
+    """
+    while True:
+        try:
+            yield context.run(next, iterator)
+        except StopIteration:
+            return
+
+
+class StreamingListMixin:
+    """
+    ViewSet mixin: `?format=ndjson` / `?format=csv` (or the matching Accept
+    header) on the list action streams every matching row. Other actions
+    keep the default renderers only.
+    """
+
+    renderer_classes = [
+        *api_settings.DEFAULT_RENDERER_CLASSES,
+        NDJSONRenderer,
+        CSVRenderer,
+    ]
+    stream_formats = (NDJSONRenderer.format, CSVRenderer.format)
+    # Rows fetched (and prefetched) per database round trip.
+    stream_chunk_size = 1000
+
+    def get_renderers(self):
+        renderers = super().get_renderers()
+        if getattr(self, "action", None) == "list":
+            return renderers
+        return [
+            renderer
+            for renderer in renderers
+            if renderer.format not in self.stream_formats
+        ]
+
+    def list(self, request, *args, **kwargs):
+        renderer = request.accepted_renderer
+        if renderer.format not in self.stream_formats:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = self._serialized_rows(queryset)
+        if renderer.format == CSVRenderer.format:
+            fields = [
+                name
+                for name, field in self.get_serializer().fields.items()
+                if not field.write_only
+            ]
+            content = csv_lines(
+                [camelize_key(name) for name in fields],
+                ([csv_value(row.get(name)) for name in fields] for row in rows),
+            )
+        else:
+            content = (ndjson_line(row) for row in rows)
+
+        content_type = renderer.media_type
+        if renderer.charset:
+            content_type += f"; charset={renderer.charset}"
+        response = StreamingHttpResponse(
+            _in_context(contextvars.copy_context(), content),
+            content_type=content_type,
+        )
+        filename = f"{self.basename}.{renderer.format}"
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+    def _serialized_rows(self, queryset):
+        objects = queryset.iterator(chunk_size=self.stream_chunk_size)
+        while chunk := list(islice(objects, self.stream_chunk_size)):
+            yield from self.get_serializer(chunk, many=True).data
@@ -0,0 +1,53 @@
+from rest_framework.throttling import AnonRateThrottle, UserRateThrottle
+
+
+class SharedRateThrottleMixin:
+    """
+    Fixed-window request counter kept with an atomic `cache.incr`, so all
+    workers and nodes sharing the cache count against one limit per client.
+    DRF's default throttles rewrite a per-client history list with
+    get/set, which loses updates when workers race.
+
+    A client can make up to twice the rate across a window boundary; that
+    is the usual trade-off of fixed windows.
+    """
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        window = int(self.now // self.duration)
+        self.window_end = (window + 1) * self.duration
+        key = f"{self.key}:{window}"
+        timeout = int(self.window_end - self.now) + 1
+
+        self.cache.add(key, 0, timeout)
+        try:
+            count = self.cache.incr(key)
+        except ValueError:
+            # Expired between add() and incr(); start the window again.
+            self.cache.add(key, 1, timeout)
+            count = 1
+
+        if count > self.num_requests:
+            return self.throttle_failure()
+        return self.throttle_success()
+
+    def throttle_success(self):
+        return True
+
+    def wait(self):
+        return max(self.window_end - self.now, 0)
+
+
+class SharedAnonRateThrottle(SharedRateThrottleMixin, AnonRateThrottle):
+    pass
+
+
+class SharedUserRateThrottle(SharedRateThrottleMixin, UserRateThrottle):
+    pass
@@ -0,0 +1,226 @@
+"""
+Minimal in-process tracing.
+
+`start_trace()` opens a sampled trace (TracingMiddleware does this per
+request); `span()` / `@traced` record nested timed phases inside it and
+are no-ops when no sampled trace is active. Finished traces are appended
+to TRACING_FILE as one JSON line each, either in a flat format ("json")
+or as OTLP/JSON ExportTraceServiceRequest payloads ("otlp").
+"""
+
+import contextvars
+import functools
+import json
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+
+SERVICE_NAME = "bakery-management-api"
+
+_current = contextvars.ContextVar("tracing_current", default=None)
+_write_lock = threading.Lock()
+
+
+class Span:
+    __slots__ = (
+        "trace_id",
+        "span_id",
+        "parent_id",
+        "name",
+        "start_ns",
+        "end_ns",
+        "attributes",
+        "error",
+    )
+
+    def __init__(self, trace_id, parent_id, name, attributes):
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.name = name
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.attributes = dict(attributes)
+        self.error = None
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    @property
+    def duration_ms(self):
+        return round((self.end_ns - self.start_ns) / 1_000_000, 3)
+
+
+class _NoopSpan:
+    trace_id = None
+
+    def set_attribute(self, key, value):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class _Trace:
+    def __init__(self):
+        self.trace_id = os.urandom(16).hex()
+        self.spans = []
+
+
+def _sampled():
+    rate = settings.TRACING_SAMPLE_RATE
+    return rate > 0 and (rate >= 1 or random.random() < rate)
+
+
+@contextmanager
+def start_trace(name, **attributes):
+    """Root span of a new trace, subject to TRACING_SAMPLE_RATE."""
+    if _current.get() is not None:
+        with span(name, **attributes) as root:
+            yield root
+        return
+    if not _sampled():
+        yield NOOP_SPAN
+        return
+
+    trace = _Trace()
+    token = _current.set((trace, None))
+    try:
+        with span(name, **attributes) as root:
+            yield root
+    finally:
+        _current.reset(token)
+        export(trace)
+
+
+@contextmanager
+def span(name, **attributes):
+    """Timed child span of the active trace; a no-op outside one."""
+    current = _current.get()
+    if current is None:
+        yield NOOP_SPAN
+        return
+
+    trace, parent_id = current
+    record = Span(trace.trace_id, parent_id, name, attributes)
+    token = _current.set((trace, record.span_id))
+    try:
+        yield record
+    except BaseException as exc:
+        record.error = f"{type(exc).__name__}: {exc}"
+        raise
+    finally:
+        record.end_ns = time.time_ns()
+        _current.reset(token)
+        trace.spans.append(record)
+
+
+def traced(name=None):
+    """Decorator form of `span`; the span name defaults to module.qualname."""
+
+    def decorator(func):
+        span_name = name or f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _current.get() is None:
+                return func(*args, **kwargs)
+            with span(span_name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    if callable(name):
+        func, name = name, None
+        return decorator(func)
+    return decorator
+
+
+def _as_json(trace):
+    spans = sorted(trace.spans, key=lambda s: s.start_ns)
+    root = next(s for s in spans if s.parent_id is None)
+    return {
+        "trace_id": trace.trace_id,
+        "name": root.name,
+        "start": root.start_ns,
+        "duration_ms": root.duration_ms,
+        "spans": [
+            {
+                "span_id": s.span_id,
+                "parent_id": s.parent_id,
+                "name": s.name,
+                "offset_ms": round((s.start_ns - root.start_ns) / 1_000_000, 3),
+                "duration_ms": s.duration_ms,
+                "attributes": s.attributes,
+                "error": s.error,
+            }
+            for s in spans
+        ],
+    }
+
+
+def _otlp_value(value):
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _as_otlp(trace):
+    spans = []
+    for s in trace.spans:
+        otlp_span = {
+            "traceId": s.trace_id,
+            "spanId": s.span_id,
+            "name": s.name,
+            "kind": 2 if s.parent_id is None else 1,
+            "startTimeUnixNano": str(s.start_ns),
+            "endTimeUnixNano": str(s.end_ns),
+            "attributes": [
+                {"key": key, "value": _otlp_value(value)}
+                for key, value in s.attributes.items()
+            ],
+            "status": {"code": 2, "message": s.error} if s.error else {"code": 1},
+        }
+        if s.parent_id:
+            otlp_span["parentSpanId"] = s.parent_id
+        spans.append(otlp_span)
+    return {
+        "resourceSpans": [
+            {
+                "resource": {
+                    "attributes": [
+                        {"key": "service.name", "value": {"stringValue": SERVICE_NAME}}
+                    ]
+                },
+                "scopeSpans": [{"scope": {"name": __name__}, "spans": spans}],
+            }
+        ]
+    }
+
+
+def export(trace):
+    """Append a finished trace to TRACING_FILE."""
+    if not trace.spans:
+        return
+    if settings.TRACING_EXPORTER == "otlp":
+        payload = _as_otlp(trace)
+    else:
+        payload = _as_json(trace)
+    line = json.dumps(payload, default=str) + "\n"
+
+    path = settings.TRACING_FILE
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with _write_lock, open(path, "a") as f:
+            f.write(line)
+    except OSError:
+        # Tracing must never break a request.
+        pass
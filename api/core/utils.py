@@ -4,7 +4,6 @@ import uuid
 from io import BytesIO
 
 from django.core.files.uploadedfile import InMemoryUploadedFile
-from PIL import Image
 
 
 def get_upload_path(instance, filename):
@@ -18,6 +17,9 @@ def compress_image(image_field):
     """Compresses an image to 75% quality if it is an image file."""
     if not image_field:
         return
+    # Pillow is only needed when an upload is saved
+    from PIL import Image
+
     try:
         img = Image.open(image_field)
 
@@ -1,11 +1,14 @@
-from datetime import datetime
 from decimal import Decimal
+from functools import partial
 
+from django.conf import settings
 from django.db import connection
-from django.db.models import Avg, F, Sum
+from django.db.models import Avg, Count, F, Q, Sum
+from django.http import FileResponse, HttpResponse
 from django.utils import timezone
+from django.utils.crypto import constant_time_compare
 from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 
@@ -14,7 +17,14 @@ from inventory.models import Ingredient
 from production.models import IngredientUsage, ProductionRun
 from sales.models import Sale, SaleItem, SalePayment
 
+from .caching import single_flight
+from .concurrency import run_sections
+from .conditional import conditional_etag
+from .db_routers import replica_reads
+from .filters import aware_date_range
+from .metrics import render_prometheus
 from .models import BakerySettings
+from .profiling import list_profiles, load_profile, profile_stats_path
 from .serializers import BakerySettingsSerializer, BakerySettingsUpdateSerializer
 
 
@@ -65,75 +75,105 @@ def health_check(request):
         )
 
 
+@api_view(["GET"])
+@permission_classes([AllowAny])
+@throttle_classes([])
+def prometheus_metrics(request):
+    """
+    Per-route request metrics in Prometheus text format. Open to admins,
+    or to scrapers sending the METRICS_TOKEN in an X-Metrics-Token header.
+    """
+    is_admin = (
+        request.user.is_authenticated and getattr(request.user, "role", None) == "admin"
+    )
+    token = settings.METRICS_TOKEN
+    has_token = bool(token) and constant_time_compare(
+        request.headers.get("X-Metrics-Token", ""), token
+    )
+    if not (is_admin or has_token):
+        return Response(
+            {"detail": "You do not have permission to perform this action."},
+            status=status.HTTP_403_FORBIDDEN,
+        )
+
+    return HttpResponse(
+        render_prometheus(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
 @api_view(["GET"])
 @permission_classes([IsAdmin])
-def owner_dashboard(request):
+def profile_list(request):
     """
-    Owner/Admin dashboard aggregates.
+    Stored request profiles, newest first. Profile a request by sending it
+    as an admin with `X-Profile: 1` or `?_profile=1`.
+    """
+    return Response(list_profiles(), status=status.HTTP_200_OK)
 
-    Returns:
-    - salesToday: { total, count, average }
-    - cashVsDigitalSplit: { cash, digital }
-    - topProductsToday: [{ productName, quantity, revenue }]
-    - salesByHour: [{ hour, count, total }] (last 12 hours)
-    - criticalStockAlerts: [{ id, name, unit, currentStock, reorderPoint, shortfall }]
-    - recentProductionWastage: [{ productionRunId, producedAt, producedItemName,
-      ingredientName, unit, wastage }]
-    - inventoryStats: { totalValue, totalItems, lowStockCount }
+
+@api_view(["GET"])
+@permission_classes([IsAdmin])
+def profile_detail(request, profile_id):
     """
-    today = timezone.localdate()
-    now = timezone.now()
+    Summary, top functions and the ordered SQL list of one profile.
+    `?download=1` returns the raw pstats file instead.
+    """
+    if request.query_params.get("download") == "1":
+        path = profile_stats_path(profile_id)
+        if path is None:
+            return Response(
+                {"detail": "Profile not found."}, status=status.HTTP_404_NOT_FOUND
+            )
+        return FileResponse(
+            open(path, "rb"), as_attachment=True, filename=f"{profile_id}.prof"
+        )
 
-    # Calculate start and end of day in local time, then convert to aware datetimes
-    # This avoids DB-level timezone conversion issues
-    start_of_day = timezone.make_aware(datetime.combine(today, datetime.min.time()))
-    end_of_day = timezone.make_aware(datetime.combine(today, datetime.max.time()))
+    profile = load_profile(profile_id)
+    if profile is None:
+        return Response(
+            {"detail": "Profile not found."}, status=status.HTTP_404_NOT_FOUND
+        )
+    return Response(profile, status=status.HTTP_200_OK)
 
-    # Sales Today
-    sales_qs = Sale.objects.filter(created_at__range=(start_of_day, end_of_day))
+
+def _sales_today(start_of_day, end_of_day):
+    sales_qs = Sale.objects.filter(
+        created_at__gte=start_of_day, created_at__lt=end_of_day
+    )
     sales_today_total = sales_qs.aggregate(total=Sum("total_amount"))[
         "total"
     ] or Decimal("0")
     sales_today_count = sales_qs.count()
     sales_today_avg = sales_qs.aggregate(avg=Avg("total_amount"))["avg"] or Decimal("0")
+    return {
+        "total": _to_float(sales_today_total),
+        "count": sales_today_count,
+        "average": _to_float(sales_today_avg),
+    }
 
-    # Performance vs last 3 days (excluding today)
+
+def _sales_performance(today):
     last_three_days = [today - timezone.timedelta(days=i) for i in range(1, 4)]
     last_three_totals = []
     last_three_production_costs = []
     for d in last_three_days:
-        d_start = timezone.make_aware(datetime.combine(d, datetime.min.time()))
-        d_end = timezone.make_aware(datetime.combine(d, datetime.max.time()))
-        t = Sale.objects.filter(created_at__range=(d_start, d_end)).aggregate(
-            total=Sum("total_amount")
-        )["total"] or Decimal("0")
+        d_start, d_end = aware_date_range(d, d)
+        t = Sale.objects.filter(
+            created_at__gte=d_start, created_at__lt=d_end
+        ).aggregate(total=Sum("total_amount"))["total"] or Decimal("0")
         last_three_totals.append(_to_float(t))
 
-        # Production cost for the day: sum(
-        #   actual_amount * ingredient.average_cost_per_unit
-        # )
-        day_usages = (
-            IngredientUsage.objects.filter(production_run__date_produced__date=d)
-            .select_related("ingredient")
-            .only("actual_amount", "ingredient__average_cost_per_unit")
-        )
-        cost = Decimal("0")
-        for u in day_usages:
-            avg_cost = u.ingredient.average_cost_per_unit or Decimal("0")
-            cost += (u.actual_amount or Decimal("0")) * avg_cost
+        # Production cost for the day, at the costs recorded with each usage
+        cost = IngredientUsage.objects.filter(
+            production_run__date_produced__gte=d_start,
+            production_run__date_produced__lt=d_end,
+        ).aggregate(cost=Sum("extended_cost"))["cost"]
         last_three_production_costs.append(_to_float(cost))
 
     last_three_avg = (
         sum(last_three_totals) / len(last_three_totals) if last_three_totals else 0.0
     )
-    today_total_f = _to_float(sales_today_total)
-    change_pct = (
-        ((today_total_f - last_three_avg) / last_three_avg * 100)
-        if last_three_avg > 0
-        else None
-    )
-    sales_performance = {
-        "today_total": today_total_f,
+    return {
         "last_three_days": [
             {
                 "date": d,
@@ -143,12 +183,15 @@ def owner_dashboard(request):
             for i, d in enumerate(last_three_days)
         ],
         "last_three_days_average": last_three_avg,
-        "change_percent": change_pct,
     }
 
-    # Cash vs Digital split (based on payment method name)
+
+def _cash_vs_digital_split(start_of_day, end_of_day):
+    # Based on payment method name
     payments_qs = (
-        SalePayment.objects.filter(sale__created_at__range=(start_of_day, end_of_day))
+        SalePayment.objects.filter(
+            sale__created_at__gte=start_of_day, sale__created_at__lt=end_of_day
+        )
         .select_related("method", "sale")
         .only("amount", "method__name", "sale__created_at")
     )
@@ -160,15 +203,19 @@ def owner_dashboard(request):
             cash_total += p.amount
         else:
             digital_total += p.amount
+    return {"cash": _to_float(cash_total), "digital": _to_float(digital_total)}
 
-    # Top Products Today
+
+def _top_products_today(start_of_day, end_of_day):
     top_products_qs = (
-        SaleItem.objects.filter(sale__created_at__range=(start_of_day, end_of_day))
+        SaleItem.objects.filter(
+            sale__created_at__gte=start_of_day, sale__created_at__lt=end_of_day
+        )
         .values("product__name")
         .annotate(quantity=Sum("quantity"), revenue=Sum("subtotal"))
         .order_by("-revenue")[:5]
     )
-    top_products_today = [
+    return [
         {
             "product_name": item["product__name"],
             "quantity": int(item["quantity"] or 0),
@@ -177,7 +224,9 @@ def owner_dashboard(request):
         for item in top_products_qs
     ]
 
-    # Sales by Hour (last 12 hours)
+
+def _sales_by_hour(now):
+    # Last 12 hours
     twelve_hours_ago = now - timezone.timedelta(hours=12)
     sales_by_hour = []
     for i in range(12):
@@ -197,14 +246,17 @@ def owner_dashboard(request):
                 "total": _to_float(hour_total),
             }
         )
+    return sales_by_hour
 
-    # Critical Stock Alerts (raw ingredients)
+
+def _critical_stock_alerts():
+    # Raw ingredients at or below their reorder point
     low_stock_qs = (
         Ingredient.objects.filter(current_stock__lte=F("reorder_point"))
         .annotate(shortfall=F("reorder_point") - F("current_stock"))
         .order_by("-shortfall", "name")[:5]
     )
-    critical_stock_alerts = [
+    return [
         {
             "id": i.id,
             "name": i.name,
@@ -216,7 +268,9 @@ def owner_dashboard(request):
         for i in low_stock_qs
     ]
 
-    # Recent Production Wastage (ingredient-level)
+
+def _recent_production_wastage():
+    # Ingredient-level
     wastage_qs = (
         IngredientUsage.objects.filter(wastage__gt=0)
         .select_related(
@@ -245,25 +299,29 @@ def owner_dashboard(request):
                 "wastage": _to_float(u.wastage),
             }
         )
+    return recent_production_wastage
+
 
-    # Inventory Stats
-    all_ingredients = Ingredient.objects.all()
-    total_inventory_value = sum(
-        _to_float(ing.current_stock) * _to_float(ing.average_cost_per_unit)
-        for ing in all_ingredients
+def _inventory_stats():
+    counts = Ingredient.objects.aggregate(
+        total_items=Count("id"),
+        low_stock_count=Count("id", filter=Q(current_stock__lte=F("reorder_point"))),
+        # Per-ingredient values kept by inventory.valuation
+        total_value=Sum("stock_value"),
     )
-    low_stock_count = Ingredient.objects.filter(
-        current_stock__lte=F("reorder_point")
-    ).count()
-    inventory_stats = {
-        "total_value": total_inventory_value,
-        "total_items": all_ingredients.count(),
-        "low_stock_count": low_stock_count,
+    return {
+        "total_value": _to_float(counts["total_value"]),
+        "total_items": counts["total_items"],
+        "low_stock_count": counts["low_stock_count"],
     }
 
-    # Recent Production Runs (today)
+
+def _recent_production_runs(start_of_day, end_of_day):
+    # Today's runs
     recent_runs_qs = (
-        ProductionRun.objects.filter(date_produced__range=(start_of_day, end_of_day))
+        ProductionRun.objects.filter(
+            date_produced__gte=start_of_day, date_produced__lt=end_of_day
+        )
         .select_related("product", "composite_ingredient", "chef")
         .order_by("-date_produced")[:5]
     )
@@ -284,8 +342,11 @@ def owner_dashboard(request):
                 "chef_name": run.chef.username if run.chef else None,
             }
         )
+    return recent_production_runs
 
-    # Audit Insights (last 24 hours)
+
+def _audit_insights(now):
+    # Last 24 hours
     twenty_four_hours_ago = now - timezone.timedelta(hours=24)
     recent_audits_qs = AuditLog.objects.filter(timestamp__gte=twenty_four_hours_ago)
 
@@ -311,39 +372,79 @@ def owner_dashboard(request):
             }
         )
 
-    audit_insights = {
+    return {
         "delete_count": delete_count,
         "update_count": update_count,
         "create_count": create_count,
         "recent_deletes": recent_deletes,
     }
 
-    return Response(
+
+@api_view(["GET"])
+@permission_classes([IsAdmin])
+@replica_reads
+@single_flight("owner-dashboard")
+def owner_dashboard(request):
+    """
+    Owner/Admin dashboard aggregates.
+
+    Returns:
+    - salesToday: { total, count, average }
+    - cashVsDigitalSplit: { cash, digital }
+    - topProductsToday: [{ productName, quantity, revenue }]
+    - salesByHour: [{ hour, count, total }] (last 12 hours)
+    - criticalStockAlerts: [{ id, name, unit, currentStock, reorderPoint, shortfall }]
+    - recentProductionWastage: [{ productionRunId, producedAt, producedItemName,
+      ingredientName, unit, wastage }]
+    - inventoryStats: { totalValue, totalItems, lowStockCount }
+    """
+    today = timezone.localdate()
+    now = timezone.now()
+
+    # Half-open local-day bounds keep the date columns index-friendly
+    start_of_day, end_of_day = aware_date_range(today, today)
+
+    # Independent sections, evaluated concurrently on separate connections
+    sections = run_sections(
         {
-            "sales_today": {
-                "total": _to_float(sales_today_total),
-                "count": sales_today_count,
-                "average": _to_float(sales_today_avg),
-            },
-            "cash_vs_digital_split": {
-                "cash": _to_float(cash_total),
-                "digital": _to_float(digital_total),
-            },
-            "top_products_today": top_products_today,
-            "sales_by_hour": sales_by_hour,
-            "critical_stock_alerts": critical_stock_alerts,
-            "recent_production_wastage": recent_production_wastage,
-            "inventory_stats": inventory_stats,
-            "recent_production_runs": recent_production_runs,
-            "audit_insights": audit_insights,
-            "sales_performance": sales_performance,
-        },
-        status=status.HTTP_200_OK,
+            "sales_today": partial(_sales_today, start_of_day, end_of_day),
+            "cash_vs_digital_split": partial(
+                _cash_vs_digital_split, start_of_day, end_of_day
+            ),
+            "top_products_today": partial(
+                _top_products_today, start_of_day, end_of_day
+            ),
+            "sales_by_hour": partial(_sales_by_hour, now),
+            "critical_stock_alerts": _critical_stock_alerts,
+            "recent_production_wastage": _recent_production_wastage,
+            "inventory_stats": _inventory_stats,
+            "recent_production_runs": partial(
+                _recent_production_runs, start_of_day, end_of_day
+            ),
+            "audit_insights": partial(_audit_insights, now),
+            "sales_performance": partial(_sales_performance, today),
+        }
     )
 
+    # Performance vs last 3 days (excluding today)
+    today_total_f = sections["sales_today"]["total"]
+    last_three_avg = sections["sales_performance"]["last_three_days_average"]
+    sections["sales_performance"] = {
+        "today_total": today_total_f,
+        **sections["sales_performance"],
+        "change_percent": (
+            ((today_total_f - last_three_avg) / last_three_avg * 100)
+            if last_three_avg > 0
+            else None
+        ),
+    }
+
+    return Response(sections, status=status.HTTP_200_OK)
+
 
 @api_view(["GET", "PATCH"])
 @permission_classes([AllowAny])  # Allow public access, check admin in PATCH handler
+@conditional_etag("bakery-settings")
 def bakery_settings(request):
     """
     GET: Public endpoint to retrieve bakery settings.
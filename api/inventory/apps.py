@@ -6,4 +6,6 @@ class InventoryConfig(AppConfig):
     name = "inventory"
 
     def ready(self):
-        pass
+        from .valuation import track_valuation
+
+        track_valuation()
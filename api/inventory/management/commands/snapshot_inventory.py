@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from inventory.valuation import snapshot_inventory
+
+
+class Command(BaseCommand):
+    help = (
+        "Record today's inventory value, per ingredient and in total, for the "
+        "valuation history. Schedule it at the end of each business day; "
+        "running it again replaces the day's snapshot."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--date",
+            help="Date to file the snapshot under (YYYY-MM-DD, default: today).",
+        )
+
+    def handle(self, *args, **options):
+        day = None
+        if options["date"]:
+            day = parse_date(options["date"])
+            if day is None:
+                raise CommandError("--date must be a date (YYYY-MM-DD).")
+
+        snapshot = snapshot_inventory(day)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Inventory on {snapshot.date}: {snapshot.total_value:,.2f} "
+                f"across {snapshot.ingredient_count} ingredient(s)."
+            )
+        )
@@ -0,0 +1,24 @@
+# Generated by Django 6.0 on 2026-10-19 09:00
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0004_purchase_expense'),
+        ('treasury', '0003_rename_treasury_ba_created_7c0f9b_idx_treasury_ba_created_156ff8_idx_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='purchase',
+            index=models.Index(fields=['-purchase_date'], name='inventory_p_purchas_aba9fc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='stockadjustment',
+            index=models.Index(fields=['-timestamp'], name='inventory_s_timesta_271160_idx'),
+        ),
+    ]
@@ -0,0 +1,102 @@
+# Generated by Django 6.0 on 2026-10-19 11:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_valuation(apps, schema_editor):
+    Ingredient = apps.get_model("inventory", "Ingredient")
+    InventoryValuation = apps.get_model("inventory", "InventoryValuation")
+    total = 0
+    for ingredient in Ingredient.objects.all():
+        value = ingredient.current_stock * ingredient.average_cost_per_unit
+        Ingredient.objects.filter(pk=ingredient.pk).update(stock_value=value)
+        total += value
+    InventoryValuation.objects.update_or_create(pk=1, defaults={"total_value": total})
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("inventory", "0005_purchase_inventory_p_purchas_aba9fc_idx_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="InventorySnapshot",
+            fields=[
+                ("date", models.DateField(primary_key=True, serialize=False)),
+                ("total_value", models.DecimalField(decimal_places=5, max_digits=20)),
+                ("ingredient_count", models.PositiveIntegerField(default=0)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "ordering": ["-date"],
+            },
+        ),
+        migrations.CreateModel(
+            name="InventoryValuation",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "total_value",
+                    models.DecimalField(decimal_places=5, default=0, max_digits=20),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name="ingredient",
+            name="stock_value",
+            field=models.DecimalField(
+                decimal_places=5, default=0, editable=False, max_digits=18
+            ),
+        ),
+        migrations.CreateModel(
+            name="InventorySnapshotItem",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("quantity", models.DecimalField(decimal_places=3, max_digits=10)),
+                (
+                    "average_cost_per_unit",
+                    models.DecimalField(decimal_places=2, max_digits=10),
+                ),
+                ("value", models.DecimalField(decimal_places=5, max_digits=18)),
+                (
+                    "ingredient",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="snapshots",
+                        to="inventory.ingredient",
+                    ),
+                ),
+                (
+                    "snapshot",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="items",
+                        to="inventory.inventorysnapshot",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("snapshot", "ingredient")},
+            },
+        ),
+        migrations.RunPython(backfill_valuation, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,16 @@
+# Generated by Django 6.0 on 2026-10-19 14:10
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0006_inventory_valuation'),
+    ]
+
+    operations = [
+        migrations.DeleteModel(
+            name='InventoryValuation',
+        ),
+    ]
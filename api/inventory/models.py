@@ -27,6 +27,10 @@ class Ingredient(models.Model):
     last_purchased_price = models.DecimalField(
         max_digits=10, decimal_places=2, default=0.00
     )
+    # current_stock x average_cost_per_unit, kept by inventory.valuation
+    stock_value = models.DecimalField(
+        max_digits=18, decimal_places=5, default=0, editable=False
+    )
 
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -60,6 +64,11 @@ class Purchase(models.Model):
     # Fraud Flag
     is_price_anomaly = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["-purchase_date"]),
+        ]
+
     def clean(self):
         """Validate model before saving"""
         from django.core.exceptions import ValidationError
@@ -120,3 +129,41 @@ class StockAdjustment(models.Model):
     reason = models.CharField(max_length=20, choices=REASON_CHOICES)
     notes = models.TextField(blank=True)
     timestamp = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["-timestamp"]),
+        ]
+
+
+class InventorySnapshot(models.Model):
+    """Inventory value at the end of a business day (snapshot_inventory)."""
+
+    date = models.DateField(primary_key=True)
+    total_value = models.DecimalField(max_digits=20, decimal_places=5)
+    ingredient_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-date"]
+
+    def __str__(self):
+        return f"Inventory snapshot - {self.date}"
+
+
+class InventorySnapshotItem(models.Model):
+    snapshot = models.ForeignKey(
+        InventorySnapshot, on_delete=models.CASCADE, related_name="items"
+    )
+    ingredient = models.ForeignKey(
+        Ingredient, on_delete=models.CASCADE, related_name="snapshots"
+    )
+    quantity = models.DecimalField(max_digits=10, decimal_places=3)
+    average_cost_per_unit = models.DecimalField(max_digits=10, decimal_places=2)
+    value = models.DecimalField(max_digits=18, decimal_places=5)
+
+    class Meta:
+        unique_together = ("snapshot", "ingredient")
+
+    def __str__(self):
+        return f"{self.ingredient} on {self.snapshot_id}"
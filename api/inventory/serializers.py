@@ -1,6 +1,7 @@
 from django.db import transaction
 from rest_framework import serializers
 
+from core.tracing import traced
 from treasury.models import BankAccount, Expense
 from treasury.serializers import ExpenseSerializer
 
@@ -48,6 +49,7 @@ class PurchaseSerializer(serializers.ModelSerializer):
             "expense",
         )
 
+    @traced("purchase.sync_expense")
     def _create_or_update_expense(self, purchase, bank_account):
         expense = purchase.expense
         title = f"Inventory purchase: {purchase.ingredient.name}"
@@ -99,6 +101,7 @@ class PurchaseSerializer(serializers.ModelSerializer):
             serializer.is_valid(raise_exception=True)
             serializer.save()
 
+    @traced("purchase.create")
     @transaction.atomic
     def create(self, validated_data):
         bank_account = validated_data.pop("bank_account", None)
@@ -107,6 +110,7 @@ class PurchaseSerializer(serializers.ModelSerializer):
             self._create_or_update_expense(purchase, bank_account)
         return purchase
 
+    @traced("purchase.update")
     @transaction.atomic
     def update(self, instance, validated_data):
         bank_account = validated_data.pop("bank_account", serializers.empty)
@@ -0,0 +1,131 @@
+"""
+Inventory valuation.
+
+Every ingredient keeps its own `stock_value` (current_stock x
+average_cost_per_unit). Stock and average cost only ever change through
+`Ingredient.save()` (purchases, adjustments, production usage and their
+reversals), so a post_save receiver re-reads the saved figures, which may
+have been written as F() expressions, and updates it. The save already
+holds that row's lock, so stock movements of different ingredients never
+wait on each other (a single running-total row would serialize them all).
+The inventory value is then one SUM over the stored column.
+
+`snapshot_inventory()` (the `snapshot_inventory` command) records the value
+per ingredient and in total for a day, and corrects any drifted
+`stock_value` while at it.
+"""
+
+import logging
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Sum
+from django.db.models.signals import post_save
+from django.utils import timezone
+
+from .models import Ingredient, InventorySnapshot, InventorySnapshotItem
+
+logger = logging.getLogger(__name__)
+
+VALUED_FIELDS = {"current_stock", "average_cost_per_unit"}
+
+
+def _on_ingredient_save(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not VALUED_FIELDS & set(update_fields):
+        return
+    # The save already holds this row's lock; taking it here keeps a save
+    # outside any transaction from racing another one on the same row.
+    with transaction.atomic():
+        row = (
+            Ingredient.objects.select_for_update()
+            .filter(pk=instance.pk)
+            .values("current_stock", "average_cost_per_unit", "stock_value")
+            .first()
+        )
+        if row is None:
+            return
+        value = row["current_stock"] * row["average_cost_per_unit"]
+        if value == row["stock_value"]:
+            return
+        # .update() so this write does not fire post_save again
+        Ingredient.objects.filter(pk=instance.pk).update(stock_value=value)
+    instance.stock_value = value
+
+
+def track_valuation():
+    """Connect the receiver. Call from InventoryConfig.ready()."""
+    post_save.connect(
+        _on_ingredient_save, sender=Ingredient, dispatch_uid="inventory-valuation"
+    )
+
+
+def current_value():
+    """Value of all stock on hand."""
+    total = Ingredient.objects.aggregate(total=Sum("stock_value"))["total"]
+    return Decimal("0") if total is None else total
+
+
+@transaction.atomic
+def snapshot_inventory(day=None):
+    """
+    Store (or replace) the snapshot for `day` (default today) from the
+    current stock, and bring any drifted `stock_value` back in line.
+    """
+    day = day or timezone.localdate()
+    ingredients = list(
+        Ingredient.objects.select_for_update().only(
+            "current_stock", "average_cost_per_unit", "stock_value"
+        )
+    )
+    items = []
+    drifted = 0
+    for ingredient in ingredients:
+        value = ingredient.current_stock * ingredient.average_cost_per_unit
+        if value != ingredient.stock_value:
+            Ingredient.objects.filter(pk=ingredient.pk).update(stock_value=value)
+            drifted += 1
+        items.append(
+            InventorySnapshotItem(
+                snapshot_id=day,
+                ingredient=ingredient,
+                quantity=ingredient.current_stock,
+                average_cost_per_unit=ingredient.average_cost_per_unit,
+                value=value,
+            )
+        )
+    total = sum((item.value for item in items), 0)
+
+    if drifted:
+        logger.warning(
+            "Corrected the stock value of %s drifted ingredient(s).", drifted
+        )
+
+    InventorySnapshot.objects.filter(date=day).delete()
+    snapshot = InventorySnapshot.objects.create(
+        date=day, total_value=total, ingredient_count=len(items)
+    )
+    InventorySnapshotItem.objects.bulk_create(items)
+    return snapshot
+
+
+def valuation_history(days):
+    """Daily totals over the last `days` days, oldest first."""
+    since = timezone.localdate() - timedelta(days=days - 1)
+    return list(
+        InventorySnapshot.objects.filter(date__gte=since)
+        .order_by("date")
+        .values("date", "total_value")
+    )
+
+
+def ingredient_history(ingredient_id, days):
+    """One ingredient's daily quantity, cost and value, oldest first."""
+    since = timezone.localdate() - timedelta(days=days - 1)
+    return list(
+        InventorySnapshotItem.objects.filter(
+            ingredient_id=ingredient_id, snapshot__date__gte=since
+        )
+        .order_by("snapshot__date")
+        .values("snapshot__date", "quantity", "average_cost_per_unit", "value")
+    )
@@ -3,8 +3,12 @@ from django.db.models import F
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, permissions, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.generics import get_object_or_404
 from rest_framework.response import Response
 
+from core.filters import DateRangeFilterBackend
+from core.streaming import StreamingListMixin
 from treasury.models import Expense
 from treasury.serializers import ExpenseSerializer
 
@@ -14,6 +18,9 @@ from .serializers import (
     PurchaseSerializer,
     StockAdjustmentSerializer,
 )
+from .valuation import current_value, ingredient_history, valuation_history
+
+MAX_VALUATION_DAYS = 3660
 
 
 class IsStoreKeeperOrAdmin(permissions.BasePermission):
@@ -56,22 +63,53 @@ class IngredientViewSet(viewsets.ModelViewSet):
 
         return Response({"items": serializer.data, "share_text": share_text})
 
+    @action(detail=False, methods=["get"])
+    def valuation(self, request):
+        """
+        Current inventory value plus the daily snapshots of the last `days`
+        days (default 365), in total or for one `ingredient`.
+        """
+        try:
+            days = int(request.query_params.get("days", 365))
+        except ValueError:
+            days = 0
+        if not 1 <= days <= MAX_VALUATION_DAYS:
+            raise ValidationError(
+                {"days": [f"Use a whole number from 1 to {MAX_VALUATION_DAYS}."]}
+            )
 
-class PurchaseViewSet(viewsets.ModelViewSet):
+        ingredient_id = request.query_params.get("ingredient")
+        if ingredient_id:
+            ingredient = get_object_or_404(Ingredient, pk=ingredient_id)
+            return Response(
+                {
+                    "ingredient": ingredient.pk,
+                    "current_value": ingredient.stock_value,
+                    "history": [
+                        {
+                            "date": row["snapshot__date"],
+                            "quantity": row["quantity"],
+                            "average_cost_per_unit": row["average_cost_per_unit"],
+                            "value": row["value"],
+                        }
+                        for row in ingredient_history(ingredient.pk, days)
+                    ],
+                }
+            )
+        return Response(
+            {"current_value": current_value(), "history": valuation_history(days)}
+        )
+
+
+class PurchaseViewSet(StreamingListMixin, viewsets.ModelViewSet):
     queryset = Purchase.objects.select_related("ingredient", "purchaser").order_by(
         "-purchase_date"
     )
     serializer_class = PurchaseSerializer
     permission_classes = [IsStoreKeeperOrAdmin]
-    filter_backends = [DjangoFilterBackend]
+    filter_backends = [DjangoFilterBackend, DateRangeFilterBackend]
     filterset_fields = ["ingredient", "is_price_anomaly"]
-
-    def get_queryset(self):
-        queryset = super().get_queryset()
-        start_date = self.request.query_params.get("start_date")
-        if start_date:
-            queryset = queryset.filter(purchase_date__gte=start_date)
-        return queryset
+    date_range_field = "purchase_date"
 
     def perform_create(self, serializer):
         serializer.save(purchaser=self.request.user)
@@ -93,21 +131,15 @@ class PurchaseViewSet(viewsets.ModelViewSet):
         instance.delete()
 
 
-class StockAdjustmentViewSet(viewsets.ModelViewSet):
+class StockAdjustmentViewSet(StreamingListMixin, viewsets.ModelViewSet):
     queryset = StockAdjustment.objects.select_related("ingredient", "actor").order_by(
         "-timestamp"
     )
     serializer_class = StockAdjustmentSerializer
     permission_classes = [IsStoreKeeperOrAdmin]
-    filter_backends = [DjangoFilterBackend]
+    filter_backends = [DjangoFilterBackend, DateRangeFilterBackend]
     filterset_fields = ["ingredient"]
-
-    def get_queryset(self):
-        queryset = super().get_queryset()
-        start_date = self.request.query_params.get("start_date")
-        if start_date:
-            queryset = queryset.filter(timestamp__gte=start_date)
-        return queryset
+    date_range_field = "timestamp"
 
     def perform_create(self, serializer):
         serializer.save(actor=self.request.user)
@@ -5,12 +5,10 @@ import os
 import tempfile
 from typing import Dict, List, Optional
 
-from cryptography.hazmat.backends import default_backend
-from cryptography.hazmat.primitives import serialization
-from cryptography.hazmat.primitives.asymmetric import ec
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from pywebpush import WebPushException, webpush
+
+from core.tracing import traced
 
 from .models import (
     NotificationLog,
@@ -39,6 +37,10 @@ class NotificationService:
         """
         Helper to check if keys match.
         """
+        from cryptography.hazmat.backends import default_backend
+        from cryptography.hazmat.primitives import serialization
+        from cryptography.hazmat.primitives.asymmetric import ec
+
         try:
             # Add padding if needed
             padded = private_key_str + "=" * ((4 - len(private_key_str) % 4) % 4)
@@ -117,6 +119,12 @@ class NotificationService:
         """
         Sends push notification using Temp File strategy to resolve ASN.1 errors.
         """
+        # Push/crypto libraries are heavy; load them only when a push is sent.
+        from cryptography.hazmat.backends import default_backend
+        from cryptography.hazmat.primitives import serialization
+        from cryptography.hazmat.primitives.asymmetric import ec
+        from pywebpush import WebPushException, webpush
+
         info = NotificationService.get_vapid_info()
 
         subscription_info = {
@@ -280,6 +288,7 @@ class NotificationService:
         return {"sent": sent_count, "failed": failed_count}
 
 
+@traced("notifications.send")
 def send_notification(
     event_type: str, context: Dict, target_users=None, target_roles=None
 ):
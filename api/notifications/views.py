@@ -3,6 +3,9 @@ from rest_framework import permissions, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
+from core.db_routers import ReplicaReadMixin
+from core.filters import DateRangeFilterBackend
+
 from .models import (
     NotificationEvent,
     NotificationLog,
@@ -235,13 +238,15 @@ class NotificationPreferenceViewSet(viewsets.ModelViewSet):
         return Response({"key": public_key})
 
 
-class NotificationLogViewSet(viewsets.ReadOnlyModelViewSet):
+class NotificationLogViewSet(ReplicaReadMixin, viewsets.ReadOnlyModelViewSet):
     """
     View notification history. Admins see all, users see their own.
     """
 
     serializer_class = NotificationLogSerializer
     permission_classes = [permissions.IsAuthenticated]
+    filter_backends = [DateRangeFilterBackend]
+    date_range_field = "sent_at"
 
     def get_queryset(self):
         if getattr(self, "swagger_fake_view", False):
@@ -4,3 +4,15 @@ from django.apps import AppConfig
 class ProductionConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "production"
+
+    def ready(self):
+        from core.conditional import track_resource
+        from inventory.models import Ingredient
+
+        from .bom import track_bom
+        from .models import Product, Recipe, RecipeItem
+
+        track_resource("products", Product)
+        # Recipe payloads embed ingredient names and units.
+        track_resource("recipes", Recipe, RecipeItem, Ingredient)
+        track_bom()
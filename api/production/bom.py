@@ -0,0 +1,276 @@
+"""
+Multi-level bill of materials.
+
+A recipe item may be a composite ingredient (one made by its own recipe),
+so a product's raw-material needs and cost only come out by expanding
+those recipes level by level. `load_bom()` reads every recipe and item in
+two queries, treats the recipes as a DAG (composite ingredient -> the
+recipe that makes it) and explodes each one into a vector of raw
+ingredients per unit of output. Recipes caught in a cycle, with a
+non-positive yield or no items, and every recipe built on them, get an
+error instead of a vector.
+
+Both the exploded BOM and the margin table are memoized per process and
+keyed on namespace versions: BOM_RESOURCE is bumped when a recipe or item
+changes, COSTS_RESOURCE when an ingredient's average cost may have, and
+"products" when a product does. Workers therefore rebuild them only after
+such a change, which `track_bom()` wires up.
+"""
+
+import threading
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from core.caching import bump_namespace, namespace_versions
+from core.conditional import track_resource
+from inventory.models import Ingredient
+
+from .models import Product, Recipe, RecipeItem
+
+BOM_RESOURCE = "bom"
+COSTS_RESOURCE = "ingredient-costs"
+PRODUCTS_RESOURCE = "products"
+COST_FIELDS = {"average_cost_per_unit", "name", "unit"}
+
+CENT = Decimal("0.01")
+QUANTITY = Decimal("0.00001")
+
+_memo = {}
+_memo_lock = threading.Lock()
+
+
+class BOM:
+    """Exploded recipes: raw ingredient -> quantity per unit of output."""
+
+    def __init__(self, recipes, items):
+        self.recipes = {recipe["id"]: recipe for recipe in recipes}
+        self.lines = defaultdict(list)
+        for item in items:
+            self.lines[item["recipe_id"]].append(
+                (item["ingredient_id"], item["quantity"])
+            )
+        self.making = {
+            recipe["composite_ingredient_id"]: recipe["id"]
+            for recipe in recipes
+            if recipe["composite_ingredient_id"] is not None
+        }
+        self.product_recipes = {
+            recipe["product_id"]: recipe["id"]
+            for recipe in recipes
+            if recipe["product_id"] is not None
+        }
+        self.vectors = {}
+        self.errors = {}
+        for recipe_id in self.recipes:
+            self._explode(recipe_id, [])
+        self._derived = {}
+        self._derived_lock = threading.Lock()
+
+    def derived(self, name, build):
+        """`build(self)`, computed once and kept for as long as this BOM is."""
+        with self._derived_lock:
+            if name not in self._derived:
+                self._derived[name] = build(self)
+            return self._derived[name]
+
+    def _explode(self, recipe_id, path):
+        if recipe_id in self.vectors:
+            return self.vectors[recipe_id]
+        if recipe_id in self.errors:
+            return None
+        if recipe_id in path:
+            cycle = path[path.index(recipe_id) :] + [recipe_id]
+            message = "Recipe cycle: " + " -> ".join(self.label(r) for r in cycle)
+            for member in cycle:
+                self.errors[member] = message
+            return None
+
+        recipe = self.recipes[recipe_id]
+        if recipe["standard_yield"] <= 0:
+            self.errors[recipe_id] = "Recipe standard yield must be greater than 0."
+            return None
+        if not self.lines[recipe_id]:
+            self.errors[recipe_id] = "Recipe has no ingredients configured."
+            return None
+
+        path.append(recipe_id)
+        vector = defaultdict(Decimal)
+        for ingredient_id, quantity in self.lines[recipe_id]:
+            per_unit = quantity / recipe["standard_yield"]
+            sub_recipe = self.making.get(ingredient_id)
+            if sub_recipe is None:
+                vector[ingredient_id] += per_unit
+                continue
+            sub_vector = self._explode(sub_recipe, path)
+            if sub_vector is None:
+                self.errors.setdefault(
+                    recipe_id, f"Depends on {self.label(sub_recipe)}, which is invalid."
+                )
+                break
+            for raw_id, raw_quantity in sub_vector.items():
+                vector[raw_id] += per_unit * raw_quantity
+        path.pop()
+
+        if recipe_id in self.errors:
+            return None
+        self.vectors[recipe_id] = dict(vector)
+        return self.vectors[recipe_id]
+
+    def label(self, recipe_id):
+        recipe = self.recipes[recipe_id]
+        return recipe["product__name"] or recipe["composite_ingredient__name"]
+
+    def reaches(self, ingredient_ids, target_id, exclude_recipe=None):
+        """
+        Whether `target_id` is one of `ingredient_ids` or goes, through
+        composite recipes (other than `exclude_recipe`), into one of them.
+        """
+        seen = set()
+        pending = list(ingredient_ids)
+        while pending:
+            ingredient_id = pending.pop()
+            if ingredient_id == target_id:
+                return True
+            if ingredient_id in seen:
+                continue
+            seen.add(ingredient_id)
+            recipe_id = self.making.get(ingredient_id)
+            if recipe_id is not None and recipe_id != exclude_recipe:
+                pending.extend(ingredient for ingredient, _ in self.lines[recipe_id])
+        return False
+
+
+def _memoized(name, versions, build):
+    with _memo_lock:
+        entry = _memo.get(name)
+        if entry is not None and entry[0] == versions:
+            return entry[1]
+    value = build()
+    with _memo_lock:
+        _memo[name] = (versions, value)
+    return value
+
+
+def _build_bom():
+    recipes = list(
+        Recipe.objects.values(
+            "id",
+            "product_id",
+            "product__name",
+            "composite_ingredient_id",
+            "composite_ingredient__name",
+            "standard_yield",
+        )
+    )
+    items = list(RecipeItem.objects.values("recipe_id", "ingredient_id", "quantity"))
+    return BOM(recipes, items)
+
+
+def load_bom():
+    """The exploded BOM, rebuilt only after a recipe change."""
+    versions = namespace_versions([BOM_RESOURCE])
+    return _memoized("bom", versions[BOM_RESOURCE], _build_bom)
+
+
+def _margin_entry(product, bom, ingredients):
+    selling_price = product["selling_price"]
+    entry = {
+        "product": product["id"],
+        "name": product["name"],
+        "selling_price": selling_price,
+        "is_active": product["is_active"],
+        "has_recipe": product["id"] in bom.product_recipes,
+        "unit_cost": None,
+        "margin": None,
+        "margin_percent": None,
+        "error": None,
+        "raw_materials": [],
+    }
+    recipe_id = bom.product_recipes.get(product["id"])
+    if recipe_id is None:
+        entry["error"] = "Product has no recipe configured."
+        return entry
+    vector = bom.vectors.get(recipe_id)
+    if vector is None:
+        entry["error"] = bom.errors[recipe_id]
+        return entry
+
+    unit_cost = Decimal("0")
+    for ingredient_id, quantity in vector.items():
+        ingredient = ingredients[ingredient_id]
+        cost = quantity * ingredient["average_cost_per_unit"]
+        unit_cost += cost
+        entry["raw_materials"].append(
+            {
+                "ingredient": ingredient_id,
+                "name": ingredient["name"],
+                "unit": ingredient["unit"],
+                "quantity": quantity.quantize(QUANTITY),
+                "unit_cost": ingredient["average_cost_per_unit"],
+                "cost": cost.quantize(CENT),
+            }
+        )
+    entry["raw_materials"].sort(key=lambda row: row["cost"], reverse=True)
+    entry["unit_cost"] = unit_cost.quantize(CENT)
+    entry["margin"] = (selling_price - unit_cost).quantize(CENT)
+    if selling_price:
+        entry["margin_percent"] = (
+            (selling_price - unit_cost) * 100 / selling_price
+        ).quantize(CENT)
+    return entry
+
+
+def _build_margins(bom):
+    ingredients = {
+        row["id"]: row
+        for row in Ingredient.objects.values(
+            "id", "name", "unit", "average_cost_per_unit"
+        )
+    }
+    products = Product.objects.order_by("name").values(
+        "id", "name", "selling_price", "is_active"
+    )
+    return {
+        product["id"]: _margin_entry(product, bom, ingredients) for product in products
+    }
+
+
+def product_margins():
+    """
+    {product_id: margin entry} for the whole catalog, ordered by name. An
+    entry has the rolled-up unit cost, margin and raw materials per unit,
+    or an `error` saying why they cannot be computed.
+    """
+    versions = namespace_versions([BOM_RESOURCE, COSTS_RESOURCE, PRODUCTS_RESOURCE])
+    key = tuple(versions[name] for name in sorted(versions))
+    return _memoized("margins", key, lambda: _build_margins(load_bom()))
+
+
+def _bump_costs_on_commit():
+    transaction.on_commit(lambda: bump_namespace(COSTS_RESOURCE))
+
+
+def _on_ingredient_save(sender, instance, update_fields=None, **kwargs):
+    # Stock movements save with update_fields=["current_stock"]; skip them.
+    if update_fields is None or COST_FIELDS & set(update_fields):
+        _bump_costs_on_commit()
+
+
+def _on_ingredient_delete(sender, instance, **kwargs):
+    _bump_costs_on_commit()
+
+
+def track_bom():
+    """Connect the invalidation receivers. Call from ProductionConfig.ready()."""
+    track_resource(BOM_RESOURCE, Recipe, RecipeItem)
+    post_save.connect(
+        _on_ingredient_save, sender=Ingredient, dispatch_uid="bom-ingredient-costs"
+    )
+    post_delete.connect(
+        _on_ingredient_delete,
+        sender=Ingredient,
+        dispatch_uid="bom-ingredient-costs-delete",
+    )
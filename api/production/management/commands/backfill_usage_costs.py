@@ -0,0 +1,66 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+
+from inventory.models import Purchase
+from production.models import IngredientUsage
+
+BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill in unit_cost, extended_cost and wastage_cost on ingredient "
+        "usages recorded before usages carried their own cost. Run "
+        "refresh_financials --full afterwards so stored figures use them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--from-purchases",
+            action="store_true",
+            help=(
+                "Cost each usage at the ingredient's last purchase price up to "
+                "the run, instead of its current average cost."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        usages = IngredientUsage.objects.filter(unit_cost__isnull=True).select_related(
+            "ingredient"
+        )
+        if options["from_purchases"]:
+            last_price = (
+                Purchase.objects.filter(
+                    ingredient=OuterRef("ingredient"),
+                    purchase_date__lte=OuterRef("production_run__date_produced"),
+                )
+                .order_by("-purchase_date")
+                .values("unit_cost")[:1]
+            )
+            usages = usages.annotate(purchase_cost=Subquery(last_price))
+
+        updated = 0
+        batch = []
+        with transaction.atomic():
+            for usage in usages.iterator(chunk_size=BATCH_SIZE):
+                unit_cost = getattr(usage, "purchase_cost", None)
+                if unit_cost is None:
+                    unit_cost = usage.ingredient.average_cost_per_unit
+                usage.unit_cost = unit_cost
+                usage.extended_cost = usage.actual_amount * unit_cost
+                usage.wastage_cost = usage.wastage * unit_cost
+                batch.append(usage)
+                if len(batch) == BATCH_SIZE:
+                    updated += self._save(batch)
+            updated += self._save(batch)
+
+        self.stdout.write(self.style.SUCCESS(f"Costed {updated} usage(s)."))
+
+    def _save(self, batch):
+        IngredientUsage.objects.bulk_update(
+            batch, ["unit_cost", "extended_cost", "wastage_cost"]
+        )
+        count = len(batch)
+        batch.clear()
+        return count
@@ -0,0 +1,20 @@
+# Generated by Django 6.0 on 2026-10-19 09:00
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0004_purchase_expense'),
+        ('production', '0004_alter_recipe_composite_ingredient'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='productionrun',
+            index=models.Index(fields=['-date_produced'], name='production__date_pr_7f5981_idx'),
+        ),
+    ]
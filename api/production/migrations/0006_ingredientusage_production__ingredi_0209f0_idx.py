@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-19 10:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0005_purchase_inventory_p_purchas_aba9fc_idx_and_more'),
+        ('production', '0005_productionrun_production__date_pr_7f5981_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='ingredientusage',
+            index=models.Index(fields=['ingredient', 'production_run'], name='production__ingredi_0209f0_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 6.0 on 2026-10-19 12:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('production', '0006_ingredientusage_production__ingredi_0209f0_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ingredientusage',
+            name='extended_cost',
+            field=models.DecimalField(blank=True, decimal_places=5, max_digits=18, null=True),
+        ),
+        migrations.AddField(
+            model_name='ingredientusage',
+            name='unit_cost',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True),
+        ),
+        migrations.AddField(
+            model_name='ingredientusage',
+            name='wastage_cost',
+            field=models.DecimalField(blank=True, decimal_places=5, max_digits=18, null=True),
+        ),
+    ]
@@ -98,6 +98,11 @@ class ProductionRun(models.Model):
     date_produced = models.DateTimeField(auto_now_add=True)
     notes = models.TextField(blank=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["-date_produced"]),
+        ]
+
     def __str__(self):
         if self.product:
             name = self.product.name
@@ -125,6 +130,29 @@ class IngredientUsage(models.Model):
     # Wastage = Actual - Theoretical
     wastage = models.DecimalField(max_digits=10, decimal_places=3, default=0)
 
+    # Ingredient's average cost when the run was recorded; costs below are
+    # derived from it, so reports stay right after prices move.
+    # Null on rows older than this field until backfill_usage_costs runs.
+    unit_cost = models.DecimalField(
+        max_digits=10, decimal_places=2, null=True, blank=True
+    )
+    # Actual x unit cost
+    extended_cost = models.DecimalField(
+        max_digits=18, decimal_places=5, null=True, blank=True
+    )
+    # Wastage x unit cost
+    wastage_cost = models.DecimalField(
+        max_digits=18, decimal_places=5, null=True, blank=True
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["ingredient", "production_run"]),
+        ]
+
     def save(self, *args, **kwargs):
         self.wastage = self.actual_amount - self.theoretical_amount
+        if self.unit_cost is not None:
+            self.extended_cost = self.actual_amount * self.unit_cost
+            self.wastage_cost = self.wastage * self.unit_cost
         super().save(*args, **kwargs)
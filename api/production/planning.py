@@ -0,0 +1,195 @@
+"""
+Production planning (MRP) over the exploded BOM.
+
+`plan()` turns target quantities per product into raw-material needs,
+shortfalls against `Ingredient.current_stock` and the composite-ingredient
+runs to make first. The recipe matrices are built once per BOM version
+(see `BOM.derived`):
+
+- `direct`: products x ingredients, what one unit of each product uses
+  straight from its recipe (raw and composite ingredients alike);
+- one matrix per composite level, composites x ingredients, what one unit
+  of each composite uses. A composite's level is one more than the deepest
+  recipe that uses it, so all of its demand is known before its own level
+  is netted.
+
+Planning the whole catalog is therefore one vector-matrix product for the
+products plus one per composite level, each netting composite stock on
+hand before passing the remainder down. NumPy is imported on first use so
+it stays out of worker startup.
+"""
+
+from inventory.models import Ingredient
+
+from .bom import load_bom
+
+QUANTITY_DECIMALS = 3
+
+
+class PlanError(ValueError):
+    """Targets name products that cannot be planned."""
+
+    def __init__(self, errors):
+        self.errors = errors
+        super().__init__("; ".join(errors.values()))
+
+
+class PlanMatrices:
+    def __init__(self, bom):
+        import numpy as np
+
+        valid = bom.vectors.keys()
+        self.product_rows = {
+            product_id: row
+            for row, product_id in enumerate(
+                product_id
+                for product_id, recipe_id in bom.product_recipes.items()
+                if recipe_id in valid
+            )
+        }
+        composite_recipes = {
+            ingredient_id: recipe_id
+            for ingredient_id, recipe_id in bom.making.items()
+            if recipe_id in valid
+        }
+
+        ingredient_ids = set(composite_recipes)
+        for recipe_id in valid:
+            ingredient_ids.update(ingredient for ingredient, _ in bom.lines[recipe_id])
+        self.ingredient_ids = sorted(ingredient_ids)
+        self.columns = {
+            ingredient_id: column
+            for column, ingredient_id in enumerate(self.ingredient_ids)
+        }
+        self.is_composite = np.array(
+            [
+                ingredient_id in composite_recipes
+                for ingredient_id in self.ingredient_ids
+            ],
+            dtype=bool,
+        )
+
+        def per_unit_row(recipe_id):
+            row = np.zeros(len(self.ingredient_ids))
+            recipe_yield = float(bom.recipes[recipe_id]["standard_yield"])
+            for ingredient_id, quantity in bom.lines[recipe_id]:
+                row[self.columns[ingredient_id]] += float(quantity) / recipe_yield
+            return row
+
+        self.direct = np.zeros((len(self.product_rows), len(self.ingredient_ids)))
+        for product_id, row in self.product_rows.items():
+            self.direct[row] = per_unit_row(bom.product_recipes[product_id])
+
+        # Low-level codes: products are level 0, a composite sits one below
+        # the deepest valid recipe that uses it.
+        users = {}
+        for recipe_id in valid:
+            for ingredient_id, _ in bom.lines[recipe_id]:
+                users.setdefault(ingredient_id, set()).add(recipe_id)
+        produces = {
+            recipe_id: ingredient_id
+            for ingredient_id, recipe_id in composite_recipes.items()
+        }
+        levels = {}
+
+        def level(ingredient_id):
+            if ingredient_id not in levels:
+                levels[ingredient_id] = 1 + max(
+                    (
+                        level(produces[user]) if user in produces else 0
+                        for user in users.get(ingredient_id, ())
+                    ),
+                    default=0,
+                )
+            return levels[ingredient_id]
+
+        by_level = {}
+        for ingredient_id in composite_recipes:
+            by_level.setdefault(level(ingredient_id), []).append(ingredient_id)
+        self.composite_levels = levels
+        self.levels = [
+            (
+                np.array([self.columns[i] for i in by_level[code]], dtype=np.intp),
+                np.array([per_unit_row(composite_recipes[i]) for i in by_level[code]]),
+            )
+            for code in sorted(by_level)
+        ]
+
+
+def _matrices(bom):
+    return PlanMatrices(bom)
+
+
+def _round(value):
+    return round(float(value), QUANTITY_DECIMALS)
+
+
+def plan(targets):
+    """
+    Plan `targets` ({product_id: quantity}). Returns the raw-material
+    requirements with their shortfalls and the composite runs needed, or
+    raises PlanError for products without a usable recipe.
+    """
+    import numpy as np
+
+    bom = load_bom()
+    matrices = bom.derived("plan-matrices", _matrices)
+
+    errors = {}
+    for product_id in targets:
+        if product_id not in matrices.product_rows:
+            recipe_id = bom.product_recipes.get(product_id)
+            errors[product_id] = (
+                bom.errors.get(recipe_id, "Recipe is invalid.")
+                if recipe_id is not None
+                else f"Product {product_id} has no recipe configured."
+            )
+    if errors:
+        raise PlanError(errors)
+
+    quantities = np.zeros(len(matrices.product_rows))
+    for product_id, quantity in targets.items():
+        quantities[matrices.product_rows[product_id]] += float(quantity)
+
+    ingredients = Ingredient.objects.filter(pk__in=matrices.ingredient_ids).only(
+        "name", "unit", "current_stock"
+    )
+    stock = np.zeros(len(matrices.ingredient_ids))
+    for ingredient in ingredients:
+        stock[matrices.columns[ingredient.pk]] = float(ingredient.current_stock)
+
+    demand = quantities @ matrices.direct
+    runs = np.zeros_like(demand)
+    for columns, per_unit in matrices.levels:
+        runs[columns] = np.maximum(demand[columns] - stock[columns], 0)
+        demand += runs[columns] @ per_unit
+    shortfall = np.where(matrices.is_composite, 0, np.maximum(demand - stock, 0))
+
+    requirements = []
+    composite_runs = []
+    for ingredient in sorted(ingredients, key=lambda ingredient: ingredient.name):
+        column = matrices.columns[ingredient.pk]
+        if demand[column] <= 0:
+            continue
+        row = {
+            "ingredient": ingredient.pk,
+            "name": ingredient.name,
+            "unit": ingredient.unit,
+            "required": _round(demand[column]),
+            "in_stock": _round(stock[column]),
+        }
+        if matrices.is_composite[column]:
+            composite_runs.append({**row, "quantity_to_produce": _round(runs[column])})
+        else:
+            requirements.append({**row, "shortfall": _round(shortfall[column])})
+
+    requirements.sort(key=lambda row: row["shortfall"], reverse=True)
+    # Deepest composites first: they go into the ones above them.
+    composite_runs.sort(
+        key=lambda row: matrices.composite_levels[row["ingredient"]], reverse=True
+    )
+    return {
+        "requirements": requirements,
+        "composite_runs": [row for row in composite_runs if row["quantity_to_produce"]],
+        "has_shortfall": bool((shortfall > 0).any()),
+    }
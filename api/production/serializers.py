@@ -1,6 +1,10 @@
+from decimal import Decimal
+
 from django.db import transaction
 from rest_framework import serializers
 
+from core.tracing import span, traced
+
 from .models import IngredientUsage, Product, ProductionRun, Recipe, RecipeItem
 
 
@@ -54,6 +58,34 @@ class RecipeSerializer(serializers.ModelSerializer):
             "items",
         ]
 
+    def validate(self, data):
+        # A composite recipe must not use its own output, even through
+        # other composite recipes.
+        composite = data.get(
+            "composite_ingredient",
+            self.instance.composite_ingredient if self.instance else None,
+        )
+        changed = "composite_ingredient" in data or "items" in data
+        if composite is not None and changed:
+            from .bom import load_bom
+
+            if "items" in data:
+                ingredient_ids = [item["ingredient"].pk for item in data["items"]]
+            else:
+                ingredient_ids = list(
+                    self.instance.items.values_list("ingredient_id", flat=True)
+                )
+            if load_bom().reaches(
+                ingredient_ids,
+                composite.pk,
+                exclude_recipe=self.instance.pk if self.instance else None,
+            ):
+                field = "items" if "items" in data else "composite_ingredient"
+                raise serializers.ValidationError(
+                    {field: f"{composite.name} cannot be an ingredient of itself."}
+                )
+        return data
+
     def create(self, validated_data):
         items_data = validated_data.pop("items")
         recipe = Recipe.objects.create(**validated_data)
@@ -115,16 +147,20 @@ class ProductionRunSerializer(serializers.ModelSerializer):
         read_only_fields = ("chef", "date_produced")
 
     def get_usages(self, obj):
-        # Simple representation of usage for GET requests
-        return list(
-            obj.usages.values(
-                "ingredient__name",
-                "ingredient__unit",
-                "theoretical_amount",
-                "actual_amount",
-                "wastage",
-            )
-        )
+        # Simple representation of usage for GET requests, read from the
+        # viewset's prefetch rather than queried once per run.
+        return [
+            {
+                "ingredient__name": usage.ingredient.name,
+                "ingredient__unit": usage.ingredient.unit,
+                "theoretical_amount": usage.theoretical_amount,
+                "actual_amount": usage.actual_amount,
+                "wastage": usage.wastage,
+                "unit_cost": usage.unit_cost,
+                "extended_cost": usage.extended_cost,
+            }
+            for usage in obj.usages.all()
+        ]
 
     def validate(self, data):
         # Ensure either product or composite is selected, not both, not neither
@@ -138,6 +174,7 @@ class ProductionRunSerializer(serializers.ModelSerializer):
             )
         return data
 
+    @traced("production.create")
     def create(self, validated_data):
         usage_inputs = validated_data.pop("usage_inputs", [])
 
@@ -183,21 +220,23 @@ class ProductionRunSerializer(serializers.ModelSerializer):
                     f"Actual amount for ingredient {ingredient_id} cannot be negative."
                 )
 
-        with transaction.atomic():
+        with span("production.write"), transaction.atomic():
             # Create Run
-            run = ProductionRun.objects.create(**validated_data)
+            with span("production.insert_run"):
+                run = ProductionRun.objects.create(**validated_data)
 
             # Update Stock of the Finished Good (use F() to avoid race conditions)
             from django.db.models import F
 
-            if product:
-                product.stock_quantity = F("stock_quantity") + int(
-                    qty
-                )  # Assuming integer units for products like bread
-                product.save(update_fields=["stock_quantity"])
-            elif composite:
-                composite.current_stock = F("current_stock") + qty
-                composite.save(update_fields=["current_stock"])
+            with span("production.update_output_stock"):
+                if product:
+                    product.stock_quantity = F("stock_quantity") + int(
+                        qty
+                    )  # Assuming integer units for products like bread
+                    product.save(update_fields=["stock_quantity"])
+                elif composite:
+                    composite.current_stock = F("current_stock") + qty
+                    composite.save(update_fields=["current_stock"])
 
             # 3. Calculate Ingredients & Deduct Stock
             ratio = qty / recipe.standard_yield
@@ -218,18 +257,23 @@ class ProductionRunSerializer(serializers.ModelSerializer):
                     )
 
                 # Record Usage
-                IngredientUsage.objects.create(
-                    production_run=run,
-                    ingredient=item.ingredient,
-                    theoretical_amount=theoretical,
-                    actual_amount=actual,
-                )
+                with span("production.record_usage", ingredient_id=item.ingredient_id):
+                    IngredientUsage.objects.create(
+                        production_run=run,
+                        ingredient=item.ingredient,
+                        theoretical_amount=theoretical,
+                        actual_amount=actual,
+                        unit_cost=item.ingredient.average_cost_per_unit,
+                    )
 
                 # Deduct Raw Material Stock (use F() to avoid race conditions)
                 # Note: We do not stop production if stock is low
                 # (negative stock allowed per logic)
-                item.ingredient.current_stock = F("current_stock") - actual
-                item.ingredient.save(update_fields=["current_stock"])
+                with span(
+                    "production.deduct_ingredient", ingredient_id=item.ingredient_id
+                ):
+                    item.ingredient.current_stock = F("current_stock") - actual
+                    item.ingredient.save(update_fields=["current_stock"])
 
         # Send notification outside transaction
         from notifications.models import NotificationEvent
@@ -252,3 +296,16 @@ class ProductionRunSerializer(serializers.ModelSerializer):
         )
 
         return run
+
+
+class PlanTargetSerializer(serializers.Serializer):
+    product_id = serializers.IntegerField()
+    quantity = serializers.DecimalField(
+        max_digits=10, decimal_places=2, min_value=Decimal("0.01")
+    )
+
+
+class ProductionPlanSerializer(serializers.Serializer):
+    """Input for the production plan: how much of each product to make."""
+
+    targets = PlanTargetSerializer(many=True, allow_empty=False)
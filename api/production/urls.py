@@ -1,7 +1,12 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from .views import ProductionRunViewSet, ProductViewSet, RecipeViewSet
+from .views import (
+    ProductionPlanView,
+    ProductionRunViewSet,
+    ProductViewSet,
+    RecipeViewSet,
+)
 
 router = DefaultRouter()
 router.register(r"products", ProductViewSet)
@@ -9,5 +14,6 @@ router.register(r"recipes", RecipeViewSet)
 router.register(r"runs", ProductionRunViewSet)
 
 urlpatterns = [
+    path("plan/", ProductionPlanView.as_view(), name="production-plan"),
     path("", include(router.urls)),
 ]
@@ -1,12 +1,24 @@
 from django.db import transaction
 from django.db.models import F
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import filters, permissions, viewsets
+from rest_framework import filters, permissions, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.views import APIView
 
+from core.conditional import ConditionalGetMixin
+from core.filters import DateRangeFilterBackend
+from core.streaming import StreamingListMixin
+
+from .bom import product_margins
 from .models import Product, ProductionRun, Recipe
-from .serializers import ProductionRunSerializer, ProductSerializer, RecipeSerializer
+from .planning import PlanError, plan
+from .serializers import (
+    ProductionPlanSerializer,
+    ProductionRunSerializer,
+    ProductSerializer,
+    RecipeSerializer,
+)
 
 
 class IsChefOrAdmin(permissions.BasePermission):
@@ -25,20 +37,49 @@ class IsChefOrAdmin(permissions.BasePermission):
             return False
 
         # Chefs can Read/Create ProductionRuns. Only Admin can manage Recipes/Products.
-        if view.action in ["create", "list", "retrieve", "products_with_recipes"]:
+        if view.action in [
+            "create",
+            "list",
+            "retrieve",
+            "products_with_recipes",
+            "plan",
+        ]:
             return request.user.role in ["admin", "chef", "storekeeper"]
         return request.user.role == "admin"
 
 
-class ProductViewSet(viewsets.ModelViewSet):
+def _without_materials(entry):
+    return {key: value for key, value in entry.items() if key != "raw_materials"}
+
+
+class ProductViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = Product.objects.all()
     serializer_class = ProductSerializer
     permission_classes = [IsChefOrAdmin]
+    etag_resources = ("products",)
     filter_backends = [filters.SearchFilter]
     search_fields = ["name"]
 
+    @action(detail=False, methods=["get"])
+    def margins(self, request):
+        """
+        Rolled-up recipe cost and margin per unit of every product, through
+        all composite levels. ?is_active=true|false narrows the list.
+        """
+        entries = product_margins().values()
+        is_active = request.query_params.get("is_active")
+        if is_active in ("true", "false"):
+            entries = [e for e in entries if e["is_active"] == (is_active == "true")]
+        return Response([_without_materials(entry) for entry in entries])
+
+    @action(detail=True, methods=["get"])
+    def margin(self, request, pk=None):
+        """One product's margin with its raw materials per unit."""
+        product = self.get_object()
+        return Response(product_margins()[product.pk])
 
-class RecipeViewSet(viewsets.ModelViewSet):
+
+class RecipeViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = (
         Recipe.objects.select_related("product", "composite_ingredient")
         .prefetch_related("items__ingredient")
@@ -46,6 +87,7 @@ class RecipeViewSet(viewsets.ModelViewSet):
     )
     serializer_class = RecipeSerializer
     permission_classes = [IsChefOrAdmin]
+    etag_resources = ("recipes",)
     filter_backends = [filters.SearchFilter]
     search_fields = ["product__name", "instructions"]
 
@@ -66,7 +108,7 @@ class RecipeViewSet(viewsets.ModelViewSet):
         )
 
 
-class ProductionRunViewSet(viewsets.ModelViewSet):
+class ProductionRunViewSet(StreamingListMixin, viewsets.ModelViewSet):
     queryset = (
         ProductionRun.objects.select_related("chef", "product", "composite_ingredient")
         .prefetch_related("usages__ingredient")
@@ -74,15 +116,13 @@ class ProductionRunViewSet(viewsets.ModelViewSet):
     )
     serializer_class = ProductionRunSerializer
     permission_classes = [IsChefOrAdmin]
-    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
+    filter_backends = [
+        DjangoFilterBackend,
+        DateRangeFilterBackend,
+        filters.OrderingFilter,
+    ]
     filterset_fields = ["product", "chef"]
-
-    def get_queryset(self):
-        queryset = super().get_queryset()
-        start_date = self.request.query_params.get("start_date")
-        if start_date:
-            queryset = queryset.filter(date_produced__gte=start_date)
-        return queryset
+    date_range_field = "date_produced"
 
     def perform_create(self, serializer):
         serializer.save(chef=self.request.user)
@@ -116,3 +156,30 @@ class ProductionRunViewSet(viewsets.ModelViewSet):
             # Delete the production run
             # (this will cascade delete IngredientUsage records)
             instance.delete()
+
+
+class ProductionPlanView(APIView):
+    """
+    Raw materials, shortfalls and composite runs needed to make the posted
+    targets: {"targets": [{"productId": 1, "quantity": 40}, ...]}.
+    """
+
+    permission_classes = [IsChefOrAdmin]
+    action = "plan"
+
+    def post(self, request):
+        serializer = ProductionPlanSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        targets = {}
+        for target in serializer.validated_data["targets"]:
+            product_id = target["product_id"]
+            targets[product_id] = targets.get(product_id, 0) + target["quantity"]
+
+        try:
+            result = plan(targets)
+        except PlanError as exc:
+            return Response(
+                {"error": str(exc), "products": exc.errors},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return Response(result)
@@ -0,0 +1,96 @@
+"""
+Finished export workbooks, stored under EXPORT_CACHE_DIR.
+
+A file name combines the request (dates and sheet set) with a watermark:
+the write counters of every business day in the period plus those of the
+reference data the sheets show (names, employees, accounts). Any write the
+workbook depends on changes the watermark, so the next request builds a
+new file; otherwise the stored one is streamed as is. The counters are
+bumped by `reports.signals`.
+"""
+
+import glob
+import hashlib
+import os
+import tempfile
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from core.caching import namespace_versions
+
+# Rows dated on a given business day (sales, runs, purchases, payroll, ...)
+DAY_NAMESPACE = "export-day:{}"
+# Names and other attributes shown next to those rows
+REFERENCE_NAMESPACE = "export-reference"
+# Current stock and balances, which only periods reaching today show as
+# they are now; a closed period keeps the figures it was first built with.
+LIVE_NAMESPACE = "export-live"
+
+
+def period_days(start_date, end_date):
+    day = start_date
+    while day <= end_date:
+        yield day
+        day += timedelta(days=1)
+
+
+def export_watermark(start_date, end_date):
+    namespaces = [REFERENCE_NAMESPACE]
+    namespaces += [
+        DAY_NAMESPACE.format(day) for day in period_days(start_date, end_date)
+    ]
+    if end_date >= timezone.localdate():
+        namespaces.append(LIVE_NAMESPACE)
+    versions = namespace_versions(namespaces)
+    raw = "|".join(f"{name}={versions[name]}" for name in namespaces)
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def _request_key(start_date, end_date, sheets):
+    raw = f"{start_date}|{end_date}|{','.join(sheets) or 'all'}"
+    return hashlib.sha1(raw.encode()).hexdigest()[:16]
+
+
+def artifact_path(start_date, end_date, sheets=()):
+    """
+    Where the workbook for this request and the current data lives. The
+    file exists only if it was already built. Compute this before building,
+    so a write made during the build leads to a rebuild next time.
+    """
+    request_key = _request_key(start_date, end_date, sheets)
+    watermark = export_watermark(start_date, end_date)
+    return os.path.join(settings.EXPORT_CACHE_DIR, f"{request_key}-{watermark}.xlsx")
+
+
+def store_artifact(path, save):
+    """
+    Write the workbook to `path` atomically, via `save(fileobj)`, and drop
+    older builds of the same request. Returns the new file opened for
+    reading; the handle stays valid even if a concurrent request with a
+    newer watermark deletes the file before it has been streamed.
+    """
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    stored = None
+    try:
+        with os.fdopen(fd, "wb") as tmp:
+            save(tmp)
+        stored = open(tmp_path, "rb")
+        os.replace(tmp_path, path)
+    except BaseException:
+        if stored is not None:
+            stored.close()
+        os.unlink(tmp_path)
+        raise
+
+    request_key = os.path.basename(path).split("-", 1)[0]
+    for stale in glob.glob(os.path.join(directory, f"{request_key}-*.xlsx")):
+        if stale != path:
+            try:
+                os.unlink(stale)
+            except FileNotFoundError:
+                pass
+    return stored
@@ -0,0 +1,476 @@
+"""
+Excel workbook styling for report exports.
+
+Kept out of reports.views so openpyxl is only imported when an export
+actually runs.
+"""
+
+from decimal import Decimal
+
+import openpyxl
+from openpyxl.cell.cell import TIME_FORMATS
+from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
+from openpyxl.utils import get_column_letter
+
+from .sheets import SHEETS, kitchen_activity_row, kitchen_activity_usages
+
+# Value kind -> number format of table cells holding it. Dates and times
+# keep the format openpyxl gives them on assignment.
+NUMBER_FORMATS = {
+    "text": "General",
+    "int": "#,##0",
+    "decimal": "#,##0.00",
+    **{value_type.__name__: fmt for value_type, fmt in TIME_FORMATS.items()},
+}
+TABLE_HEADER_STYLE = "Report Table Header"
+
+
+def _number_kind(value):
+    if isinstance(value, bool):
+        return "text"
+    if isinstance(value, int):
+        return "int"
+    if isinstance(value, (float, Decimal)):
+        return "decimal"
+    if type(value) in TIME_FORMATS:
+        return type(value).__name__
+    return "text"
+
+
+def _body_style(kind, zebra):
+    return f"Report Table Row {'Striped ' if zebra else ''}({kind})"
+
+
+def _total_style(kind):
+    return f"Report Table Total ({kind})"
+
+
+# ==========================================
+# HELPER: Excel Styling & Formatting
+# ==========================================
+
+
+class ExcelStyler:
+    """
+    Handles design: Big titles, readable tables, simple colors.
+    """
+
+    def __init__(self):
+        # Professional but friendly colors (Navy Blue & White theme)
+        self.header_bg = "203764"  # Deep Navy Blue
+        self.header_text = "FFFFFF"  # White
+        self.total_bg = "DDEBF7"  # Very Light Blue
+        self.zebra_stripe = "F7F7F7"  # Almost white grey
+
+        # Borders
+        self.thin_border = Side(border_style="thin", color="BFBFBF")
+        self.thick_border = Side(border_style="medium", color="000000")
+        self.border_full = Border(
+            left=self.thin_border,
+            right=self.thin_border,
+            top=self.thin_border,
+            bottom=self.thin_border,
+        )
+
+        # Fonts
+        self.font_title = Font(name="Calibri", size=18, bold=True, color="203764")
+        self.font_subtitle = Font(name="Calibri", size=12, italic=True, color="595959")
+        self.font_header = Font(
+            name="Calibri", size=11, bold=True, color=self.header_text
+        )
+        self.font_total = Font(name="Calibri", size=11, bold=True)
+        self.font_body = Font(name="Calibri", size=11)
+
+        # Alignments
+        self.align_center = Alignment(horizontal="center", vertical="center")
+        self.align_left = Alignment(horizontal="left", vertical="center")
+        self.align_right = Alignment(horizontal="right", vertical="center")
+
+    def add_sheet_header(self, ws, title, subtitle, merge_cols=6):
+        """Adds the big text at the top of the sheet"""
+        ws["A1"] = title
+        ws["A1"].font = self.font_title
+
+        ws["A2"] = subtitle
+        ws["A2"].font = self.font_subtitle
+
+        # Merge cells slightly so text doesn't get cut off
+        end_col = get_column_letter(max(1, merge_cols))
+        ws.merge_cells(f"A1:{end_col}1")
+        ws.merge_cells(f"A2:{end_col}2")
+
+    def _solid_fill(self, color):
+        return PatternFill(start_color=color, end_color=color, fill_type="solid")
+
+    def register_table_styles(self, wb):
+        """
+        Adds the NamedStyles used by `create_table` to `wb` (once). Cells
+        then take a whole style by name instead of one allocation and one
+        style-table lookup per font, fill, border and number format.
+        """
+        if TABLE_HEADER_STYLE in wb.named_styles:
+            return
+
+        wb.add_named_style(
+            NamedStyle(
+                name=TABLE_HEADER_STYLE,
+                font=self.font_header,
+                fill=self._solid_fill(self.header_bg),
+                border=self.border_full,
+                alignment=self.align_center,
+            )
+        )
+        total_border = Border(
+            top=self.thick_border,
+            bottom=self.thick_border,
+            left=self.thin_border,
+            right=self.thin_border,
+        )
+        for kind, number_format in NUMBER_FORMATS.items():
+            for zebra in (False, True):
+                wb.add_named_style(
+                    NamedStyle(
+                        name=_body_style(kind, zebra),
+                        font=self.font_body,
+                        fill=self._solid_fill(self.zebra_stripe)
+                        if zebra
+                        else PatternFill(),
+                        border=self.border_full,
+                        number_format=number_format,
+                    )
+                )
+            wb.add_named_style(
+                NamedStyle(
+                    name=_total_style(kind),
+                    font=self.font_total,
+                    fill=self._solid_fill(self.total_bg),
+                    border=total_border,
+                    number_format=number_format,
+                )
+            )
+
+    def create_table(self, ws, headers, data, sum_columns=None):
+        """
+        Standard table generator: header row, zebra-striped rows and a
+        GRAND TOTAL row, with column widths tracked as rows are written.
+        """
+        if sum_columns is None:
+            sum_columns = []
+        self.register_table_styles(ws.parent)
+        widths = {}
+        # ws.max_row scans every cell, so the row number is counted here:
+        # each ws.append() writes to the row after the previous one.
+        next_row = None
+
+        def write_row(values, style_for):
+            nonlocal next_row
+            ws.append(values)
+            if next_row is None:
+                next_row = ws.max_row
+            for col_idx, value in enumerate(values, start=1):
+                ws.cell(row=next_row, column=col_idx).style = style_for(value)
+                if value:
+                    length = len(str(value))
+                    if length > widths.get(col_idx, 0):
+                        widths[col_idx] = length
+            next_row += 1
+
+        # 1. Write Headers (row 4)
+        ws.append([])
+        write_row(headers, lambda value: TABLE_HEADER_STYLE)
+
+        # 2. Write Data
+        totals = {col_idx: 0.0 for col_idx in sum_columns}
+        body_styles = {
+            zebra: {kind: _body_style(kind, zebra) for kind in NUMBER_FORMATS}
+            for zebra in (False, True)
+        }
+
+        for i, row_data in enumerate(data):
+            # Zebra Striping
+            styles = body_styles[i % 2 == 0]
+            write_row(row_data, lambda value: styles[_number_kind(value)])
+
+            for col_idx in sum_columns:
+                if col_idx < len(row_data):
+                    value = row_data[col_idx]
+                    if isinstance(value, (int, float, Decimal)):
+                        totals[col_idx] += float(value)
+
+        # 3. Write Totals Row
+        if sum_columns and data:
+            total_row_data = [""] * len(headers)
+            total_row_data[0] = "GRAND TOTAL"
+
+            for col_idx, total_val in totals.items():
+                total_row_data[col_idx] = total_val
+
+            write_row(total_row_data, lambda value: _total_style(_number_kind(value)))
+
+        self._apply_column_widths(ws, widths)
+
+    def _apply_column_widths(self, ws, widths):
+        for col_idx in range(1, ws.max_column + 1):
+            adjusted_width = min(max(widths.get(col_idx, 0) + 3, 12), 50)
+            ws.column_dimensions[get_column_letter(col_idx)].width = adjusted_width
+
+    def adjust_column_widths(self, ws):
+        """
+        Smart column width adjustment that handles Merged Cells correctly.
+        """
+        for col in ws.columns:
+            max_length = 0
+            # FIX: Use get_column_letter to avoid AttributeError on MergedCells
+            column_letter = get_column_letter(col[0].column)
+
+            for cell in col:
+                # Skip title rows
+                if cell.row < 3:
+                    continue
+                try:
+                    if cell.value:
+                        length = len(str(cell.value))
+                        if length > max_length:
+                            max_length = length
+                except Exception:
+                    pass
+
+            adjusted_width = max_length + 3
+            if adjusted_width < 12:
+                adjusted_width = 12
+            if adjusted_width > 50:
+                adjusted_width = 50
+
+            ws.column_dimensions[column_letter].width = adjusted_width
+
+
+# ==========================================
+# Sheet writers
+# ==========================================
+
+
+def write_table_sheet(wb, styler, sheet, period):
+    ws = wb.create_sheet(sheet.name)
+    styler.add_sheet_header(
+        ws, sheet.title, sheet.get_subtitle(period), merge_cols=len(sheet.headers)
+    )
+    styler.create_table(
+        ws, sheet.headers, list(sheet.rows(period)), sum_columns=sheet.sum_columns
+    )
+
+
+def write_overview_sheet(wb, styler, sheet, period):
+    ws_overview = wb.create_sheet(sheet.name)
+    ws_overview.sheet_view.showGridLines = False
+    (
+        money_in,
+        count_sales,
+        avg_spend,
+        money_out,
+        payroll_paid,
+        other_expenses_paid,
+        est_profit,
+    ) = list(sheet.rows(period))
+
+    styler.add_sheet_header(ws_overview, sheet.title, sheet.get_subtitle(period))
+
+    def add_summary_line(row, line, is_money=False, bold_value=False):
+        label, value = line
+        cell_lbl = ws_overview.cell(row=row, column=2, value=label)
+        cell_val = ws_overview.cell(row=row, column=3, value=value)
+
+        cell_lbl.font = Font(name="Calibri", size=11)
+        cell_lbl.border = Border(bottom=Side(style="thin", color="CCCCCC"))
+
+        cell_val.font = Font(name="Calibri", size=11, bold=bold_value)
+        cell_val.alignment = Alignment(horizontal="right")
+        cell_val.border = Border(bottom=Side(style="thin", color="CCCCCC"))
+
+        if is_money:
+            cell_val.number_format = "#,##0.00"
+
+    ws_overview["B5"] = "Money Coming In"
+    ws_overview["B5"].font = Font(name="Calibri", bold=True, size=12, color="203764")
+
+    add_summary_line(6, money_in, True, True)
+    add_summary_line(7, count_sales)
+    add_summary_line(8, avg_spend, True)
+
+    ws_overview["B10"] = "Money Going Out"
+    ws_overview["B10"].font = Font(name="Calibri", bold=True, size=12, color="203764")
+
+    add_summary_line(11, money_out, True)
+    add_summary_line(12, payroll_paid, True)
+    add_summary_line(13, other_expenses_paid, True)
+
+    ws_overview["B14"] = est_profit[0]
+    ws_overview["B14"].font = Font(name="Calibri", bold=True, size=12, color="203764")
+
+    profit = est_profit[1]
+    ws_overview["B15"] = "Sales minus Purchases minus Payroll minus Other Expenses"
+    ws_overview["C15"] = profit
+    ws_overview["C15"].number_format = "#,##0.00"
+    ws_overview["C15"].font = Font(
+        bold=True, size=12, color="006100" if profit >= 0 else "9C0006"
+    )
+
+    ws_overview.column_dimensions["A"].width = 5
+    ws_overview.column_dimensions["B"].width = 30
+    ws_overview.column_dimensions["C"].width = 25
+
+
+def write_kitchen_sheet(wb, styler, sheet, period):
+    """Kitchen activity, with each production run's cells merged."""
+    ws_run = wb.create_sheet(sheet.name)
+    headers = sheet.headers
+    styler.add_sheet_header(
+        ws_run, sheet.title, sheet.get_subtitle(period), merge_cols=len(headers)
+    )
+
+    # 1. Write Headers
+    ws_run.append([])
+    ws_run.append(headers)  # Row 4
+
+    header_row_idx = 4
+    for cell in ws_run[header_row_idx]:
+        cell.fill = PatternFill(
+            start_color=styler.header_bg,
+            end_color=styler.header_bg,
+            fill_type="solid",
+        )
+        cell.font = styler.font_header
+        cell.alignment = styler.align_center
+        cell.border = styler.border_full
+
+    # 2. Custom Loop for Merging (usages come sorted by run)
+    current_row = 5
+    start_merge_row = 5
+    last_run_id = None
+
+    # Zebra Striping logic for groups requires tracking "group index"
+    group_idx = 0
+    fill_color = None
+
+    total_made = 0
+    total_used = 0
+    total_wasted = 0
+
+    # We append a 'dummy' None at the end to force the merge logic to
+    # trigger for the last group
+    usage_list = list(kitchen_activity_usages(period))
+    usage_list.append(None)
+
+    for u in usage_list:
+        if u is None:
+            # End of list, trigger last merge
+            run_id = -1
+        else:
+            run_id = u.production_run.id
+
+        # CHECK GROUP CHANGE
+        if last_run_id is not None and run_id != last_run_id:
+            # Merge the Previous Group (Cols A, B, C, D: date, chef, item, qty)
+            if current_row > start_merge_row:
+                for column in range(1, 5):
+                    ws_run.merge_cells(
+                        start_row=start_merge_row,
+                        start_column=column,
+                        end_row=current_row - 1,
+                        end_column=column,
+                    )
+                    # Apply Vertical Center to the merged cells
+                    ws_run.cell(
+                        row=start_merge_row, column=column
+                    ).alignment = Alignment(horizontal="center", vertical="center")
+
+            start_merge_row = current_row
+            group_idx += 1
+
+        if u is None:
+            break  # Exit loop
+
+        # Prepare Colors for this group
+        if group_idx % 2 == 0:
+            fill_color = PatternFill(
+                start_color=styler.zebra_stripe,
+                end_color=styler.zebra_stripe,
+                fill_type="solid",
+            )
+        else:
+            fill_color = None
+
+        # Write Row
+        run = u.production_run
+        ws_run.append(kitchen_activity_row(u))
+
+        # Apply Styles to the new row
+        row_cells = ws_run[current_row]
+        for col_idx, cell in enumerate(row_cells):
+            cell.font = styler.font_body
+            cell.border = styler.border_full
+            if fill_color:
+                cell.fill = fill_color
+
+            # Number formats
+            if col_idx in [3, 5, 6]:  # Qty, Used, Wasted
+                cell.number_format = "#,##0.00"
+
+        # Add to Totals (Only add Production Qty once per group)
+        # Logic: If this is the FIRST row of a new group, add to production total.
+        # Usage totals are always added.
+        if run_id != last_run_id:
+            total_made += run.quantity_produced
+
+        total_used += u.actual_amount
+        total_wasted += u.wastage
+
+        last_run_id = run_id
+        current_row += 1
+
+    # 3. Totals Row for Kitchen
+    ws_run.append(["GRAND TOTAL", "", "", total_made, "", total_used, total_wasted])
+
+    last_row = ws_run[ws_run.max_row]
+    for cell in last_row:
+        cell.font = styler.font_total
+        cell.fill = PatternFill(
+            start_color=styler.total_bg,
+            end_color=styler.total_bg,
+            fill_type="solid",
+        )
+        cell.border = Border(
+            top=styler.thick_border,
+            bottom=styler.thick_border,
+            left=styler.thin_border,
+            right=styler.thin_border,
+        )
+        if isinstance(cell.value, (int, float)):
+            cell.number_format = "#,##0.00"
+
+    # Merge the empty cells in the total row for cleaner look (optional)
+    ws_run.merge_cells(
+        start_row=ws_run.max_row,
+        start_column=1,
+        end_row=ws_run.max_row,
+        end_column=3,
+    )
+
+    styler.adjust_column_widths(ws_run)
+
+
+# Sheets with their own layout; the rest are plain tables
+SHEET_WRITERS = {
+    "overview": write_overview_sheet,
+    "kitchen": write_kitchen_sheet,
+}
+
+
+def build_workbook(slugs, period):
+    """Workbook with the given sheets (slugs of reports.sheets.SHEETS)."""
+    wb = openpyxl.Workbook()
+    wb.remove(wb.active)
+    styler = ExcelStyler()
+    for slug in slugs:
+        writer = SHEET_WRITERS.get(slug, write_table_sheet)
+        writer(wb, styler, SHEETS[slug], period)
+    return wb
@@ -0,0 +1,302 @@
+"""
+Materialized profit-and-loss figures (`PeriodFinancials`).
+
+Every closed business day gets a row with the Business Snapshot figures
+(sales, ingredient purchases, payroll, other expenses, profit) plus an
+estimated cost of the ingredients used; every month gets a row summing its
+day rows. `refresh_pending()` (the `refresh_financials` command) fills in
+the days closed since the last run and `refresh_days()` corrects existing
+rows after a late edit (see `reports.signals`). Today is never stored; it is
+computed live on read, so POS traffic costs nothing here.
+
+Days are bounded with `aware_date_range`, as elsewhere, rather than grouped
+with a database-side date cast: one query per figure covers up to
+BATCH_DAYS days (or ranges of days).
+"""
+
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db.models import Count, Min, Q, Sum
+from django.utils import timezone
+
+from core.filters import aware_date_range
+from inventory.models import Purchase
+from production.models import IngredientUsage, ProductionRun
+from sales.models import Sale
+from treasury.models import Expense
+from users.models import PayrollRecord
+
+from .artifacts import period_days
+from .models import PeriodFinancials
+
+BATCH_DAYS = 31
+
+# Bumped (see reports.signals) when a committed edit is about to be
+# refreshed into a day's rows; lets `refresh_financials` spot days edited
+# while it was computing them.
+DAY_EDITS_NAMESPACE = "financials-day:{}"
+
+FIGURES = (
+    "sales_total",
+    "sales_count",
+    "purchases",
+    "cogs_estimate",
+    "payroll",
+    "expenses",
+    "profit",
+)
+CENT = Decimal("0.01")
+
+
+def _sources():
+    """Figure -> (queryset, datetime field, aggregate for a row filter)."""
+    return {
+        "sales_total": (
+            Sale.objects.all(),
+            "created_at",
+            lambda rows: Sum("total_amount", filter=rows),
+        ),
+        "sales_count": (
+            Sale.objects.all(),
+            "created_at",
+            lambda rows: Count("id", filter=rows),
+        ),
+        "purchases": (
+            Purchase.objects.all(),
+            "purchase_date",
+            lambda rows: Sum("total_cost", filter=rows),
+        ),
+        "cogs_estimate": (
+            IngredientUsage.objects.all(),
+            "production_run__date_produced",
+            lambda rows: Sum("extended_cost", filter=rows),
+        ),
+        "payroll": (
+            PayrollRecord.objects.all(),
+            "paid_at",
+            lambda rows: Sum("amount_paid", filter=rows),
+        ),
+        "expenses": (
+            Expense.objects.filter(status=Expense.STATUS_PAID, purchase__isnull=True),
+            "created_at",
+            lambda rows: Sum("amount", filter=rows),
+        ),
+    }
+
+
+def empty_figures():
+    return {name: 0 if name == "sales_count" else Decimal("0.00") for name in FIGURES}
+
+
+def _set_profit(figures):
+    figures["profit"] = (
+        figures["sales_total"]
+        - figures["purchases"]
+        - figures["payroll"]
+        - figures["expenses"]
+    )
+    return figures
+
+
+def add_figures(total, figures):
+    for name in FIGURES:
+        total[name] += figures[name]
+    return total
+
+
+def compute_ranges(ranges):
+    """
+    Figures from the raw tables for each inclusive (start_date, end_date)
+    local range, in order. Ranges must not overlap.
+    """
+    ranges = list(ranges)
+    result = [empty_figures() for _ in ranges]
+    for offset in range(0, len(ranges), BATCH_DAYS):
+        batch = ranges[offset : offset + BATCH_DAYS]
+        start, end = aware_date_range(
+            min(first for first, _ in batch), max(last for _, last in batch)
+        )
+        for name, (queryset, field, aggregate) in _sources().items():
+            aggregates = {}
+            for index, (first, last) in enumerate(batch):
+                range_start, range_end = aware_date_range(first, last)
+                rows = Q(**{f"{field}__gte": range_start, f"{field}__lt": range_end})
+                aggregates[f"r{index}"] = aggregate(rows)
+            sums = queryset.filter(
+                **{f"{field}__gte": start, f"{field}__lt": end}
+            ).aggregate(**aggregates)
+            for index in range(len(batch)):
+                value = sums[f"r{index}"] or 0
+                result[offset + index][name] = (
+                    int(value)
+                    if name == "sales_count"
+                    else Decimal(value).quantize(CENT)
+                )
+    return [_set_profit(figures) for figures in result]
+
+
+def compute_days(days):
+    """{day: figures} for local `days`, from the raw tables."""
+    days = sorted(set(days))
+    return dict(zip(days, compute_ranges((day, day) for day in days)))
+
+
+def _runs(days):
+    """Sorted `days` grouped into inclusive (first, last) runs of consecutive days."""
+    runs = []
+    for day in sorted(days):
+        if runs and runs[-1][1] + timedelta(days=1) == day:
+            runs[-1][1] = day
+        else:
+            runs.append([day, day])
+    return [tuple(run) for run in runs]
+
+
+def _month_start(day):
+    return day.replace(day=1)
+
+
+def _next_month(day):
+    return (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def _store_days(figures_by_day):
+    PeriodFinancials.objects.bulk_create(
+        [
+            PeriodFinancials(
+                granularity=PeriodFinancials.GRANULARITY_DAY,
+                period_start=day,
+                **figures,
+            )
+            for day, figures in figures_by_day.items()
+        ],
+        update_conflicts=True,
+        unique_fields=["granularity", "period_start"],
+        update_fields=[*FIGURES, "updated_at"],
+    )
+
+
+def rollup_months(months):
+    """Rewrite the month rows of `months` (first days) from their day rows."""
+    for month in sorted(set(months)):
+        totals = PeriodFinancials.objects.filter(
+            granularity=PeriodFinancials.GRANULARITY_DAY,
+            period_start__gte=month,
+            period_start__lt=_next_month(month),
+        ).aggregate(**{name: Sum(name) for name in FIGURES})
+        PeriodFinancials.objects.update_or_create(
+            granularity=PeriodFinancials.GRANULARITY_MONTH,
+            period_start=month,
+            defaults={name: totals[name] or 0 for name in FIGURES},
+        )
+
+
+def materialize_days(days):
+    """Compute and store the rows of closed `days` and of their months."""
+    today = timezone.localdate()
+    days = [day for day in days if day < today]
+    if not days:
+        return 0
+    _store_days(compute_days(days))
+    rollup_months(_month_start(day) for day in days)
+    return len(days)
+
+
+def last_materialized_day():
+    return (
+        PeriodFinancials.objects.filter(granularity=PeriodFinancials.GRANULARITY_DAY)
+        .order_by("-period_start")
+        .values_list("period_start", flat=True)
+        .first()
+    )
+
+
+def first_activity_day():
+    """Local date of the earliest row any figure is computed from, or None."""
+    earliest = [
+        Sale.objects.aggregate(first=Min("created_at"))["first"],
+        Purchase.objects.aggregate(first=Min("purchase_date"))["first"],
+        ProductionRun.objects.aggregate(first=Min("date_produced"))["first"],
+        PayrollRecord.objects.aggregate(first=Min("paid_at"))["first"],
+        Expense.objects.aggregate(first=Min("created_at"))["first"],
+    ]
+    earliest = [value for value in earliest if value is not None]
+    return timezone.localdate(min(earliest)) if earliest else None
+
+
+def pending_days():
+    """Closed days not materialized yet, oldest first."""
+    last = last_materialized_day()
+    start = last + timedelta(days=1) if last else first_activity_day()
+    yesterday = timezone.localdate() - timedelta(days=1)
+    if start is None or start > yesterday:
+        return []
+    return list(period_days(start, yesterday))
+
+
+def refresh_pending():
+    """Materialize every day closed since the last run. Returns the count."""
+    return materialize_days(pending_days())
+
+
+def refresh_days(days):
+    """
+    Recompute the stored rows of `days` (and their months) after a late
+    edit. Days not materialized yet are left for `refresh_pending()`.
+    """
+    stored = set(
+        PeriodFinancials.objects.filter(
+            granularity=PeriodFinancials.GRANULARITY_DAY, period_start__in=set(days)
+        ).values_list("period_start", flat=True)
+    )
+    return materialize_days(stored)
+
+
+def period_figures(start_date, end_date):
+    """
+    Figures for the inclusive local date range: stored rows for closed days,
+    the raw tables for today and any closed day not materialized yet.
+    """
+    total = empty_figures()
+    stored = PeriodFinancials.objects.filter(
+        granularity=PeriodFinancials.GRANULARITY_DAY,
+        period_start__gte=start_date,
+        period_start__lte=end_date,
+    ).values("period_start", *FIGURES)
+    seen = set()
+    for row in stored:
+        seen.add(row.pop("period_start"))
+        add_figures(total, row)
+    missing = [day for day in period_days(start_date, end_date) if day not in seen]
+    for figures in compute_ranges(_runs(missing)):
+        add_figures(total, figures)
+    return total
+
+
+def trend(granularity, start_date, end_date):
+    """
+    One entry per day or month overlapping the range, oldest first, each
+    `{"period_start", "is_final", **figures}`. Closed periods come from a
+    single query; today (and the current month) add live figures.
+    """
+    today = timezone.localdate()
+    current = today
+    if granularity == PeriodFinancials.GRANULARITY_MONTH:
+        start_date = _month_start(start_date)
+        current = _month_start(today)
+
+    entries = {
+        row["period_start"]: {**row, "is_final": row["period_start"] < current}
+        for row in PeriodFinancials.objects.filter(
+            granularity=granularity,
+            period_start__gte=start_date,
+            period_start__lte=end_date,
+        ).values("period_start", *FIGURES)
+    }
+    if start_date <= today <= end_date:
+        entry = entries.setdefault(
+            current, {"period_start": current, "is_final": False, **empty_figures()}
+        )
+        add_figures(entry, compute_days([today])[today])
+    return [entries[period] for period in sorted(entries)]
@@ -0,0 +1,182 @@
+import random
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from io import BytesIO
+
+from django.core.management.base import BaseCommand, CommandError
+
+HEADERS = [
+    "Date",
+    "Time",
+    "Sale #",
+    "Receipt Issued",
+    "Cashier Name",
+    "Items Sold",
+    "Total Bill",
+    "Amount Paid",
+    "Change",
+    "Payments",
+]
+SUM_COLUMNS = [6, 7, 8]
+
+
+def synthetic_rows(count, seed=0):
+    """Rows shaped like the Sales List sheet."""
+    rng = random.Random(seed)
+    start = date(2026, 1, 1)
+    for i in range(count):
+        total = round(rng.uniform(20, 900), 2)
+        paid = total + rng.choice((0, 0, 5, 50))
+        yield [
+            start + timedelta(days=i % 365),
+            f"{rng.randrange(6, 22):02d}:{rng.randrange(60):02d}",
+            str(i + 1),
+            rng.choice(("Yes", "No")),
+            f"Cashier {rng.randrange(8)}",
+            f"Bread ({rng.randrange(1, 9)}), Cake ({rng.randrange(1, 4)})",
+            total,
+            paid,
+            paid - total,
+            f"Cash: ETB {paid:.2f}",
+        ]
+
+
+def cell_by_cell_table(styler, ws, headers, data, sum_columns):
+    """
+    The per-cell styling `ExcelStyler.create_table` used before named styles,
+    kept as the benchmark's reference point.
+    """
+    from openpyxl.styles import Border, PatternFill
+
+    ws.append([])
+    ws.append(headers)
+    for cell in ws[4]:
+        cell.fill = PatternFill(
+            start_color=styler.header_bg, end_color=styler.header_bg, fill_type="solid"
+        )
+        cell.font = styler.font_header
+        cell.alignment = styler.align_center
+        cell.border = styler.border_full
+
+    totals = {col_idx: 0.0 for col_idx in sum_columns}
+    for i, row_data in enumerate(data):
+        ws.append(row_data)
+        fill = (
+            PatternFill(
+                start_color=styler.zebra_stripe,
+                end_color=styler.zebra_stripe,
+                fill_type="solid",
+            )
+            if i % 2 == 0
+            else None
+        )
+        for col_idx, cell in enumerate(ws[ws.max_row]):
+            cell.font = styler.font_body
+            cell.border = styler.border_full
+            if fill:
+                cell.fill = fill
+            if isinstance(cell.value, bool):
+                pass
+            elif isinstance(cell.value, int):
+                cell.number_format = "#,##0"
+            elif isinstance(cell.value, (float, Decimal)):
+                cell.number_format = "#,##0.00"
+            if col_idx in sum_columns and isinstance(cell.value, (int, float, Decimal)):
+                totals[col_idx] += float(cell.value)
+
+    total_row = [""] * len(headers)
+    total_row[0] = "GRAND TOTAL"
+    for col_idx, value in totals.items():
+        total_row[col_idx] = value
+    ws.append(total_row)
+    for cell in ws[ws.max_row]:
+        cell.font = styler.font_total
+        cell.fill = PatternFill(
+            start_color=styler.total_bg, end_color=styler.total_bg, fill_type="solid"
+        )
+        cell.border = Border(
+            top=styler.thick_border,
+            bottom=styler.thick_border,
+            left=styler.thin_border,
+            right=styler.thin_border,
+        )
+        if isinstance(cell.value, float):
+            cell.number_format = "#,##0.00"
+
+    styler.adjust_column_widths(ws)
+
+
+class Command(BaseCommand):
+    help = (
+        "Time ExcelStyler.create_table on a synthetic Sales List sheet against "
+        "the cell-by-cell styling it replaced. Reports CPU seconds for styling "
+        "and, with --save, for serializing the workbook."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows", type=int, default=10_000, help="Table rows (default: 10000)."
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=1,
+            help="Runs per writer; the best is reported (default: 1).",
+        )
+        parser.add_argument(
+            "--save", action="store_true", help="Also time saving the workbook."
+        )
+
+    def handle(self, *args, **options):
+        import openpyxl
+
+        from reports.excel import ExcelStyler
+
+        if options["rows"] < 1 or options["repeat"] < 1:
+            raise CommandError("--rows and --repeat must be at least 1.")
+
+        rows = list(synthetic_rows(options["rows"]))
+
+        def named_styles(styler, ws):
+            styler.create_table(ws, HEADERS, rows, sum_columns=SUM_COLUMNS)
+
+        def cell_by_cell(styler, ws):
+            cell_by_cell_table(styler, ws, HEADERS, rows, SUM_COLUMNS)
+
+        results = {}
+        for label, writer in (
+            ("cell-by-cell", cell_by_cell),
+            ("named styles", named_styles),
+        ):
+            best_write = best_save = None
+            for _ in range(options["repeat"]):
+                wb = openpyxl.Workbook()
+                styler = ExcelStyler()
+                ws = wb.active
+                styler.add_sheet_header(ws, "Benchmark", "Synthetic rows", 10)
+
+                start = time.process_time()
+                writer(styler, ws)
+                elapsed = time.process_time() - start
+                best_write = elapsed if best_write is None else min(best_write, elapsed)
+
+                if options["save"]:
+                    start = time.process_time()
+                    wb.save(BytesIO())
+                    elapsed = time.process_time() - start
+                    best_save = (
+                        elapsed if best_save is None else min(best_save, elapsed)
+                    )
+            results[label] = best_write
+
+            line = (
+                f"{label:>13}: {best_write:7.2f} s CPU "
+                f"({options['rows'] / best_write:,.0f} rows/s)"
+            )
+            if best_save is not None:
+                line += f", save {best_save:.2f} s"
+            self.stdout.write(line)
+
+        speedup = results["cell-by-cell"] / results["named styles"]
+        self.stdout.write(self.style.SUCCESS(f"named styles: {speedup:.1f}x faster"))
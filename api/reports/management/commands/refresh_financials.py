@@ -0,0 +1,74 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from core.caching import namespace_versions
+from reports.artifacts import period_days
+from reports.financials import (
+    DAY_EDITS_NAMESPACE,
+    materialize_days,
+    pending_days,
+    refresh_days,
+)
+from reports.models import PeriodFinancials
+
+
+class Command(BaseCommand):
+    help = (
+        "Materialize the day and month P&L rows (PeriodFinancials) of every "
+        "business day closed since the last run. Schedule it shortly after "
+        "midnight; late edits to older days are corrected by signals."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--since",
+            help="Recompute every closed day from this date (YYYY-MM-DD) on.",
+        )
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Drop all rows and rebuild from the first recorded activity.",
+        )
+
+    def handle(self, *args, **options):
+        since = None
+        if options["since"]:
+            since = parse_date(options["since"])
+            if since is None:
+                raise CommandError("--since must be a date (YYYY-MM-DD).")
+
+        with transaction.atomic():
+            if options["full"]:
+                PeriodFinancials.objects.all().delete()
+            if since is not None and not options["full"]:
+                yesterday = timezone.localdate() - timedelta(days=1)
+                days = list(period_days(since, yesterday))
+            else:
+                days = pending_days()
+            namespaces = [DAY_EDITS_NAMESPACE.format(day) for day in days]
+            before = namespace_versions(namespaces)
+            count = materialize_days(days)
+
+        # An edit committed while this ran found those days' rows not stored
+        # yet (uncommitted), so its own refresh skipped them; redo them.
+        after = namespace_versions(namespaces)
+        edited = [
+            day
+            for day, namespace in zip(days, namespaces)
+            if after[namespace] != before[namespace]
+        ]
+        if edited:
+            refresh_days(edited)
+
+        if count:
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Materialized {count} day(s): {days[0]} to {days[-1]}."
+                )
+            )
+        else:
+            self.stdout.write("Nothing to materialize.")
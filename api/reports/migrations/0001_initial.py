@@ -0,0 +1,23 @@
+# Generated by Django 6.0 on 2026-10-19 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="DashboardSnapshot",
+            fields=[
+                ("date", models.DateField(primary_key=True, serialize=False)),
+                ("payload", models.JSONField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "ordering": ["-date"],
+            },
+        ),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 6.0 on 2026-10-19 11:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("reports", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PeriodFinancials",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "granularity",
+                    models.CharField(
+                        choices=[("day", "Day"), ("month", "Month")], max_length=5
+                    ),
+                ),
+                ("period_start", models.DateField()),
+                (
+                    "sales_total",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=14),
+                ),
+                ("sales_count", models.PositiveIntegerField(default=0)),
+                (
+                    "purchases",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=14),
+                ),
+                (
+                    "cogs_estimate",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=14),
+                ),
+                (
+                    "payroll",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=14),
+                ),
+                (
+                    "expenses",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=14),
+                ),
+                (
+                    "profit",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=14),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name_plural": "Period financials",
+                "ordering": ["granularity", "period_start"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("granularity", "period_start"),
+                        name="unique_period_financials",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,63 @@
+from django.db import models
+
+
+class DashboardSnapshot(models.Model):
+    """
+    Frozen DashboardStatsView payload for a closed business day.
+    Deleted by `reports.signals` when that day's sales or production change.
+    """
+
+    date = models.DateField(primary_key=True)
+    payload = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-date"]
+
+    def __str__(self):
+        return f"Dashboard snapshot - {self.date}"
+
+
+class PeriodFinancials(models.Model):
+    """
+    Materialized profit-and-loss figures for one closed day, or for the
+    closed days of one month. Built by `reports.financials`; kept current
+    by the `refresh_financials` command and by `reports.signals` on late
+    edits.
+    """
+
+    GRANULARITY_DAY = "day"
+    GRANULARITY_MONTH = "month"
+    GRANULARITY_CHOICES = (
+        (GRANULARITY_DAY, "Day"),
+        (GRANULARITY_MONTH, "Month"),
+    )
+
+    granularity = models.CharField(max_length=5, choices=GRANULARITY_CHOICES)
+    # The day itself, or the first day of the month
+    period_start = models.DateField()
+    sales_total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    sales_count = models.PositiveIntegerField(default=0)
+    # Ingredients bought (cash out), as on the Business Snapshot sheet
+    purchases = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    # Ingredients used in production, at the cost recorded with each usage
+    cogs_estimate = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    payroll = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    # Paid expenses not tied to a purchase
+    expenses = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    # sales - purchases - payroll - expenses, as on the Business Snapshot
+    profit = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["granularity", "period_start"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["granularity", "period_start"],
+                name="unique_period_financials",
+            )
+        ]
+        verbose_name_plural = "Period financials"
+
+    def __str__(self):
+        return f"Financials ({self.granularity}) - {self.period_start}"
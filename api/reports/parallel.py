@@ -0,0 +1,296 @@
+"""
+Multi-process workbook builds.
+
+With EXPORT_WORKERS > 0, each sheet is queried and styled in its own worker
+process (own DB connection, capped address space). A worker returns its
+sheet as a one-sheet xlsx; the parent then splices those sheets into one
+package. openpyxl writes strings inline, so the only shared part to merge is
+the style table: every worker's fonts, fills, borders, number formats and
+cell formats are deduplicated into one styles.xml and each sheet's `s="N"`
+references are renumbered to match.
+"""
+
+import io
+import logging
+import os
+import re
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import nullcontext
+from xml.etree import ElementTree
+
+from django.conf import settings
+
+MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+ElementTree.register_namespace("", MAIN_NS)
+
+# Built-in number formats go up to 163; custom ones are numbered from 164.
+FIRST_CUSTOM_NUMFMT = 164
+
+_pool = None
+_pool_lock = threading.Lock()
+
+logger = logging.getLogger(__name__)
+
+
+def _q(tag):
+    return f"{{{MAIN_NS}}}{tag}"
+
+
+# ==========================================
+# Worker side
+# ==========================================
+
+
+def _init_worker(settings_module, memory_mb):
+    capped = False
+    if memory_mb:
+        try:
+            import resource
+        except ImportError:  # Windows
+            pass
+        else:
+            limit = memory_mb * 1024 * 1024
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+            capped = True
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", settings_module)
+    import django
+
+    django.setup()
+    if memory_mb and not capped:
+        # Logged after setup so it goes through the configured handlers.
+        logger.warning(
+            "EXPORT_WORKER_MEMORY_MB is set but this platform has no "
+            "`resource` module; export worker %s runs without a memory cap.",
+            os.getpid(),
+        )
+
+
+def _build_sheet_part(slug, start_date, end_date, use_replica):
+    """One sheet as a standalone xlsx (bytes)."""
+    from django.db import connections
+
+    from core.db_routers import read_from_replica
+
+    from .excel import build_workbook
+    from .sheets import ReportPeriod
+
+    scope = read_from_replica() if use_replica else nullcontext()
+    try:
+        with scope:
+            workbook = build_workbook([slug], ReportPeriod(start_date, end_date))
+    finally:
+        connections.close_all()
+
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+
+# ==========================================
+# Parent side
+# ==========================================
+
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            import multiprocessing
+
+            # spawn: a forked copy of a threaded web worker can inherit held
+            # locks and open database sockets.
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.EXPORT_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(
+                    os.environ.get("DJANGO_SETTINGS_MODULE", "config.settings"),
+                    settings.EXPORT_WORKER_MEMORY_MB,
+                ),
+            )
+        return _pool
+
+
+def _discard_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def build_sheet_parts(slugs, period, use_replica=False):
+    """One-sheet xlsx packages for `slugs`, built in worker processes."""
+    pool = _get_pool()
+    futures = [
+        pool.submit(
+            _build_sheet_part, slug, period.start_date, period.end_date, use_replica
+        )
+        for slug in slugs
+    ]
+    try:
+        return [future.result() for future in futures]
+    except BrokenProcessPool:
+        # A worker died (e.g. killed for memory); start afresh next time.
+        _discard_pool()
+        raise
+
+
+class _StyleMerger:
+    """Deduplicating union of several styles.xml parts."""
+
+    def __init__(self):
+        self.lists = {
+            "fonts": [],
+            "fills": [],
+            "borders": [],
+            "cellStyleXfs": [],
+            "cellXfs": [],
+        }
+        self.seen = {name: {} for name in self.lists}
+        self.numfmts = {}  # format code -> id
+        self.cell_styles = {}  # name -> <cellStyle>
+        self.template = None
+
+    def _add(self, name, element):
+        key = ElementTree.tostring(element)
+        index = self.seen[name].get(key)
+        if index is None:
+            index = self.seen[name][key] = len(self.lists[name])
+            self.lists[name].append(element)
+        return index
+
+    def _numfmt_id(self, code):
+        if code not in self.numfmts:
+            self.numfmts[code] = FIRST_CUSTOM_NUMFMT + len(self.numfmts)
+        return self.numfmts[code]
+
+    def _remap_xf(self, xf, maps, xf_ids=None):
+        xf = ElementTree.fromstring(ElementTree.tostring(xf))
+        for attr, name in (
+            ("fontId", "fonts"),
+            ("fillId", "fills"),
+            ("borderId", "borders"),
+        ):
+            if attr in xf.attrib:
+                xf.set(attr, str(maps[name][int(xf.get(attr))]))
+        numfmt = int(xf.get("numFmtId", 0))
+        if numfmt >= FIRST_CUSTOM_NUMFMT:
+            xf.set("numFmtId", str(maps["numFmts"][numfmt]))
+        if xf_ids is not None and "xfId" in xf.attrib:
+            xf.set("xfId", str(xf_ids[int(xf.get("xfId"))]))
+        return xf
+
+    def add(self, styles_xml):
+        """Merge one styles.xml; returns its cellXfs index -> merged index."""
+        root = ElementTree.fromstring(styles_xml)
+        if self.template is None:
+            self.template = root
+
+        maps = {"numFmts": {}}
+        numfmts = root.find(_q("numFmts"))
+        for numfmt in numfmts if numfmts is not None else ():
+            maps["numFmts"][int(numfmt.get("numFmtId"))] = self._numfmt_id(
+                numfmt.get("formatCode")
+            )
+        for name in ("fonts", "fills", "borders"):
+            maps[name] = [self._add(name, el) for el in root.find(_q(name))]
+
+        style_xfs = [
+            self._add("cellStyleXfs", self._remap_xf(xf, maps))
+            for xf in root.find(_q("cellStyleXfs"))
+        ]
+        cell_styles = root.find(_q("cellStyles"))
+        for cell_style in cell_styles if cell_styles is not None else ():
+            if cell_style.get("name") not in self.cell_styles:
+                cell_style.set("xfId", str(style_xfs[int(cell_style.get("xfId"))]))
+                self.cell_styles[cell_style.get("name")] = cell_style
+
+        return [
+            self._add("cellXfs", self._remap_xf(xf, maps, style_xfs))
+            for xf in root.find(_q("cellXfs"))
+        ]
+
+    def tostring(self):
+        root = self.template
+        numfmts = root.find(_q("numFmts"))
+        if numfmts is None:
+            numfmts = ElementTree.Element(_q("numFmts"))
+            root.insert(0, numfmts)
+        numfmts.clear()
+        for code, numfmt_id in self.numfmts.items():
+            ElementTree.SubElement(
+                numfmts, _q("numFmt"), numFmtId=str(numfmt_id), formatCode=code
+            )
+        numfmts.set("count", str(len(self.numfmts)))
+
+        for name, elements in self.lists.items():
+            container = root.find(_q(name))
+            container.clear()
+            container.extend(elements)
+            container.set("count", str(len(elements)))
+
+        cell_styles = root.find(_q("cellStyles"))
+        if cell_styles is not None:
+            cell_styles.clear()
+            cell_styles.extend(self.cell_styles.values())
+            cell_styles.set("count", str(len(self.cell_styles)))
+        return ElementTree.tostring(root, xml_declaration=False)
+
+
+# s="N" on cells and rows, style="N" on columns
+_STYLE_REF = re.compile(
+    rb'(<(?:c|row)\b[^>]*?\ss=")(\d+)(")|(<col\b[^>]*?\sstyle=")(\d+)(")'
+)
+
+
+def _renumber_styles(sheet_xml, xf_map):
+    def replace(match):
+        if match.group(1):
+            prefix, index, suffix = match.group(1, 2, 3)
+        else:
+            prefix, index, suffix = match.group(4, 5, 6)
+        return prefix + str(xf_map[int(index)]).encode() + suffix
+
+    return _STYLE_REF.sub(replace, sheet_xml)
+
+
+def merge_sheet_parts(names, parts, fileobj):
+    """
+    Write one xlsx to `fileobj` holding the single sheet of each part, named
+    `names`, in order.
+    """
+    import openpyxl
+
+    # openpyxl writes the package skeleton (workbook, rels, content types).
+    skeleton = openpyxl.Workbook()
+    skeleton.active.title = names[0]
+    for name in names[1:]:
+        skeleton.create_sheet(name)
+    skeleton_buffer = io.BytesIO()
+    skeleton.save(skeleton_buffer)
+
+    merger = _StyleMerger()
+    sheets = {}
+    for index, part in enumerate(parts, start=1):
+        with zipfile.ZipFile(io.BytesIO(part)) as package:
+            xf_map = merger.add(package.read("xl/styles.xml"))
+            sheet_xml = package.read("xl/worksheets/sheet1.xml")
+        sheets[f"xl/worksheets/sheet{index}.xml"] = _renumber_styles(sheet_xml, xf_map)
+
+    with (
+        zipfile.ZipFile(skeleton_buffer) as source,
+        zipfile.ZipFile(fileobj, "w", zipfile.ZIP_DEFLATED) as target,
+    ):
+        for item in source.infolist():
+            if item.filename in sheets:
+                data = sheets[item.filename]
+            elif item.filename == "xl/styles.xml":
+                data = merger.tostring()
+            else:
+                data = source.read(item.filename)
+            target.writestr(item, data)
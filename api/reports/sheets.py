@@ -0,0 +1,777 @@
+"""
+Rows for each sheet of the Excel report.
+
+Every sheet is a generator of plain rows over a `ReportPeriod`, so the
+workbook, the per-sheet JSON endpoint and the CSV download share one source
+and only the requested sheets ever hit the database. Layout (titles, totals,
+merged cells) lives in reports.excel.
+"""
+
+from decimal import Decimal
+
+from django.db.models import Count, Q, Sum
+
+from core.filters import aware_date_range
+from inventory.models import Purchase
+from production.models import IngredientUsage, Product, ProductionRun
+from sales.models import Sale, SaleItem
+from treasury.models import BankAccount, BankTransaction, Expense
+from users.models import (
+    AttendanceRecord,
+    Employee,
+    LeaveRecord,
+    PayrollRecord,
+    ShiftAssignment,
+)
+
+from .financials import period_figures
+
+
+class ReportPeriod:
+    """Inclusive local dates plus the aware [start, end) range they cover."""
+
+    def __init__(self, start_date, end_date):
+        self.start_date = start_date
+        self.end_date = end_date
+        self.start, self.end = aware_date_range(start_date, end_date)
+
+
+class ReportSheet:
+    def __init__(self, name, title, subtitle, headers, rows, sum_columns=None):
+        self.name = name
+        self.title = title
+        # May use {start_date} and {end_date}
+        self.subtitle = subtitle
+        self.headers = headers
+        self.rows = rows
+        self.sum_columns = sum_columns or []
+
+    def get_subtitle(self, period):
+        return self.subtitle.format(
+            start_date=period.start_date, end_date=period.end_date
+        )
+
+
+def _person_name(user):
+    if not user:
+        return ""
+    return getattr(user, "full_name", None) or getattr(user, "username", None) or ""
+
+
+def _leave_days_in_period(leave, period):
+    overlap_start = max(leave.start_date, period.start_date)
+    overlap_end = min(leave.end_date, period.end_date)
+    return (overlap_end - overlap_start).days + 1
+
+
+# ==========================================
+# SHEET 1: OVERVIEW
+# ==========================================
+
+
+def overview_rows(period):
+    # Closed days come from the materialized P&L rows (reports.financials).
+    figures = period_figures(period.start_date, period.end_date)
+    total_money_in = figures["sales_total"]
+    count_sales = figures["sales_count"]
+    avg_spend = total_money_in / count_sales if count_sales > 0 else 0
+
+    yield ["Total Sales Amount", float(total_money_in)]
+    yield ["Number of Sales Made", count_sales]
+    yield ["Avg. Amount per Customer", float(avg_spend)]
+    yield ["Cost of Ingredients Bought", float(figures["purchases"])]
+    yield ["Payroll Paid (HR)", float(figures["payroll"])]
+    yield ["Other Expenses Paid (Treasury)", float(figures["expenses"])]
+    yield ["Estimated Profit", float(figures["profit"])]
+
+
+# ==========================================
+# SHEET 2: SALES LIST
+# ==========================================
+
+
+def sales_list_rows(period):
+    sales_qs = (
+        Sale.objects.filter(created_at__gte=period.start, created_at__lt=period.end)
+        .select_related("cashier")
+        .prefetch_related("items__product", "payments__method")
+        .order_by("-created_at")
+    )
+
+    for s in sales_qs:
+        items = ", ".join([f"{i.product.name} ({i.quantity})" for i in s.items.all()])
+        cashier_name = (
+            s.cashier.full_name
+            if s.cashier and s.cashier.full_name
+            else (s.cashier.username if s.cashier else "Unknown")
+        )
+        amount_paid = sum((p.amount for p in s.payments.all()), Decimal("0"))
+        change = max(Decimal("0"), amount_paid - s.total_amount)
+        payments_str = ", ".join(
+            [f"{p.method.name}: ETB {float(p.amount):.2f}" for p in s.payments.all()]
+        )
+
+        yield [
+            s.created_at.date(),
+            s.created_at.time().strftime("%H:%M"),
+            str(s.id),
+            "Yes" if s.receipt_issued else "No",
+            cashier_name,
+            items,
+            float(s.total_amount),
+            float(amount_paid),
+            float(change),
+            payments_str,
+        ]
+
+
+# ==========================================
+# SHEET 3: BEST SELLERS
+# ==========================================
+
+
+def best_sellers_rows(period):
+    data = []
+    for p in Product.objects.filter(is_active=True):
+        sold_agg = SaleItem.objects.filter(
+            sale__created_at__gte=period.start,
+            sale__created_at__lt=period.end,
+            product=p,
+        ).aggregate(q=Sum("quantity"), r=Sum("subtotal"))
+
+        prod_agg = ProductionRun.objects.filter(
+            date_produced__gte=period.start, date_produced__lt=period.end, product=p
+        ).aggregate(q=Sum("quantity_produced"))
+
+        qty_sold = sold_agg["q"] or 0
+        money_earned = float(sold_agg["r"] or 0)
+        qty_made = prod_agg["q"] or 0
+
+        if qty_sold > 0 or qty_made > 0:
+            data.append([p.name, qty_sold, money_earned, qty_made, p.stock_quantity])
+
+    data.sort(key=lambda x: x[2], reverse=True)
+    yield from data
+
+
+# ==========================================
+# SHEET 4: KITCHEN ACTIVITY
+# ==========================================
+
+
+def kitchen_activity_usages(period):
+    """Ingredient usages, grouped by run (the workbook merges each run)."""
+    return (
+        IngredientUsage.objects.filter(
+            production_run__date_produced__gte=period.start,
+            production_run__date_produced__lt=period.end,
+        )
+        .select_related("production_run", "ingredient")
+        .order_by("-production_run__date_produced")
+    )
+
+
+def kitchen_activity_row(usage):
+    run = usage.production_run
+    item_name = (
+        run.product.name
+        if run.product
+        else (run.composite_ingredient.name if run.composite_ingredient else "Mix/Prep")
+    )
+    chef_name = (
+        run.chef.full_name
+        if run.chef and run.chef.full_name
+        else (run.chef.username if run.chef else "Unknown")
+    )
+
+    return [
+        # Format: YYYY-MM-DD HH:MM
+        run.date_produced.strftime("%Y-%m-%d %H:%M"),
+        chef_name,
+        item_name,
+        float(run.quantity_produced),
+        usage.ingredient.name,
+        float(usage.actual_amount),
+        float(usage.wastage),
+    ]
+
+
+def kitchen_activity_rows(period):
+    for usage in kitchen_activity_usages(period):
+        yield kitchen_activity_row(usage)
+
+
+# ==========================================
+# SHEET 5: TEAM STATS
+# ==========================================
+
+
+def team_stats_rows(period):
+    c_stats = (
+        Sale.objects.filter(created_at__gte=period.start, created_at__lt=period.end)
+        .values("cashier__full_name", "cashier__username")
+        .annotate(total=Sum("total_amount"), count=Count("id"))
+        .order_by("-total")
+    )
+
+    for c in c_stats:
+        name = c["cashier__full_name"] or c["cashier__username"] or "Unknown"
+        tot = float(c["total"])
+        cnt = c["count"]
+        avg = tot / cnt if cnt else 0
+        yield [name, tot, cnt, avg]
+
+
+# ==========================================
+# SHEET 6: HR SNAPSHOT
+# ==========================================
+
+
+def hr_snapshot_rows(period):
+    start_date, end_date = period.start_date, period.end_date
+
+    employees_count = Employee.objects.count()
+    total_monthly_salary = (
+        Employee.objects.aggregate(Sum("monthly_base_salary"))[
+            "monthly_base_salary__sum"
+        ]
+        or 0
+    )
+
+    scheduled_shifts = ShiftAssignment.objects.filter(
+        shift_date__range=[start_date, end_date]
+    ).count()
+
+    attendance_qs = AttendanceRecord.objects.filter(
+        assignment__shift_date__range=[start_date, end_date]
+    )
+    attendance_count = attendance_qs.count()
+    attendance_by_status = {
+        item["status"]: item["count"]
+        for item in attendance_qs.values("status").annotate(count=Count("id"))
+    }
+    total_late_minutes = (
+        attendance_qs.aggregate(Sum("late_minutes"))["late_minutes__sum"] or 0
+    )
+    total_overtime_minutes = (
+        attendance_qs.aggregate(Sum("overtime_minutes"))["overtime_minutes__sum"] or 0
+    )
+
+    leaves_qs = LeaveRecord.objects.filter(
+        Q(start_date__lte=end_date) & Q(end_date__gte=start_date)
+    ).select_related("employee")
+    leave_count = leaves_qs.count()
+    leave_days_in_period = sum(
+        _leave_days_in_period(leave, period) for leave in leaves_qs
+    )
+
+    payroll_period_qs = PayrollRecord.objects.filter(
+        Q(period_start__lte=end_date) & Q(period_end__gte=start_date)
+    )
+    payroll_period_count = payroll_period_qs.count()
+    payroll_paid_count = payroll_period_qs.filter(
+        status=PayrollRecord.STATUS_PAID
+    ).count()
+    payroll_unpaid_count = payroll_period_qs.filter(
+        status=PayrollRecord.STATUS_UNPAID
+    ).count()
+
+    payroll_paid_in_period = (
+        PayrollRecord.objects.filter(
+            paid_at__gte=period.start, paid_at__lt=period.end
+        ).aggregate(Sum("amount_paid"))["amount_paid__sum"]
+        or 0
+    )
+
+    yield ["Employees", employees_count]
+    yield ["Total Monthly Base Salary", float(total_monthly_salary)]
+    yield ["Shifts Scheduled", scheduled_shifts]
+    yield ["Attendance Records", attendance_count]
+    yield ["Present", attendance_by_status.get(AttendanceRecord.STATUS_PRESENT, 0)]
+    yield ["Late", attendance_by_status.get(AttendanceRecord.STATUS_LATE, 0)]
+    yield ["Absent", attendance_by_status.get(AttendanceRecord.STATUS_ABSENT, 0)]
+    yield ["Overtime", attendance_by_status.get(AttendanceRecord.STATUS_OVERTIME, 0)]
+    yield ["Total Late Minutes", total_late_minutes]
+    yield ["Total Overtime Minutes", total_overtime_minutes]
+    yield ["Leave Records", leave_count]
+    yield ["Leave Days (in period)", leave_days_in_period]
+    yield ["Payroll Records (overlapping)", payroll_period_count]
+    yield ["Payroll Paid Records", payroll_paid_count]
+    yield ["Payroll Unpaid Records", payroll_unpaid_count]
+    yield ["Payroll Paid (in period)", float(payroll_paid_in_period)]
+
+
+# ==========================================
+# SHEET 7: EMPLOYEES
+# ==========================================
+
+
+def employees_rows(period):
+    for e in Employee.objects.select_related("user").order_by("full_name"):
+        yield [
+            e.id,
+            e.full_name,
+            e.position,
+            e.phone_number or "",
+            e.hire_date,
+            float(e.monthly_base_salary),
+            e.payment_detail or "",
+            e.user.username if e.user else "",
+            e.user.role if e.user else "",
+        ]
+
+
+# ==========================================
+# SHEET 8: ATTENDANCE (Shift Attendance)
+# ==========================================
+
+
+def attendance_rows(period):
+    assignments = (
+        ShiftAssignment.objects.filter(
+            shift_date__range=[period.start_date, period.end_date]
+        )
+        .select_related("employee", "shift", "attendance__recorded_by")
+        .order_by("shift_date", "shift__start_time", "employee__full_name")
+    )
+
+    for a in assignments:
+        att = getattr(a, "attendance", None)
+        recorded_by = ""
+        if att and att.recorded_by:
+            recorded_by = att.recorded_by.full_name or att.recorded_by.username
+
+        yield [
+            a.shift_date,
+            a.employee.full_name,
+            a.shift.name,
+            a.shift.start_time.strftime("%H:%M"),
+            a.shift.end_time.strftime("%H:%M"),
+            att.get_status_display() if att else "Not recorded",
+            att.late_minutes if att else 0,
+            att.overtime_minutes if att else 0,
+            recorded_by,
+            att.notes if att and att.notes else "",
+        ]
+
+
+# ==========================================
+# SHEET 9: LEAVES
+# ==========================================
+
+
+def leaves_rows(period):
+    leaves = (
+        LeaveRecord.objects.filter(
+            Q(start_date__lte=period.end_date) & Q(end_date__gte=period.start_date)
+        )
+        .select_related("employee")
+        .order_by("start_date", "employee__full_name")
+    )
+
+    for leave in leaves:
+        yield [
+            leave.employee.full_name,
+            leave.get_leave_type_display(),
+            leave.start_date,
+            leave.end_date,
+            leave.day_count,
+            _leave_days_in_period(leave, period),
+            leave.notes or "",
+        ]
+
+
+# ==========================================
+# SHEET 10: PAYROLL
+# ==========================================
+
+
+def payroll_rows(period):
+    payrolls = (
+        PayrollRecord.objects.filter(
+            Q(period_start__lte=period.end_date) & Q(period_end__gte=period.start_date)
+        )
+        .select_related("employee")
+        .order_by("period_start", "employee__full_name")
+    )
+
+    for p in payrolls:
+        outstanding = (p.base_salary or 0) - (p.amount_paid or 0)
+        yield [
+            p.employee.full_name,
+            p.period_start,
+            p.period_end,
+            float(p.base_salary),
+            float(p.amount_paid),
+            float(outstanding),
+            p.get_status_display(),
+            p.paid_at.strftime("%Y-%m-%d %H:%M") if p.paid_at else "",
+            "Yes" if p.receipt else "No",
+            p.notes or "",
+        ]
+
+
+# ==========================================
+# SHEET 11: PURCHASES
+# ==========================================
+
+
+def purchases_rows(period):
+    purchases = (
+        Purchase.objects.filter(
+            purchase_date__gte=period.start, purchase_date__lt=period.end
+        )
+        .select_related("ingredient", "purchaser", "expense", "expense__account")
+        .order_by("-purchase_date")
+    )
+
+    for p in purchases:
+        bank_account_name = (
+            p.expense.account.name if p.expense and p.expense.account else ""
+        )
+        yield [
+            p.purchase_date.date(),
+            p.purchase_date.time().strftime("%H:%M"),
+            p.id,
+            p.ingredient.name,
+            float(p.quantity),
+            p.ingredient.unit,
+            float(p.total_cost),
+            float(p.unit_cost),
+            p.vendor or "",
+            _person_name(p.purchaser),
+            bank_account_name,
+            p.expense_id or "",
+            p.notes or "",
+        ]
+
+
+# ==========================================
+# SHEET 12: BANK ACCOUNTS
+# ==========================================
+
+
+def bank_accounts_rows(period):
+    accounts_qs = (
+        BankAccount.objects.all()
+        .prefetch_related("linked_payment_methods")
+        .order_by("name")
+    )
+    for a in accounts_qs:
+        linked_methods = ", ".join(
+            list(a.linked_payment_methods.values_list("name", flat=True))
+        )
+        yield [
+            a.name,
+            a.bank_name,
+            a.account_number,
+            a.account_holder,
+            float(a.balance),
+            "Yes" if a.is_active else "No",
+            linked_methods,
+            a.updated_at.date(),
+        ]
+
+
+# ==========================================
+# SHEET 13: BANK TRANSACTIONS
+# ==========================================
+
+
+def bank_transactions_rows(period):
+    bank_txns = (
+        BankTransaction.objects.filter(
+            created_at__gte=period.start, created_at__lt=period.end
+        )
+        .select_related("account", "recorded_by")
+        .order_by("-created_at")
+    )
+
+    for t in bank_txns:
+        yield [
+            t.created_at.date(),
+            t.created_at.time().strftime("%H:%M"),
+            t.id,
+            t.account.name,
+            t.get_transaction_type_display(),
+            float(t.amount),
+            _person_name(t.recorded_by),
+            t.notes or "",
+        ]
+
+
+# ==========================================
+# SHEET 14: EXPENSES
+# ==========================================
+
+
+def expenses_rows(period):
+    expenses = (
+        Expense.objects.filter(created_at__gte=period.start, created_at__lt=period.end)
+        .select_related("account", "recorded_by")
+        .prefetch_related("purchase")
+        .order_by("-created_at")
+    )
+
+    for e in expenses:
+        try:
+            purchase = e.purchase
+        except Exception:
+            purchase = None
+
+        yield [
+            e.created_at.date(),
+            e.created_at.time().strftime("%H:%M"),
+            e.id,
+            e.title,
+            e.get_status_display(),
+            float(e.amount),
+            e.account.name if e.account else "",
+            _person_name(e.recorded_by),
+            "Inventory purchase" if purchase else "Manual",
+            e.notes or "",
+        ]
+
+
+# Slug (for ?sheets= and the per-sheet endpoints) -> sheet, in workbook order
+SHEETS = {
+    "overview": ReportSheet(
+        "Business Snapshot",
+        "Business Snapshot",
+        "Report from {start_date} to {end_date}",
+        ["Metric", "Value"],
+        overview_rows,
+    ),
+    "sales": ReportSheet(
+        "Sales List",
+        "Detailed Sales List",
+        "List of sales made in the selected period",
+        [
+            "Date",
+            "Time",
+            "Sale #",
+            "Receipt Issued",
+            "Cashier Name",
+            "Items Sold",
+            "Total Bill",
+            "Amount Paid",
+            "Change",
+            "Payments",
+        ],
+        sales_list_rows,
+        sum_columns=[6, 7, 8],
+    ),
+    "best-sellers": ReportSheet(
+        "Best Sellers",
+        "Product Performance",
+        "Which items are making the most money?",
+        [
+            "Item Name",
+            "Count Sold",
+            "Money Earned",
+            "Count Made in Kitchen",
+            "Current Stock",
+        ],
+        best_sellers_rows,
+        sum_columns=[1, 2, 3],
+    ),
+    "kitchen": ReportSheet(
+        "Kitchen Activity",
+        "Production & Waste",
+        "What the kitchen made and what was wasted",
+        [
+            "Date & Time",
+            "Chef Name",
+            "Item Made",
+            "Qty Made",
+            "Ingredient Used",
+            "Amount Used",
+            "Amount Wasted",
+        ],
+        kitchen_activity_rows,
+    ),
+    "team": ReportSheet(
+        "Team Stats",
+        "Staff Performance",
+        "Who is selling the most?",
+        [
+            "Staff Name",
+            "Total Money Collected",
+            "Customers Served",
+            "Avg Sale Amount",
+        ],
+        team_stats_rows,
+        sum_columns=[1, 2],
+    ),
+    "hr": ReportSheet(
+        "HR Snapshot",
+        "HR Snapshot",
+        "Staffing and payroll from {start_date} to {end_date}",
+        ["Metric", "Value"],
+        hr_snapshot_rows,
+    ),
+    "employees": ReportSheet(
+        "Employees",
+        "Employees",
+        "Employee directory",
+        [
+            "Employee ID",
+            "Full Name",
+            "Position",
+            "Phone",
+            "Hire Date",
+            "Monthly Base Salary",
+            "Payment Detail",
+            "System Username",
+            "System Role",
+        ],
+        employees_rows,
+        sum_columns=[5],
+    ),
+    "attendance": ReportSheet(
+        "Attendance",
+        "Shift Attendance",
+        "Attendance records from {start_date} to {end_date}",
+        [
+            "Shift Date",
+            "Employee",
+            "Shift",
+            "Start",
+            "End",
+            "Status",
+            "Late (min)",
+            "Overtime (min)",
+            "Recorded By",
+            "Notes",
+        ],
+        attendance_rows,
+        sum_columns=[6, 7],
+    ),
+    "leaves": ReportSheet(
+        "Leaves",
+        "Leave Records",
+        "Leave records overlapping {start_date} to {end_date}",
+        [
+            "Employee",
+            "Type",
+            "Start Date",
+            "End Date",
+            "Days (Total)",
+            "Days (in period)",
+            "Notes",
+        ],
+        leaves_rows,
+        sum_columns=[4, 5],
+    ),
+    "payroll": ReportSheet(
+        "Payroll",
+        "Payroll Records",
+        "Payroll records overlapping {start_date} to {end_date}",
+        [
+            "Employee",
+            "Period Start",
+            "Period End",
+            "Base Salary",
+            "Amount Paid",
+            "Outstanding",
+            "Status",
+            "Paid At",
+            "Receipt Uploaded",
+            "Notes",
+        ],
+        payroll_rows,
+        sum_columns=[3, 4, 5],
+    ),
+    "purchases": ReportSheet(
+        "Purchases",
+        "Inventory Purchases",
+        "Purchase records from {start_date} to {end_date}",
+        [
+            "Date",
+            "Time",
+            "Purchase #",
+            "Ingredient",
+            "Quantity",
+            "Unit",
+            "Total Cost",
+            "Unit Cost",
+            "Vendor",
+            "Purchaser",
+            "Bank Account",
+            "Expense ID",
+            "Notes",
+        ],
+        purchases_rows,
+        sum_columns=[4, 6],
+    ),
+    "bank-accounts": ReportSheet(
+        "Bank Accounts",
+        "Bank Accounts",
+        "Current bank account setup and balances",
+        [
+            "Nickname",
+            "Bank",
+            "Account Number",
+            "Account Holder",
+            "Balance",
+            "Active",
+            "Linked Payment Methods",
+            "Updated At",
+        ],
+        bank_accounts_rows,
+        sum_columns=[4],
+    ),
+    "bank-transactions": ReportSheet(
+        "Bank Transactions",
+        "Bank Transactions",
+        "Deposits and withdrawals from {start_date} to {end_date}",
+        [
+            "Date",
+            "Time",
+            "Transaction #",
+            "Account",
+            "Type",
+            "Amount",
+            "Recorded By",
+            "Notes",
+        ],
+        bank_transactions_rows,
+        sum_columns=[5],
+    ),
+    "expenses": ReportSheet(
+        "Expenses",
+        "Expenses",
+        "Expenses recorded from {start_date} to {end_date}",
+        [
+            "Date",
+            "Time",
+            "Expense #",
+            "Title",
+            "Status",
+            "Amount",
+            "Bank Account",
+            "Recorded By",
+            "Source",
+            "Notes",
+        ],
+        expenses_rows,
+        sum_columns=[5],
+    ),
+}
+
+
+def parse_sheets(value):
+    """
+    Slugs from a comma-separated `?sheets=` value, in workbook order; every
+    sheet when empty. Raises ValueError naming unknown slugs.
+    """
+    requested = {slug.strip() for slug in (value or "").split(",") if slug.strip()}
+    if not requested:
+        return list(SHEETS)
+    unknown = requested - SHEETS.keys()
+    if unknown:
+        raise ValueError(
+            f"Unknown sheets: {', '.join(sorted(unknown))}. "
+            f"Choose from: {', '.join(SHEETS)}."
+        )
+    return [slug for slug in SHEETS if slug in requested]
@@ -0,0 +1,308 @@
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.utils import timezone
+
+from core.caching import bump_namespace
+from inventory.models import Ingredient, Purchase
+from production.models import IngredientUsage, Product, ProductionRun
+from sales.models import DailyClosing, PaymentMethod, Sale, SaleItem, SalePayment
+from treasury.models import BankAccount, BankTransaction, Expense
+from users.models import (
+    AttendanceRecord,
+    Employee,
+    LeaveRecord,
+    PayrollRecord,
+    ShiftAssignment,
+    ShiftTemplate,
+    User,
+)
+
+from .artifacts import (
+    DAY_NAMESPACE,
+    LIVE_NAMESPACE,
+    REFERENCE_NAMESPACE,
+    period_days,
+)
+from .financials import DAY_EDITS_NAMESPACE, refresh_days
+from .models import DashboardSnapshot
+
+
+def _sale_date(instance):
+    return timezone.localdate(instance.created_at)
+
+
+def _sale_line_date(instance):
+    return _sale_date(instance.sale)
+
+
+def _run_date(instance):
+    return timezone.localdate(instance.date_produced)
+
+
+def _usage_date(instance):
+    return _run_date(instance.production_run)
+
+
+# Model -> business day its rows are reported under
+SNAPSHOT_SOURCES = {
+    Sale: _sale_date,
+    SaleItem: _sale_line_date,
+    SalePayment: _sale_line_date,
+    ProductionRun: _run_date,
+    IngredientUsage: _usage_date,
+}
+
+
+# Bumped before a day's snapshot is dropped, so a dashboard computed while
+# the edit committed knows not to keep what it stored (see DashboardStatsView).
+SNAPSHOT_NAMESPACE = "dashboard-day:{}"
+
+
+def invalidate_snapshot(day):
+    """Drop the stored dashboard for `day` and any cached copies of it."""
+
+    def invalidate():
+        bump_namespace(SNAPSHOT_NAMESPACE.format(day))
+        DashboardSnapshot.objects.filter(date=day).delete()
+        bump_namespace("dashboard-stats")
+
+    transaction.on_commit(invalidate)
+
+
+def _on_change(sender, instance, **kwargs):
+    try:
+        day = SNAPSHOT_SOURCES[sender](instance)
+    except ObjectDoesNotExist:
+        # Parent already gone (cascade delete); its own signal covers it.
+        return
+    # Only closed days are snapshotted, so today's POS traffic costs nothing.
+    if day < timezone.localdate():
+        invalidate_snapshot(day)
+
+
+for model in SNAPSHOT_SOURCES:
+    post_save.connect(
+        _on_change, sender=model, dispatch_uid=f"snapshot-{model.__name__}"
+    )
+    post_delete.connect(
+        _on_change, sender=model, dispatch_uid=f"snapshot-delete-{model.__name__}"
+    )
+
+
+def _on_closing_delete(sender, instance, **kwargs):
+    # Only closed days are snapshotted; reopening one drops its snapshot.
+    invalidate_snapshot(instance.date)
+
+
+post_delete.connect(
+    _on_closing_delete, sender=DailyClosing, dispatch_uid="snapshot-closing-delete"
+)
+
+
+# ==========================================
+# Export artifact watermarks (reports.artifacts)
+# ==========================================
+
+
+def _payroll_days(record):
+    days = list(period_days(record.period_start, record.period_end))
+    if record.paid_at:
+        days.append(timezone.localdate(record.paid_at))
+    return days
+
+
+# Model -> business days whose exports show its rows
+EXPORT_SOURCES = {
+    Sale: lambda sale: [_sale_date(sale)],
+    SaleItem: lambda item: [_sale_line_date(item)],
+    SalePayment: lambda payment: [_sale_line_date(payment)],
+    ProductionRun: lambda run: [_run_date(run)],
+    IngredientUsage: lambda usage: [_usage_date(usage)],
+    Purchase: lambda purchase: [timezone.localdate(purchase.purchase_date)],
+    Expense: lambda expense: [timezone.localdate(expense.created_at)],
+    BankTransaction: lambda txn: [timezone.localdate(txn.created_at)],
+    ShiftAssignment: lambda assignment: [assignment.shift_date],
+    AttendanceRecord: lambda record: [record.assignment.shift_date],
+    LeaveRecord: lambda leave: period_days(leave.start_date, leave.end_date),
+    PayrollRecord: _payroll_days,
+}
+
+# Models whose dates can be edited; an edit also touches the old days.
+EDITABLE_DATES = (Expense, ShiftAssignment, LeaveRecord, PayrollRecord)
+
+# Fields a save may change without affecting what closed periods show
+VOLATILE_FIELDS = {
+    Product: {"stock_quantity"},
+    Ingredient: {"current_stock"},
+    BankAccount: {"balance"},
+    User: {"last_login"},
+}
+REFERENCE_MODELS = (
+    PaymentMethod,
+    Product,
+    Ingredient,
+    BankAccount,
+    User,
+    Employee,
+    ShiftTemplate,
+)
+# Shown as they are now (current stock, balances)
+LIVE_MODELS = (Product, BankAccount)
+
+
+class _AfterCommit:
+    """Work queued by the receivers below, done once the transaction commits."""
+
+    def __init__(self):
+        self.financial_days = set()
+        self.namespaces = set()
+
+    def run(self):
+        days, self.financial_days = self.financial_days, set()
+        namespaces, self.namespaces = self.namespaces, set()
+        try:
+            if days:
+                bump_namespace(*(DAY_EDITS_NAMESPACE.format(day) for day in days))
+                refresh_days(days)
+        finally:
+            # Exports are bumped last so one rebuilt under the new version
+            # already reads the refreshed P&L rows.
+            bump_namespace(*namespaces)
+
+
+def _after_commit(namespaces=(), financial_days=()):
+    # A POS checkout saves a sale, its items and payments and their stock;
+    # collect what they touch and handle it once, in a single callback.
+    connection = transaction.get_connection()
+    pending = getattr(connection, "_reports_after_commit", None)
+    if pending is None:
+        pending = connection._reports_after_commit = _AfterCommit()
+    pending.namespaces.update(namespaces)
+    pending.financial_days.update(financial_days)
+    # Queue the callback unless this transaction already has it (a rolled
+    # back savepoint discards it; what it had is then handled anyway).
+    if not any(func == pending.run for _, func, _ in connection.run_on_commit):
+        transaction.on_commit(pending.run)
+
+
+def _bump_on_commit(*namespaces):
+    _after_commit(namespaces=namespaces)
+
+
+def _remember_old_days(sender, instance, **kwargs):
+    old = (
+        sender._default_manager.filter(pk=instance.pk).first() if instance.pk else None
+    )
+    instance._export_old_days = list(EXPORT_SOURCES[sender](old)) if old else []
+
+
+def _on_dated_change(sender, instance, **kwargs):
+    try:
+        days = set(EXPORT_SOURCES[sender](instance))
+    except ObjectDoesNotExist:
+        return
+    days.update(getattr(instance, "_export_old_days", ()))
+    _bump_on_commit(*(DAY_NAMESPACE.format(day) for day in days))
+
+
+def _on_reference_change(sender, instance, update_fields=None, **kwargs):
+    namespaces = []
+    if update_fields is None or not set(update_fields) <= VOLATILE_FIELDS.get(
+        sender, set()
+    ):
+        namespaces.append(REFERENCE_NAMESPACE)
+    if sender in LIVE_MODELS:
+        namespaces.append(LIVE_NAMESPACE)
+    _bump_on_commit(*namespaces)
+
+
+def _on_linked_methods_change(sender, action, **kwargs):
+    if action.startswith("post_"):
+        _bump_on_commit(REFERENCE_NAMESPACE)
+
+
+for model in EXPORT_SOURCES:
+    post_save.connect(
+        _on_dated_change, sender=model, dispatch_uid=f"export-{model.__name__}"
+    )
+    post_delete.connect(
+        _on_dated_change, sender=model, dispatch_uid=f"export-delete-{model.__name__}"
+    )
+for model in EDITABLE_DATES:
+    pre_save.connect(
+        _remember_old_days, sender=model, dispatch_uid=f"export-old-{model.__name__}"
+    )
+for model in REFERENCE_MODELS:
+    post_save.connect(
+        _on_reference_change, sender=model, dispatch_uid=f"export-{model.__name__}"
+    )
+    post_delete.connect(
+        _on_reference_change,
+        sender=model,
+        dispatch_uid=f"export-delete-{model.__name__}",
+    )
+m2m_changed.connect(
+    _on_linked_methods_change,
+    sender=BankAccount.linked_payment_methods.through,
+    dispatch_uid="export-bank-account-methods",
+)
+
+
+# ==========================================
+# Materialized P&L rows (reports.financials)
+# ==========================================
+
+# Model -> the moment a row counts towards the P&L (None: not yet)
+FINANCIAL_SOURCES = {
+    Sale: lambda sale: sale.created_at,
+    Purchase: lambda purchase: purchase.purchase_date,
+    Expense: lambda expense: expense.created_at,
+    PayrollRecord: lambda record: record.paid_at,
+    ProductionRun: lambda run: run.date_produced,
+    IngredientUsage: lambda usage: usage.production_run.date_produced,
+}
+# Models whose P&L moment can be edited; an edit also touches the old day.
+EDITABLE_FINANCIAL_DATES = (Expense, PayrollRecord)
+
+
+def _financial_days(sender, instance):
+    moment = FINANCIAL_SOURCES[sender](instance)
+    return {timezone.localdate(moment)} if moment else set()
+
+
+def _remember_old_financial_day(sender, instance, **kwargs):
+    old = (
+        sender._default_manager.filter(pk=instance.pk).first() if instance.pk else None
+    )
+    instance._financials_old_days = _financial_days(sender, old) if old else set()
+
+
+def _on_financial_change(sender, instance, **kwargs):
+    try:
+        days = _financial_days(sender, instance)
+    except ObjectDoesNotExist:
+        return
+    days.update(getattr(instance, "_financials_old_days", ()))
+    # Only closed days are stored, so today's POS traffic costs nothing.
+    today = timezone.localdate()
+    days = {day for day in days if day < today}
+    if days:
+        _after_commit(financial_days=days)
+
+
+for model in FINANCIAL_SOURCES:
+    post_save.connect(
+        _on_financial_change, sender=model, dispatch_uid=f"pnl-{model.__name__}"
+    )
+    post_delete.connect(
+        _on_financial_change,
+        sender=model,
+        dispatch_uid=f"pnl-delete-{model.__name__}",
+    )
+for model in EDITABLE_FINANCIAL_DATES:
+    pre_save.connect(
+        _remember_old_financial_day,
+        sender=model,
+        dispatch_uid=f"pnl-old-{model.__name__}",
+    )
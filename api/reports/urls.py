@@ -1,8 +1,15 @@
 from django.urls import path
 
-from .views import DashboardStatsView, ExportReportView
+from .views import (
+    DashboardStatsView,
+    ExportReportView,
+    FinancialTrendView,
+    ReportSheetView,
+)
 
 urlpatterns = [
     path("dashboard-stats/", DashboardStatsView.as_view(), name="dashboard-stats"),
     path("export/", ExportReportView.as_view(), name="export-report"),
+    path("sheets/<slug:sheet>/", ReportSheetView.as_view(), name="report-sheet"),
+    path("financials/", FinancialTrendView.as_view(), name="financial-trend"),
 ]
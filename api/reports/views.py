@@ -1,1356 +1,410 @@
 from datetime import datetime
-from decimal import Decimal
+from functools import partial
 
-import openpyxl
-from django.db.models import Count, Q, Sum
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import Count, Sum
 from django.db.models.functions import TruncHour
-from django.http import HttpResponse
+from django.http import FileResponse, StreamingHttpResponse
 from django.utils import timezone
-from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
-from openpyxl.utils import get_column_letter
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.views import APIView
 
-from inventory.models import Purchase
+from core.caching import namespace_version, single_flight
+from core.concurrency import run_sections
+from core.db_routers import ReplicaReadMixin, pin_to_primary, reads_from_replica
+from core.filters import aware_date_range
+from core.renderers import CSVRenderer, csv_lines
 from production.models import IngredientUsage, Product, ProductionRun
 
 # --- App Imports ---
-from sales.models import Sale, SaleItem, SalePayment
-from treasury.models import BankAccount, BankTransaction, Expense
-from users.models import (
-    AttendanceRecord,
-    Employee,
-    LeaveRecord,
-    PayrollRecord,
-    ShiftAssignment,
-)
+from sales.models import DailyClosing, Sale, SaleItem, SalePayment
 
-# ==========================================
-# HELPER: Excel Styling & Formatting
-# ==========================================
-
-
-class ExcelStyler:
-    """
-    Handles design: Big titles, readable tables, simple colors.
-    """
-
-    def __init__(self):
-        # Professional but friendly colors (Navy Blue & White theme)
-        self.header_bg = "203764"  # Deep Navy Blue
-        self.header_text = "FFFFFF"  # White
-        self.total_bg = "DDEBF7"  # Very Light Blue
-        self.zebra_stripe = "F7F7F7"  # Almost white grey
-
-        # Borders
-        self.thin_border = Side(border_style="thin", color="BFBFBF")
-        self.thick_border = Side(border_style="medium", color="000000")
-        self.border_full = Border(
-            left=self.thin_border,
-            right=self.thin_border,
-            top=self.thin_border,
-            bottom=self.thin_border,
-        )
-
-        # Fonts
-        self.font_title = Font(name="Calibri", size=18, bold=True, color="203764")
-        self.font_subtitle = Font(name="Calibri", size=12, italic=True, color="595959")
-        self.font_header = Font(
-            name="Calibri", size=11, bold=True, color=self.header_text
-        )
-        self.font_total = Font(name="Calibri", size=11, bold=True)
-        self.font_body = Font(name="Calibri", size=11)
-
-        # Alignments
-        self.align_center = Alignment(horizontal="center", vertical="center")
-        self.align_left = Alignment(horizontal="left", vertical="center")
-        self.align_right = Alignment(horizontal="right", vertical="center")
-
-    def add_sheet_header(self, ws, title, subtitle, merge_cols=6):
-        """Adds the big text at the top of the sheet"""
-        ws["A1"] = title
-        ws["A1"].font = self.font_title
-
-        ws["A2"] = subtitle
-        ws["A2"].font = self.font_subtitle
-
-        # Merge cells slightly so text doesn't get cut off
-        end_col = get_column_letter(max(1, merge_cols))
-        ws.merge_cells(f"A1:{end_col}1")
-        ws.merge_cells(f"A2:{end_col}2")
-
-    def create_table(self, ws, headers, data, sum_columns=None):
-        """
-        Standard table generator.
-        """
-        if sum_columns is None:
-            sum_columns = []
-
-        start_row = 4
-
-        # 1. Write Headers
-        ws.append([])
-        ws.append(headers)  # Row 4
-
-        for cell in ws[start_row]:
-            cell.fill = PatternFill(
-                start_color=self.header_bg, end_color=self.header_bg, fill_type="solid"
-            )
-            cell.font = self.font_header
-            cell.alignment = self.align_center
-            cell.border = self.border_full
-
-        # 2. Write Data
-        totals = {col_idx: 0.0 for col_idx in sum_columns}
-
-        for i, row_data in enumerate(data):
-            ws.append(row_data)
-            current_row = ws[ws.max_row]
-
-            # Zebra Striping
-            is_even = i % 2 == 0
-            fill = (
-                PatternFill(
-                    start_color=self.zebra_stripe,
-                    end_color=self.zebra_stripe,
-                    fill_type="solid",
-                )
-                if is_even
-                else None
-            )
-
-            for col_idx, cell in enumerate(current_row):
-                cell.font = self.font_body
-                cell.border = self.border_full
-                if fill:
-                    cell.fill = fill
-
-                if isinstance(cell.value, bool):
-                    pass
-                elif isinstance(cell.value, int):
-                    cell.number_format = "#,##0"
-                elif isinstance(cell.value, (float, Decimal)):
-                    cell.number_format = "#,##0.00"
-
-                if col_idx in sum_columns and isinstance(
-                    cell.value, (int, float, Decimal)
-                ):
-                    totals[col_idx] += float(cell.value)
-
-        # 3. Write Totals Row
-        if sum_columns and data:
-            total_row_data = [""] * len(headers)
-            total_row_data[0] = "GRAND TOTAL"
-
-            for col_idx, total_val in totals.items():
-                total_row_data[col_idx] = total_val
-
-            ws.append(total_row_data)
-            row_cells = ws[ws.max_row]
-
-            for cell in row_cells:
-                cell.font = self.font_total
-                cell.fill = PatternFill(
-                    start_color=self.total_bg,
-                    end_color=self.total_bg,
-                    fill_type="solid",
-                )
-                cell.border = Border(
-                    top=self.thick_border,
-                    bottom=self.thick_border,
-                    left=self.thin_border,
-                    right=self.thin_border,
-                )
-                if isinstance(cell.value, bool):
-                    pass
-                elif isinstance(cell.value, int):
-                    cell.number_format = "#,##0"
-                elif isinstance(cell.value, (float, Decimal)):
-                    cell.number_format = "#,##0.00"
-
-        self.adjust_column_widths(ws)
-
-    def adjust_column_widths(self, ws):
-        """
-        Smart column width adjustment that handles Merged Cells correctly.
-        """
-        for col in ws.columns:
-            max_length = 0
-            # FIX: Use get_column_letter to avoid AttributeError on MergedCells
-            column_letter = get_column_letter(col[0].column)
-
-            for cell in col:
-                # Skip title rows
-                if cell.row < 3:
-                    continue
-                try:
-                    if cell.value:
-                        length = len(str(cell.value))
-                        if length > max_length:
-                            max_length = length
-                except Exception:
-                    pass
-
-            adjusted_width = max_length + 3
-            if adjusted_width < 12:
-                adjusted_width = 12
-            if adjusted_width > 50:
-                adjusted_width = 50
-
-            ws.column_dimensions[column_letter].width = adjusted_width
+from .artifacts import artifact_path, store_artifact
+from .financials import refresh_pending, trend
+from .models import DashboardSnapshot, PeriodFinancials
+from .sheets import SHEETS, ReportPeriod, parse_sheets
+from .signals import SNAPSHOT_NAMESPACE
 
+XLSX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
 
 # ==========================================
-# VIEW 1: JSON Dashboard Stats
+# HELPER: Dashboard Sections
 # ==========================================
 
 
-class DashboardStatsView(APIView):
-    permission_classes = [IsAuthenticated]
-
-    def get(self, request):
-        date_str = request.query_params.get("date")
-        if not date_str:
-            date_str = timezone.now().date().isoformat()
-
-        try:
-            target_date = datetime.strptime(date_str, "%Y-%m-%d").date()
-        except ValueError:
-            return Response(
-                {"error": "Invalid date format. Use YYYY-MM-DD."},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-
-        # 1. Hourly Sales
-        hourly_sales = (
-            Sale.objects.filter(created_at__date=target_date)
-            .annotate(hour=TruncHour("created_at"))
-            .values("hour")
-            .annotate(total=Sum("total_amount"))
-            .order_by("hour")
-        )
-
-        hourly_data = []
-        for item in hourly_sales:
-            hourly_data.append(
-                {"hour": item["hour"].strftime("%H:%M"), "total": float(item["total"])}
-            )
-
-        # 2. Top 5 Selling Products
-        top_products = (
-            SaleItem.objects.filter(sale__created_at__date=target_date)
-            .values("product__name")
-            .annotate(quantity=Sum("quantity"))
-            .order_by("-quantity")[:5]
+def _hourly_sales(day_start, day_end):
+    hourly_sales = (
+        Sale.objects.filter(created_at__gte=day_start, created_at__lt=day_end)
+        .annotate(hour=TruncHour("created_at"))
+        .values("hour")
+        .annotate(total=Sum("total_amount"))
+        .order_by("hour")
+    )
+
+    hourly_data = []
+    for item in hourly_sales:
+        hourly_data.append(
+            {"hour": item["hour"].strftime("%H:%M"), "total": float(item["total"])}
+        )
+    return hourly_data
+
+
+def _top_products(day_start, day_end):
+    top_products = (
+        SaleItem.objects.filter(
+            sale__created_at__gte=day_start, sale__created_at__lt=day_end
+        )
+        .values("product__name")
+        .annotate(quantity=Sum("quantity"))
+        .order_by("-quantity")[:5]
+    )
+
+    return [
+        {"name": item["product__name"], "quantity": float(item["quantity"])}
+        for item in top_products
+    ]
+
+
+def _payment_methods(day_start, day_end):
+    payment_methods = (
+        SalePayment.objects.filter(
+            sale__created_at__gte=day_start, sale__created_at__lt=day_end
+        )
+        .values("method__name")
+        .annotate(total=Sum("amount"))
+        .order_by("-total")
+    )
+
+    return [
+        {"name": item["method__name"], "value": float(item["total"])}
+        for item in payment_methods
+    ]
+
+
+def _production_vs_sales(day_start, day_end):
+    top_produced = (
+        ProductionRun.objects.filter(
+            date_produced__gte=day_start,
+            date_produced__lt=day_end,
+            product__isnull=False,
+        )
+        .values("product__name")
+        .annotate(produced=Sum("quantity_produced"))
+        .order_by("-produced")[:5]
+    )
+
+    prod_vs_sales_data = []
+    for item in top_produced:
+        product_name = item["product__name"]
+        produced_qty = float(item["produced"])
+        sold_qty = (
+            SaleItem.objects.filter(
+                sale__created_at__gte=day_start,
+                sale__created_at__lt=day_end,
+                product__name=product_name,
+            ).aggregate(total=Sum("quantity"))["total"]
+            or 0
         )
 
-        top_products_data = [
-            {"name": item["product__name"], "quantity": float(item["quantity"])}
-            for item in top_products
-        ]
-
-        # 3. Payment Method Distribution
-        payment_methods = (
-            SalePayment.objects.filter(sale__created_at__date=target_date)
-            .values("method__name")
-            .annotate(total=Sum("amount"))
-            .order_by("-total")
+        prod_vs_sales_data.append(
+            {
+                "name": product_name,
+                "produced": produced_qty,
+                "sold": float(sold_qty),
+            }
         )
+    return prod_vs_sales_data
 
-        payment_data = [
-            {"name": item["method__name"], "value": float(item["total"])}
-            for item in payment_methods
-        ]
 
-        # 4. Production vs Sales
-        top_produced = (
-            ProductionRun.objects.filter(
-                date_produced__date=target_date, product__isnull=False
-            )
-            .values("product__name")
-            .annotate(produced=Sum("quantity_produced"))
-            .order_by("-produced")[:5]
+def _wastage(day_start, day_end):
+    wastage = (
+        IngredientUsage.objects.filter(
+            production_run__date_produced__gte=day_start,
+            production_run__date_produced__lt=day_end,
         )
+        .values("ingredient__name")
+        .annotate(total_wastage=Sum("wastage"))
+        .order_by("-total_wastage")[:5]
+    )
 
-        prod_vs_sales_data = []
-        for item in top_produced:
-            product_name = item["product__name"]
-            produced_qty = float(item["produced"])
-            sold_qty = (
-                SaleItem.objects.filter(
-                    sale__created_at__date=target_date, product__name=product_name
-                ).aggregate(total=Sum("quantity"))["total"]
-                or 0
-            )
+    return [
+        {"name": item["ingredient__name"], "wastage": float(item["total_wastage"])}
+        for item in wastage
+    ]
 
-            prod_vs_sales_data.append(
-                {
-                    "name": product_name,
-                    "produced": produced_qty,
-                    "sold": float(sold_qty),
-                }
-            )
 
-        # 5. Wastage
-        wastage = (
-            IngredientUsage.objects.filter(
-                production_run__date_produced__date=target_date
-            )
-            .values("ingredient__name")
-            .annotate(total_wastage=Sum("wastage"))
-            .order_by("-total_wastage")[:5]
-        )
+def _cashier_performance(day_start, day_end):
+    cashier_perf = (
+        Sale.objects.filter(created_at__gte=day_start, created_at__lt=day_end)
+        .values("cashier__username", "cashier__full_name")
+        .annotate(total_sales=Sum("total_amount"), count=Count("id"))
+        .order_by("-total_sales")
+    )
 
-        wastage_data = [
-            {"name": item["ingredient__name"], "wastage": float(item["total_wastage"])}
-            for item in wastage
-        ]
-
-        # 6. Cashier
-        cashier_perf = (
-            Sale.objects.filter(created_at__date=target_date)
-            .values("cashier__username", "cashier__full_name")
-            .annotate(total_sales=Sum("total_amount"), count=Count("id"))
-            .order_by("-total_sales")
-        )
+    return [
+        {
+            "name": item["cashier__full_name"] or item["cashier__username"],
+            "sales": float(item["total_sales"]),
+            "count": item["count"],
+        }
+        for item in cashier_perf
+    ]
 
-        cashier_data = [
-            {
-                "name": item["cashier__full_name"] or item["cashier__username"],
-                "sales": float(item["total_sales"]),
-                "count": item["count"],
-            }
-            for item in cashier_perf
-        ]
 
-        # 7. Stock
-        products_in_stock = Product.objects.filter(stock_quantity__gt=0).count()
+def _products_in_stock(day_start, day_end):
+    return Product.objects.filter(stock_quantity__gt=0).count()
 
-        return Response(
-            {
-                "hourly_sales": hourly_data,
-                "top_products": top_products_data,
-                "payment_methods": payment_data,
-                "production_vs_sales": prod_vs_sales_data,
-                "wastage": wastage_data,
-                "cashier_performance": cashier_data,
-                "products_in_stock": products_in_stock,
-            }
-        )
+
+# Response key -> section, in response order
+DASHBOARD_SECTIONS = {
+    "hourly_sales": _hourly_sales,
+    "top_products": _top_products,
+    "payment_methods": _payment_methods,
+    "production_vs_sales": _production_vs_sales,
+    "wastage": _wastage,
+    "cashier_performance": _cashier_performance,
+    "products_in_stock": _products_in_stock,
+}
 
 
 # ==========================================
-# VIEW 2: Excel Report Export
+# VIEW 1: JSON Dashboard Stats
 # ==========================================
 
 
-class ExportReportView(APIView):
+class DashboardStatsView(ReplicaReadMixin, APIView):
     permission_classes = [IsAuthenticated]
 
+    @single_flight("dashboard-stats")
     def get(self, request):
-        start_date_str = request.query_params.get("start_date")
-        end_date_str = request.query_params.get("end_date")
-
-        if not start_date_str or not end_date_str:
-            return Response(
-                {"error": "start_date and end_date are required."},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
+        date_str = request.query_params.get("date")
+        if not date_str:
+            date_str = timezone.now().date().isoformat()
 
         try:
-            start_date = datetime.strptime(start_date_str, "%Y-%m-%d").date()
-            end_date = datetime.strptime(end_date_str, "%Y-%m-%d").date()
+            target_date = datetime.strptime(date_str, "%Y-%m-%d").date()
         except ValueError:
             return Response(
                 {"error": "Invalid date format. Use YYYY-MM-DD."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        wb = openpyxl.Workbook()
-        styler = ExcelStyler()
-
-        # ==========================================
-        # SHEET 1: OVERVIEW
-        # ==========================================
-        ws_overview = wb.active
-        ws_overview.title = "Business Snapshot"
-        ws_overview.sheet_view.showGridLines = False
-
-        total_money_in = (
-            Sale.objects.filter(
-                created_at__date__range=[start_date, end_date]
-            ).aggregate(Sum("total_amount"))["total_amount__sum"]
-            or 0
-        )
-        count_sales = Sale.objects.filter(
-            created_at__date__range=[start_date, end_date]
-        ).count()
-        avg_spend = total_money_in / count_sales if count_sales > 0 else 0
-
-        total_money_out = (
-            Purchase.objects.filter(
-                purchase_date__date__range=[start_date, end_date]
-            ).aggregate(Sum("total_cost"))["total_cost__sum"]
-            or 0
-        )
-
-        total_other_expenses_paid = (
-            Expense.objects.filter(
-                created_at__date__range=[start_date, end_date],
-                status=Expense.STATUS_PAID,
-                purchase__isnull=True,
-            ).aggregate(Sum("amount"))["amount__sum"]
-            or 0
-        )
-
-        total_payroll_paid = (
-            PayrollRecord.objects.filter(
-                paid_at__date__range=[start_date, end_date]
-            ).aggregate(Sum("amount_paid"))["amount_paid__sum"]
-            or 0
-        )
-
-        styler.add_sheet_header(
-            ws_overview, "Business Snapshot", f"Report from {start_date} to {end_date}"
-        )
-
-        def add_summary_line(row, label, value, is_money=False, bold_value=False):
-            cell_lbl = ws_overview.cell(row=row, column=2, value=label)
-            cell_val = ws_overview.cell(row=row, column=3, value=value)
-
-            cell_lbl.font = Font(name="Calibri", size=11)
-            cell_lbl.border = Border(bottom=Side(style="thin", color="CCCCCC"))
-
-            cell_val.font = Font(name="Calibri", size=11, bold=bold_value)
-            cell_val.alignment = Alignment(horizontal="right")
-            cell_val.border = Border(bottom=Side(style="thin", color="CCCCCC"))
-
-            if is_money:
-                cell_val.number_format = "#,##0.00"
-
-        ws_overview["B5"] = "Money Coming In"
-        ws_overview["B5"].font = Font(
-            name="Calibri", bold=True, size=12, color="203764"
-        )
-
-        add_summary_line(6, "Total Sales Amount", float(total_money_in), True, True)
-        add_summary_line(7, "Number of Sales Made", count_sales)
-        add_summary_line(8, "Avg. Amount per Customer", float(avg_spend), True)
-
-        ws_overview["B10"] = "Money Going Out"
-        ws_overview["B10"].font = Font(
-            name="Calibri", bold=True, size=12, color="203764"
-        )
-
-        add_summary_line(11, "Cost of Ingredients Bought", float(total_money_out), True)
-        add_summary_line(12, "Payroll Paid (HR)", float(total_payroll_paid), True)
-        add_summary_line(
-            13,
-            "Other Expenses Paid (Treasury)",
-            float(total_other_expenses_paid),
-            True,
-        )
+        # A closed day's figures no longer change; serve its stored snapshot.
+        is_past = target_date < timezone.localdate()
+        if is_past:
+            payload = (
+                DashboardSnapshot.objects.filter(date=target_date)
+                .values_list("payload", flat=True)
+                .first()
+            )
+            if payload is not None:
+                return Response(payload)
 
-        ws_overview["B14"] = "Estimated Profit"
-        ws_overview["B14"].font = Font(
-            name="Calibri", bold=True, size=12, color="203764"
+        # A closed day's figures are stored for good, so they must not come
+        # from a replica that may still lag behind the primary.
+        store = (
+            is_past
+            and DailyClosing.objects.using(DEFAULT_DB_ALIAS)
+            .filter(date=target_date)
+            .exists()
         )
+        if store:
+            pin_to_primary()
+            namespace = SNAPSHOT_NAMESPACE.format(target_date)
+            version = namespace_version(namespace)
 
-        est_profit = (
-            float(total_money_in)
-            - float(total_money_out)
-            - float(total_payroll_paid)
-            - float(total_other_expenses_paid)
-        )
-        ws_overview["B15"] = "Sales minus Purchases minus Payroll minus Other Expenses"
-        ws_overview["C15"] = est_profit
-        ws_overview["C15"].number_format = "#,##0.00"
-        ws_overview["C15"].font = Font(
-            bold=True, size=12, color="006100" if est_profit >= 0 else "9C0006"
-        )
-
-        ws_overview.column_dimensions["A"].width = 5
-        ws_overview.column_dimensions["B"].width = 30
-        ws_overview.column_dimensions["C"].width = 25
-
-        # ==========================================
-        # SHEET 2: SALES LIST
-        # ==========================================
-        ws_sales = wb.create_sheet("Sales List")
-        headers = [
-            "Date",
-            "Time",
-            "Sale #",
-            "Receipt Issued",
-            "Cashier Name",
-            "Items Sold",
-            "Total Bill",
-            "Amount Paid",
-            "Change",
-            "Payments",
-        ]
-        styler.add_sheet_header(
-            ws_sales,
-            "Detailed Sales List",
-            "List of sales made in the selected period",
-            merge_cols=len(headers),
-        )
+        day_start, day_end = aware_date_range(target_date, target_date)
 
-        sales_qs = (
-            Sale.objects.filter(created_at__date__range=[start_date, end_date])
-            .select_related("cashier")
-            .prefetch_related("items__product", "payments__method")
-            .order_by("-created_at")
+        # Independent sections, evaluated concurrently on separate connections
+        sections = run_sections(
+            {
+                name: partial(section, day_start, day_end)
+                for name, section in DASHBOARD_SECTIONS.items()
+            }
         )
 
-        data = []
-        for s in sales_qs:
-            items = ", ".join(
-                [f"{i.product.name} ({i.quantity})" for i in s.items.all()]
-            )
-            cashier_name = (
-                s.cashier.full_name
-                if s.cashier and s.cashier.full_name
-                else (s.cashier.username if s.cashier else "Unknown")
-            )
-            amount_paid = sum((p.amount for p in s.payments.all()), Decimal("0"))
-            change = max(Decimal("0"), amount_paid - s.total_amount)
-            payments_str = ", ".join(
-                [
-                    f"{p.method.name}: ETB {float(p.amount):.2f}"
-                    for p in s.payments.all()
-                ]
-            )
-
-            data.append(
-                [
-                    s.created_at.date(),
-                    s.created_at.time().strftime("%H:%M"),
-                    str(s.id),
-                    "Yes" if s.receipt_issued else "No",
-                    cashier_name,
-                    items,
-                    float(s.total_amount),
-                    float(amount_paid),
-                    float(change),
-                    payments_str,
-                ]
+        if store:
+            DashboardSnapshot.objects.update_or_create(
+                date=target_date, defaults={"payload": sections}
             )
+            # An edit to the day committed while the sections were computed
+            # and may be missing from them; don't keep them. Checked after
+            # storing, so an invalidation landing in between still wins.
+            if namespace_version(namespace) != version:
+                DashboardSnapshot.objects.filter(date=target_date).delete()
+        return Response(sections)
 
-        styler.create_table(ws_sales, headers, data, sum_columns=[6, 7, 8])
-
-        # ==========================================
-        # SHEET 3: BEST SELLERS
-        # ==========================================
-        ws_prod = wb.create_sheet("Best Sellers")
-
-        headers = [
-            "Item Name",
-            "Count Sold",
-            "Money Earned",
-            "Count Made in Kitchen",
-            "Current Stock",
-        ]
-        styler.add_sheet_header(
-            ws_prod,
-            "Product Performance",
-            "Which items are making the most money?",
-            merge_cols=len(headers),
-        )
-
-        products = Product.objects.filter(is_active=True)
-        data = []
-
-        for p in products:
-            sold_agg = SaleItem.objects.filter(
-                sale__created_at__date__range=[start_date, end_date], product=p
-            ).aggregate(q=Sum("quantity"), r=Sum("subtotal"))
-
-            prod_agg = ProductionRun.objects.filter(
-                date_produced__date__range=[start_date, end_date], product=p
-            ).aggregate(q=Sum("quantity_produced"))
-
-            qty_sold = sold_agg["q"] or 0
-            money_earned = float(sold_agg["r"] or 0)
-            qty_made = prod_agg["q"] or 0
-
-            if qty_sold > 0 or qty_made > 0:
-                data.append(
-                    [p.name, qty_sold, money_earned, qty_made, p.stock_quantity]
-                )
-
-        data.sort(key=lambda x: x[2], reverse=True)
-        styler.create_table(ws_prod, headers, data, sum_columns=[1, 2, 3])
-
-        # ==========================================
-        # SHEET 4: KITCHEN ACTIVITY (Merged & Styled)
-        # ==========================================
-        ws_run = wb.create_sheet("Kitchen Activity")
-        headers = [
-            "Date & Time",
-            "Chef Name",
-            "Item Made",
-            "Qty Made",
-            "Ingredient Used",
-            "Amount Used",
-            "Amount Wasted",
-        ]
-        styler.add_sheet_header(
-            ws_run,
-            "Production & Waste",
-            "What the kitchen made and what was wasted",
-            merge_cols=len(headers),
-        )
 
-        # 1. Write Headers
-        ws_run.append([])
-        ws_run.append(headers)  # Row 4
-
-        header_row_idx = 4
-        for cell in ws_run[header_row_idx]:
-            cell.fill = PatternFill(
-                start_color=styler.header_bg,
-                end_color=styler.header_bg,
-                fill_type="solid",
-            )
-            cell.font = styler.font_header
-            cell.alignment = styler.align_center
-            cell.border = styler.border_full
-
-        # 2. Fetch Data
-        usages = (
-            IngredientUsage.objects.filter(
-                production_run__date_produced__date__range=[start_date, end_date]
-            )
-            .select_related("production_run", "ingredient")
-            .order_by("-production_run__date_produced")
-        )  # Sort by run is crucial for merging
-
-        # 3. Custom Loop for Merging
-        current_row = 5
-        start_merge_row = 5
-        last_run_id = None
-
-        # Zebra Striping logic for groups requires tracking "group index"
-        group_idx = 0
-        fill_color = None
-
-        total_made = 0
-        total_used = 0
-        total_wasted = 0
-
-        # We append a 'dummy' None at the end to force the merge logic to
-        # trigger for the last group
-        usage_list = list(usages)
-        usage_list.append(None)
-
-        for u in usage_list:
-            if u is None:
-                # End of list, trigger last merge
-                run_id = -1
-            else:
-                run_id = u.production_run.id
-
-            # CHECK GROUP CHANGE
-            if last_run_id is not None and run_id != last_run_id:
-                # Merge the Previous Group (Cols A, B, C, D)
-                if current_row > start_merge_row:
-                    # Merge Date
-                    ws_run.merge_cells(
-                        start_row=start_merge_row,
-                        start_column=1,
-                        end_row=current_row - 1,
-                        end_column=1,
-                    )
-                    # Merge Chef
-                    ws_run.merge_cells(
-                        start_row=start_merge_row,
-                        start_column=2,
-                        end_row=current_row - 1,
-                        end_column=2,
-                    )
-                    # Merge Item
-                    ws_run.merge_cells(
-                        start_row=start_merge_row,
-                        start_column=3,
-                        end_row=current_row - 1,
-                        end_column=3,
-                    )
-                    # Merge Qty
-                    ws_run.merge_cells(
-                        start_row=start_merge_row,
-                        start_column=4,
-                        end_row=current_row - 1,
-                        end_column=4,
-                    )
-
-                    # Apply Vertical Center to the merged cells
-                    ws_run.cell(row=start_merge_row, column=1).alignment = Alignment(
-                        horizontal="center", vertical="center"
-                    )
-                    ws_run.cell(row=start_merge_row, column=2).alignment = Alignment(
-                        horizontal="center", vertical="center"
-                    )
-                    ws_run.cell(row=start_merge_row, column=3).alignment = Alignment(
-                        horizontal="center", vertical="center"
-                    )
-                    ws_run.cell(row=start_merge_row, column=4).alignment = Alignment(
-                        horizontal="center", vertical="center"
-                    )
-
-                start_merge_row = current_row
-                group_idx += 1
-
-            if u is None:
-                break  # Exit loop
-
-            # Prepare Colors for this group
-            if group_idx % 2 == 0:
-                fill_color = PatternFill(
-                    start_color=styler.zebra_stripe,
-                    end_color=styler.zebra_stripe,
-                    fill_type="solid",
-                )
-            else:
-                fill_color = None
-
-            # Get Values
-            run = u.production_run
-            item_name = (
-                run.product.name
-                if run.product
-                else (
-                    run.composite_ingredient.name
-                    if run.composite_ingredient
-                    else "Mix/Prep"
-                )
-            )
-            chef_name = (
-                run.chef.full_name
-                if run.chef and run.chef.full_name
-                else (run.chef.username if run.chef else "Unknown")
-            )
+# ==========================================
+# VIEW 2: Excel Report Export
+# ==========================================
 
-            # Format: YYYY-MM-DD HH:MM
-            dt_str = run.date_produced.strftime("%Y-%m-%d %H:%M")
-
-            # Write Row
-            ws_run.append(
-                [
-                    dt_str,
-                    chef_name,
-                    item_name,
-                    float(run.quantity_produced),
-                    u.ingredient.name,
-                    float(u.actual_amount),
-                    float(u.wastage),
-                ]
-            )
 
-            # Apply Styles to the new row
-            row_cells = ws_run[current_row]
-            for col_idx, cell in enumerate(row_cells):
-                cell.font = styler.font_body
-                cell.border = styler.border_full
-                if fill_color:
-                    cell.fill = fill_color
-
-                # Number formats
-                if col_idx in [3, 5, 6]:  # Qty, Used, Wasted
-                    cell.number_format = "#,##0.00"
-
-            # Add to Totals (Only add Production Qty once per group)
-            # Logic: If this is the FIRST row of a new group, add to production total.
-            # Usage totals are always added.
-            if run_id != last_run_id:
-                total_made += run.quantity_produced
-
-            total_used += u.actual_amount
-            total_wasted += u.wastage
-
-            last_run_id = run_id
-            current_row += 1
-
-        # 4. Totals Row for Kitchen
-        ws_run.append(["GRAND TOTAL", "", "", total_made, "", total_used, total_wasted])
-
-        last_row = ws_run[ws_run.max_row]
-        for cell in last_row:
-            cell.font = styler.font_total
-            cell.fill = PatternFill(
-                start_color=styler.total_bg,
-                end_color=styler.total_bg,
-                fill_type="solid",
-            )
-            cell.border = Border(
-                top=styler.thick_border,
-                bottom=styler.thick_border,
-                left=styler.thin_border,
-                right=styler.thin_border,
-            )
-            if isinstance(cell.value, (int, float)):
-                cell.number_format = "#,##0.00"
-
-        # Merge the empty cells in the total row for cleaner look (optional)
-        ws_run.merge_cells(
-            start_row=ws_run.max_row,
-            start_column=1,
-            end_row=ws_run.max_row,
-            end_column=3,
-        )
+def _report_period(request):
+    """(ReportPeriod, None) from start_date/end_date, or (None, 400 response)."""
+    start_date_str = request.query_params.get("start_date")
+    end_date_str = request.query_params.get("end_date")
 
-        styler.adjust_column_widths(ws_run)
-
-        # ==========================================
-        # SHEET 5: TEAM STATS
-        # ==========================================
-        ws_cashier = wb.create_sheet("Team Stats")
-
-        headers = [
-            "Staff Name",
-            "Total Money Collected",
-            "Customers Served",
-            "Avg Sale Amount",
-        ]
-        styler.add_sheet_header(
-            ws_cashier,
-            "Staff Performance",
-            "Who is selling the most?",
-            merge_cols=len(headers),
+    if not start_date_str or not end_date_str:
+        return None, Response(
+            {"error": "start_date and end_date are required."},
+            status=status.HTTP_400_BAD_REQUEST,
         )
 
-        c_stats = (
-            Sale.objects.filter(created_at__date__range=[start_date, end_date])
-            .values("cashier__full_name", "cashier__username")
-            .annotate(total=Sum("total_amount"), count=Count("id"))
-            .order_by("-total")
+    try:
+        start_date = datetime.strptime(start_date_str, "%Y-%m-%d").date()
+        end_date = datetime.strptime(end_date_str, "%Y-%m-%d").date()
+    except ValueError:
+        return None, Response(
+            {"error": "Invalid date format. Use YYYY-MM-DD."},
+            status=status.HTTP_400_BAD_REQUEST,
         )
+    return ReportPeriod(start_date, end_date), None
 
-        data = []
-        for c in c_stats:
-            name = c["cashier__full_name"] or c["cashier__username"] or "Unknown"
-            tot = float(c["total"])
-            cnt = c["count"]
-            avg = tot / cnt if cnt else 0
-            data.append([name, tot, cnt, avg])
-
-        styler.create_table(ws_cashier, headers, data, sum_columns=[1, 2])
-
-        # ==========================================
-        # SHEET 6: HR SNAPSHOT
-        # ==========================================
-        ws_hr = wb.create_sheet("HR Snapshot")
-        headers = ["Metric", "Value"]
-        styler.add_sheet_header(
-            ws_hr,
-            "HR Snapshot",
-            f"Staffing and payroll from {start_date} to {end_date}",
-            merge_cols=len(headers),
-        )
 
-        employees_count = Employee.objects.count()
-        total_monthly_salary = (
-            Employee.objects.aggregate(Sum("monthly_base_salary"))[
-                "monthly_base_salary__sum"
-            ]
-            or 0
-        )
+class ExportReportView(ReplicaReadMixin, APIView):
+    """
+    The Excel report. `?sheets=sales,payroll` limits it to those sheets
+    (slugs of reports.sheets.SHEETS); only they are computed.
+    """
 
-        scheduled_shifts = ShiftAssignment.objects.filter(
-            shift_date__range=[start_date, end_date]
-        ).count()
+    permission_classes = [IsAuthenticated]
 
-        attendance_qs = AttendanceRecord.objects.filter(
-            assignment__shift_date__range=[start_date, end_date]
-        )
-        attendance_count = attendance_qs.count()
-        attendance_by_status = {
-            item["status"]: item["count"]
-            for item in attendance_qs.values("status").annotate(count=Count("id"))
-        }
-        total_late_minutes = (
-            attendance_qs.aggregate(Sum("late_minutes"))["late_minutes__sum"] or 0
-        )
-        total_overtime_minutes = (
-            attendance_qs.aggregate(Sum("overtime_minutes"))["overtime_minutes__sum"]
-            or 0
-        )
+    def get(self, request):
+        period, error = _report_period(request)
+        if error:
+            return error
 
-        leaves_qs = LeaveRecord.objects.filter(
-            Q(start_date__lte=end_date) & Q(end_date__gte=start_date)
-        ).select_related("employee")
-        leave_count = leaves_qs.count()
-        leave_days_in_period = 0
-        for leave in leaves_qs:
-            overlap_start = max(leave.start_date, start_date)
-            overlap_end = min(leave.end_date, end_date)
-            leave_days_in_period += (overlap_end - overlap_start).days + 1
-
-        payroll_period_qs = PayrollRecord.objects.filter(
-            Q(period_start__lte=end_date) & Q(period_end__gte=start_date)
-        )
-        payroll_period_count = payroll_period_qs.count()
-        payroll_paid_count = payroll_period_qs.filter(
-            status=PayrollRecord.STATUS_PAID
-        ).count()
-        payroll_unpaid_count = payroll_period_qs.filter(
-            status=PayrollRecord.STATUS_UNPAID
-        ).count()
-
-        payroll_paid_in_period = (
-            PayrollRecord.objects.filter(
-                paid_at__date__range=[start_date, end_date]
-            ).aggregate(Sum("amount_paid"))["amount_paid__sum"]
-            or 0
-        )
+        try:
+            slugs = parse_sheets(request.query_params.get("sheets"))
+        except ValueError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        sheets = () if len(slugs) == len(SHEETS) else slugs
+
+        # A finished workbook is reused until a write it depends on lands.
+        # Open it straight away: a concurrent build with a newer watermark
+        # may delete it at any time.
+        path = artifact_path(period.start_date, period.end_date, sheets)
+        try:
+            workbook = open(path, "rb")
+            cache_state = "HIT"
+        except FileNotFoundError:
+            # The file is stored under the primary's watermark, so it must
+            # not be built from a replica that may lag behind it.
+            pin_to_primary()
+            workbook = store_artifact(path, self._workbook_writer(slugs, period))
+            cache_state = "MISS"
+
+        response = FileResponse(
+            workbook,
+            as_attachment=True,
+            filename=f"Shop_Report_{period.start_date}_{period.end_date}.xlsx",
+            content_type=XLSX_CONTENT_TYPE,
+        )
+        response["X-Cache"] = cache_state
+        return response
 
-        hr_data = [
-            ["Employees", employees_count],
-            ["Total Monthly Base Salary", float(total_monthly_salary)],
-            ["Shifts Scheduled", scheduled_shifts],
-            ["Attendance Records", attendance_count],
-            ["Present", attendance_by_status.get(AttendanceRecord.STATUS_PRESENT, 0)],
-            ["Late", attendance_by_status.get(AttendanceRecord.STATUS_LATE, 0)],
-            ["Absent", attendance_by_status.get(AttendanceRecord.STATUS_ABSENT, 0)],
-            ["Overtime", attendance_by_status.get(AttendanceRecord.STATUS_OVERTIME, 0)],
-            ["Total Late Minutes", total_late_minutes],
-            ["Total Overtime Minutes", total_overtime_minutes],
-            ["Leave Records", leave_count],
-            ["Leave Days (in period)", leave_days_in_period],
-            ["Payroll Records (overlapping)", payroll_period_count],
-            ["Payroll Paid Records", payroll_paid_count],
-            ["Payroll Unpaid Records", payroll_unpaid_count],
-            ["Payroll Paid (in period)", float(payroll_paid_in_period)],
-        ]
-        styler.create_table(ws_hr, headers, hr_data)
-
-        # ==========================================
-        # SHEET 7: EMPLOYEES
-        # ==========================================
-        ws_emp = wb.create_sheet("Employees")
-        headers = [
-            "Employee ID",
-            "Full Name",
-            "Position",
-            "Phone",
-            "Hire Date",
-            "Monthly Base Salary",
-            "Payment Detail",
-            "System Username",
-            "System Role",
-        ]
-        styler.add_sheet_header(
-            ws_emp, "Employees", "Employee directory", merge_cols=len(headers)
-        )
+    def _workbook_writer(self, slugs, period):
+        """Build the workbook; returns a callable writing it to a file."""
+        if settings.EXPORT_WORKERS > 0 and len(slugs) > 1:
+            from .parallel import build_sheet_parts, merge_sheet_parts
 
-        employees = Employee.objects.select_related("user").order_by("full_name")
-        data = []
-        for e in employees:
-            data.append(
-                [
-                    e.id,
-                    e.full_name,
-                    e.position,
-                    e.phone_number or "",
-                    e.hire_date,
-                    float(e.monthly_base_salary),
-                    e.payment_detail or "",
-                    e.user.username if e.user else "",
-                    e.user.role if e.user else "",
-                ]
-            )
-        styler.create_table(ws_emp, headers, data, sum_columns=[5])
-
-        # ==========================================
-        # SHEET 8: ATTENDANCE (Shift Attendance)
-        # ==========================================
-        ws_att = wb.create_sheet("Attendance")
-        headers = [
-            "Shift Date",
-            "Employee",
-            "Shift",
-            "Start",
-            "End",
-            "Status",
-            "Late (min)",
-            "Overtime (min)",
-            "Recorded By",
-            "Notes",
-        ]
-        styler.add_sheet_header(
-            ws_att,
-            "Shift Attendance",
-            f"Attendance records from {start_date} to {end_date}",
-            merge_cols=len(headers),
-        )
+            parts = build_sheet_parts(slugs, period, reads_from_replica())
+            names = [SHEETS[slug].name for slug in slugs]
+            return partial(merge_sheet_parts, names, parts)
 
-        assignments = (
-            ShiftAssignment.objects.filter(shift_date__range=[start_date, end_date])
-            .select_related("employee", "shift", "attendance__recorded_by")
-            .order_by("shift_date", "shift__start_time", "employee__full_name")
-        )
+        # openpyxl is imported on first export rather than at URLconf load,
+        # so workers that never export don't pay for it.
+        from .excel import build_workbook
 
-        data = []
-        for a in assignments:
-            att = getattr(a, "attendance", None)
-            recorded_by = ""
-            if att and att.recorded_by:
-                recorded_by = att.recorded_by.full_name or att.recorded_by.username
-
-            data.append(
-                [
-                    a.shift_date,
-                    a.employee.full_name,
-                    a.shift.name,
-                    a.shift.start_time.strftime("%H:%M"),
-                    a.shift.end_time.strftime("%H:%M"),
-                    att.get_status_display() if att else "Not recorded",
-                    att.late_minutes if att else 0,
-                    att.overtime_minutes if att else 0,
-                    recorded_by,
-                    att.notes if att and att.notes else "",
-                ]
-            )
+        return build_workbook(slugs, period).save
 
-        styler.create_table(ws_att, headers, data, sum_columns=[6, 7])
-
-        # ==========================================
-        # SHEET 9: LEAVES
-        # ==========================================
-        ws_leave = wb.create_sheet("Leaves")
-        headers = [
-            "Employee",
-            "Type",
-            "Start Date",
-            "End Date",
-            "Days (Total)",
-            "Days (in period)",
-            "Notes",
-        ]
-        styler.add_sheet_header(
-            ws_leave,
-            "Leave Records",
-            f"Leave records overlapping {start_date} to {end_date}",
-            merge_cols=len(headers),
-        )
 
-        leaves = (
-            LeaveRecord.objects.filter(
-                Q(start_date__lte=end_date) & Q(end_date__gte=start_date)
-            )
-            .select_related("employee")
-            .order_by("start_date", "employee__full_name")
-        )
+# ==========================================
+# VIEW 3: Single Report Sheet (JSON / CSV)
+# ==========================================
 
-        data = []
-        for leave in leaves:
-            overlap_start = max(leave.start_date, start_date)
-            overlap_end = min(leave.end_date, end_date)
-            days_in_period = (overlap_end - overlap_start).days + 1
-            data.append(
-                [
-                    leave.employee.full_name,
-                    leave.get_leave_type_display(),
-                    leave.start_date,
-                    leave.end_date,
-                    leave.day_count,
-                    days_in_period,
-                    leave.notes or "",
-                ]
-            )
 
-        styler.create_table(ws_leave, headers, data, sum_columns=[4, 5])
-
-        # ==========================================
-        # SHEET 10: PAYROLL
-        # ==========================================
-        ws_pay = wb.create_sheet("Payroll")
-        headers = [
-            "Employee",
-            "Period Start",
-            "Period End",
-            "Base Salary",
-            "Amount Paid",
-            "Outstanding",
-            "Status",
-            "Paid At",
-            "Receipt Uploaded",
-            "Notes",
-        ]
-        styler.add_sheet_header(
-            ws_pay,
-            "Payroll Records",
-            f"Payroll records overlapping {start_date} to {end_date}",
-            merge_cols=len(headers),
-        )
+class ReportSheetView(ReplicaReadMixin, APIView):
+    """
+    One sheet of the Excel report as JSON (headers and rows) or, with
+    `?format=csv` or `Accept: text/csv`, as a streamed CSV download.
+    """
 
-        payrolls = (
-            PayrollRecord.objects.filter(
-                Q(period_start__lte=end_date) & Q(period_end__gte=start_date)
-            )
-            .select_related("employee")
-            .order_by("period_start", "employee__full_name")
-        )
+    permission_classes = [IsAuthenticated]
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, CSVRenderer]
 
-        data = []
-        for p in payrolls:
-            outstanding = (p.base_salary or 0) - (p.amount_paid or 0)
-            data.append(
-                [
-                    p.employee.full_name,
-                    p.period_start,
-                    p.period_end,
-                    float(p.base_salary),
-                    float(p.amount_paid),
-                    float(outstanding),
-                    p.get_status_display(),
-                    p.paid_at.strftime("%Y-%m-%d %H:%M") if p.paid_at else "",
-                    "Yes" if p.receipt else "No",
-                    p.notes or "",
-                ]
+    def get(self, request, sheet):
+        if sheet not in SHEETS:
+            return Response(
+                {"error": f"Unknown sheet. Choose from: {', '.join(SHEETS)}."},
+                status=status.HTTP_404_NOT_FOUND,
             )
+        period, error = _report_period(request)
+        if error:
+            return error
 
-        styler.create_table(ws_pay, headers, data, sum_columns=[3, 4, 5])
-
-        # ==========================================
-        # SHEET 11: PURCHASES
-        # ==========================================
-        ws_purchases = wb.create_sheet("Purchases")
-        headers = [
-            "Date",
-            "Time",
-            "Purchase #",
-            "Ingredient",
-            "Quantity",
-            "Unit",
-            "Total Cost",
-            "Unit Cost",
-            "Vendor",
-            "Purchaser",
-            "Bank Account",
-            "Expense ID",
-            "Notes",
-        ]
-        styler.add_sheet_header(
-            ws_purchases,
-            "Inventory Purchases",
-            f"Purchase records from {start_date} to {end_date}",
-            merge_cols=len(headers),
-        )
-
-        purchases = (
-            Purchase.objects.filter(purchase_date__date__range=[start_date, end_date])
-            .select_related("ingredient", "purchaser", "expense", "expense__account")
-            .order_by("-purchase_date")
-        )
-
-        data = []
-        for p in purchases:
-            purchaser_name = (
-                (
-                    getattr(p.purchaser, "full_name", None)
-                    or getattr(p.purchaser, "username", None)
-                    or ""
-                )
-                if p.purchaser
-                else ""
-            )
-            bank_account_name = (
-                p.expense.account.name if p.expense and p.expense.account else ""
-            )
-            data.append(
-                [
-                    p.purchase_date.date(),
-                    p.purchase_date.time().strftime("%H:%M"),
-                    p.id,
-                    p.ingredient.name,
-                    float(p.quantity),
-                    p.ingredient.unit,
-                    float(p.total_cost),
-                    float(p.unit_cost),
-                    p.vendor or "",
-                    purchaser_name,
-                    bank_account_name,
-                    p.expense_id or "",
-                    p.notes or "",
-                ]
+        report_sheet = SHEETS[sheet]
+        if request.accepted_renderer.format == CSVRenderer.format:
+            response = StreamingHttpResponse(
+                csv_lines(report_sheet.headers, report_sheet.rows(period)),
+                content_type="text/csv; charset=utf-8",
             )
+            filename = f"{sheet}_{period.start_date}_{period.end_date}.csv"
+            response["Content-Disposition"] = f'attachment; filename="{filename}"'
+            return response
 
-        styler.create_table(ws_purchases, headers, data, sum_columns=[4, 6])
-
-        # ==========================================
-        # SHEET 12: BANK ACCOUNTS
-        # ==========================================
-        ws_bank_accounts = wb.create_sheet("Bank Accounts")
-        headers = [
-            "Nickname",
-            "Bank",
-            "Account Number",
-            "Account Holder",
-            "Balance",
-            "Active",
-            "Linked Payment Methods",
-            "Updated At",
-        ]
-        styler.add_sheet_header(
-            ws_bank_accounts,
-            "Bank Accounts",
-            "Current bank account setup and balances",
-            merge_cols=len(headers),
+        return Response(
+            {
+                "sheet": sheet,
+                "name": report_sheet.name,
+                "title": report_sheet.title,
+                "subtitle": report_sheet.get_subtitle(period),
+                "headers": report_sheet.headers,
+                "rows": list(report_sheet.rows(period)),
+            }
         )
 
-        accounts_qs = (
-            BankAccount.objects.all()
-            .prefetch_related("linked_payment_methods")
-            .order_by("name")
-        )
-        data = []
-        for a in accounts_qs:
-            linked_methods = ", ".join(
-                list(a.linked_payment_methods.values_list("name", flat=True))
-            )
-            data.append(
-                [
-                    a.name,
-                    a.bank_name,
-                    a.account_number,
-                    a.account_holder,
-                    float(a.balance),
-                    "Yes" if a.is_active else "No",
-                    linked_methods,
-                    a.updated_at.date(),
-                ]
-            )
 
-        styler.create_table(ws_bank_accounts, headers, data, sum_columns=[4])
-
-        # ==========================================
-        # SHEET 13: BANK TRANSACTIONS
-        # ==========================================
-        ws_bank_txns = wb.create_sheet("Bank Transactions")
-        headers = [
-            "Date",
-            "Time",
-            "Transaction #",
-            "Account",
-            "Type",
-            "Amount",
-            "Recorded By",
-            "Notes",
-        ]
-        styler.add_sheet_header(
-            ws_bank_txns,
-            "Bank Transactions",
-            f"Deposits and withdrawals from {start_date} to {end_date}",
-            merge_cols=len(headers),
-        )
+# ==========================================
+# VIEW 4: P&L Trend
+# ==========================================
 
-        bank_txns = (
-            BankTransaction.objects.filter(
-                created_at__date__range=[start_date, end_date]
-            )
-            .select_related("account", "recorded_by")
-            .order_by("-created_at")
-        )
 
-        data = []
-        for t in bank_txns:
-            recorded_by_name = (
-                (
-                    getattr(t.recorded_by, "full_name", None)
-                    or getattr(t.recorded_by, "username", None)
-                    or ""
-                )
-                if t.recorded_by
-                else ""
-            )
-            data.append(
-                [
-                    t.created_at.date(),
-                    t.created_at.time().strftime("%H:%M"),
-                    t.id,
-                    t.account.name,
-                    t.get_transaction_type_display(),
-                    float(t.amount),
-                    recorded_by_name,
-                    t.notes or "",
-                ]
-            )
+class FinancialTrendView(APIView):
+    """
+    Sales, estimated COGS, payroll, expenses and profit per day or month
+    (`?granularity=day|month`, default month) between start_date and
+    end_date, from the materialized PeriodFinancials rows. The current
+    period is marked `isFinal: false` and includes today's live figures.
+    """
 
-        styler.create_table(ws_bank_txns, headers, data, sum_columns=[5])
-
-        # ==========================================
-        # SHEET 14: EXPENSES
-        # ==========================================
-        ws_expenses = wb.create_sheet("Expenses")
-        headers = [
-            "Date",
-            "Time",
-            "Expense #",
-            "Title",
-            "Status",
-            "Amount",
-            "Bank Account",
-            "Recorded By",
-            "Source",
-            "Notes",
-        ]
-        styler.add_sheet_header(
-            ws_expenses,
-            "Expenses",
-            f"Expenses recorded from {start_date} to {end_date}",
-            merge_cols=len(headers),
-        )
+    permission_classes = [IsAuthenticated]
 
-        expenses = (
-            Expense.objects.filter(created_at__date__range=[start_date, end_date])
-            .select_related("account", "recorded_by")
-            .prefetch_related("purchase")
-            .order_by("-created_at")
+    def get(self, request):
+        granularity = request.query_params.get(
+            "granularity", PeriodFinancials.GRANULARITY_MONTH
         )
-
-        data = []
-        for e in expenses:
-            recorded_by_name = (
-                (
-                    getattr(e.recorded_by, "full_name", None)
-                    or getattr(e.recorded_by, "username", None)
-                    or ""
-                )
-                if e.recorded_by
-                else ""
-            )
-            try:
-                purchase = e.purchase
-            except Exception:
-                purchase = None
-
-            data.append(
-                [
-                    e.created_at.date(),
-                    e.created_at.time().strftime("%H:%M"),
-                    e.id,
-                    e.title,
-                    e.get_status_display(),
-                    float(e.amount),
-                    e.account.name if e.account else "",
-                    recorded_by_name,
-                    "Inventory purchase" if purchase else "Manual",
-                    e.notes or "",
-                ]
+        if granularity not in dict(PeriodFinancials.GRANULARITY_CHOICES):
+            return Response(
+                {"error": "granularity must be 'day' or 'month'."},
+                status=status.HTTP_400_BAD_REQUEST,
             )
+        period, error = _report_period(request)
+        if error:
+            return error
 
-        styler.create_table(ws_expenses, headers, data, sum_columns=[5])
-
-        # ==========================================
-        # RETURN FILE
-        # ==========================================
-        response = HttpResponse(
-            content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        # Normally a no-op; covers days closed since refresh_financials ran.
+        refresh_pending()
+        return Response(
+            {
+                "granularity": granularity,
+                "start_date": period.start_date,
+                "end_date": period.end_date,
+                "periods": trend(granularity, period.start_date, period.end_date),
+            }
         )
-        filename = f"Shop_Report_{start_date}_{end_date}.xlsx"
-        response["Content-Disposition"] = f"attachment; filename={filename}"
-        wb.save(response)
-        return response
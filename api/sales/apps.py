@@ -10,4 +10,8 @@ class SalesConfig(AppConfig):
         # Stock deduction for sales is handled in `SaleSerializer.create()` atomically.
         # We intentionally do NOT register sales signals to avoid
         # double-deducting stock.
-        pass
+        from core.conditional import track_resource
+
+        from .models import PaymentMethod
+
+        track_resource("payment-methods", PaymentMethod)
@@ -0,0 +1,497 @@
+import json
+import threading
+import time
+from collections import Counter
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Sum
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core.models import BakerySettings
+from inventory.models import Ingredient
+from production.models import Product, ProductionRun, Recipe, RecipeItem
+from production.views import ProductionRunViewSet
+from sales.models import PaymentMethod, Sale, SaleItem
+from sales.views import SaleViewSet
+from treasury.models import BankAccount
+
+FIXTURE_PREFIX = "loadtest"
+
+
+def _percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class _WorkerStats:
+    def __init__(self):
+        self.latencies = []
+        self.lock_wait = 0.0
+        self.lock_statements = 0
+        self.statuses = Counter()
+        self.errors = Counter()
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive concurrent simulated cashiers (and optionally chefs) through "
+        "SaleViewSet.create against the configured database and report "
+        "throughput, latency percentiles, lock waits and stock/balance anomalies."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--cashiers",
+            type=int,
+            default=8,
+            help="Number of concurrent cashier workers (default: 8).",
+        )
+        parser.add_argument(
+            "--sales-per-cashier",
+            type=int,
+            default=25,
+            help="Checkouts each cashier performs (default: 25).",
+        )
+        parser.add_argument(
+            "--products",
+            type=int,
+            default=1,
+            help="Distinct products to sell; 1 means everyone hits the same row.",
+        )
+        parser.add_argument(
+            "--items-per-sale",
+            type=int,
+            default=1,
+            help="Products per sale, picked round-robin (default: 1).",
+        )
+        parser.add_argument(
+            "--stock",
+            type=int,
+            default=10000,
+            help="Initial stock per product (default: 10000).",
+        )
+        parser.add_argument(
+            "--bank-sync",
+            action="store_true",
+            help="Link the payment method to a bank account and enable bank sync.",
+        )
+        parser.add_argument(
+            "--chefs",
+            type=int,
+            default=0,
+            help="Concurrent chef workers creating production runs (default: 0).",
+        )
+        parser.add_argument(
+            "--runs-per-chef",
+            type=int,
+            default=5,
+            help="Production runs each chef performs (default: 5).",
+        )
+        parser.add_argument(
+            "--keep",
+            action="store_true",
+            help="Keep the generated fixture rows instead of deleting them.",
+        )
+        parser.add_argument(
+            "--json",
+            action="store_true",
+            help="Print the report as JSON (for comparing runs).",
+        )
+
+    def handle(self, *args, **options):
+        if options["cashiers"] < 1 or options["sales_per_cashier"] < 1:
+            raise CommandError("--cashiers and --sales-per-cashier must be >= 1.")
+        if options["products"] < 1:
+            raise CommandError("--products must be >= 1.")
+
+        fixture = self._create_fixture(options)
+        try:
+            report = self._run(fixture, options)
+        finally:
+            if not options["keep"]:
+                self._cleanup(fixture)
+
+        if options["json"]:
+            self.stdout.write(json.dumps(report, indent=2, default=str))
+        else:
+            self._print_report(report)
+
+    # ------------------------------------------------------------------
+    # Fixture
+    # ------------------------------------------------------------------
+
+    def _create_fixture(self, options):
+        User = get_user_model()
+        run_tag = f"{FIXTURE_PREFIX}-{int(time.time())}"
+
+        cashiers = [
+            User.objects.create_user(
+                username=f"{run_tag}-cashier-{i}", password=None, role="cashier"
+            )
+            for i in range(options["cashiers"])
+        ]
+        chefs = [
+            User.objects.create_user(
+                username=f"{run_tag}-chef-{i}", password=None, role="chef"
+            )
+            for i in range(options["chefs"])
+        ]
+
+        products = [
+            Product.objects.create(
+                name=f"{run_tag}-bread-{i}",
+                selling_price=Decimal("10.00"),
+                stock_quantity=options["stock"],
+            )
+            for i in range(options["products"])
+        ]
+
+        ingredient = None
+        if chefs:
+            ingredient = Ingredient.objects.create(
+                name=f"{run_tag}-flour",
+                current_stock=Decimal("1000000"),
+                average_cost_per_unit=Decimal("1.00"),
+            )
+            for product in products:
+                recipe = Recipe.objects.create(product=product, standard_yield=10)
+                RecipeItem.objects.create(
+                    recipe=recipe, ingredient=ingredient, quantity=Decimal("1.000")
+                )
+
+        method = PaymentMethod.objects.create(name=f"{run_tag}-cash")
+
+        bank_account = None
+        settings = BakerySettings.get_instance()
+        original_sync = settings.sync_sales_to_bank_accounts
+        if options["bank_sync"]:
+            bank_account = BankAccount.objects.create(
+                name=f"{run_tag}-till",
+                bank_name="Load Test",
+                account_holder="Load Test",
+                account_number=run_tag,
+            )
+            bank_account.linked_payment_methods.add(method)
+            if not original_sync:
+                settings.sync_sales_to_bank_accounts = True
+                settings.save(update_fields=["sync_sales_to_bank_accounts"])
+
+        return {
+            "tag": run_tag,
+            "cashiers": cashiers,
+            "chefs": chefs,
+            "products": products,
+            "ingredient": ingredient,
+            "method": method,
+            "bank_account": bank_account,
+            "original_sync": original_sync,
+        }
+
+    def _cleanup(self, fixture):
+        product_ids = [p.id for p in fixture["products"]]
+        Sale.objects.filter(cashier__in=fixture["cashiers"]).delete()
+        ProductionRun.objects.filter(product_id__in=product_ids).delete()
+        Recipe.objects.filter(product_id__in=product_ids).delete()
+        Product.objects.filter(id__in=product_ids).delete()
+        if fixture["ingredient"]:
+            fixture["ingredient"].delete()
+        if fixture["bank_account"]:
+            fixture["bank_account"].delete()
+        fixture["method"].delete()
+        for user in fixture["cashiers"] + fixture["chefs"]:
+            user.delete()
+
+        settings = BakerySettings.get_instance()
+        if settings.sync_sales_to_bank_accounts != fixture["original_sync"]:
+            settings.sync_sales_to_bank_accounts = fixture["original_sync"]
+            settings.save(update_fields=["sync_sales_to_bank_accounts"])
+
+    # ------------------------------------------------------------------
+    # Load
+    # ------------------------------------------------------------------
+
+    def _run(self, fixture, options):
+        factory = APIRequestFactory()
+        # Throttling would cap the load generator itself, not the code under test.
+        sale_view = SaleViewSet.as_view({"post": "create"}, throttle_classes=[])
+        run_view = ProductionRunViewSet.as_view({"post": "create"}, throttle_classes=[])
+
+        product_ids = [p.id for p in fixture["products"]]
+        method_id = fixture["method"].id
+        items_per_sale = max(1, options["items_per_sale"])
+        barrier = threading.Barrier(len(fixture["cashiers"]) + len(fixture["chefs"]))
+
+        def lock_timer(stats):
+            def wrapper(execute, sql, params, many, context):
+                is_lock = "FOR UPDATE" in sql.upper()
+                started = time.perf_counter()
+                try:
+                    return execute(sql, params, many, context)
+                finally:
+                    if is_lock:
+                        stats.lock_wait += time.perf_counter() - started
+                        stats.lock_statements += 1
+
+            return wrapper
+
+        def drive(user, make_request, view, count, stats):
+            try:
+                with connection.execute_wrapper(lock_timer(stats)):
+                    barrier.wait()
+                    for n in range(count):
+                        request = make_request(n)
+                        force_authenticate(request, user=user)
+                        started = time.perf_counter()
+                        try:
+                            response = view(request)
+                            stats.statuses[response.status_code] += 1
+                        except Exception as exc:
+                            stats.errors[type(exc).__name__] += 1
+                        stats.latencies.append(time.perf_counter() - started)
+            finally:
+                connection.close()
+
+        def sale_request(offset):
+            def make(n):
+                start = offset + n * items_per_sale
+                items = [
+                    {
+                        "productId": product_ids[(start + k) % len(product_ids)],
+                        "quantity": 1,
+                    }
+                    for k in range(items_per_sale)
+                ]
+                return factory.post(
+                    "/api/v1/sales/sales/",
+                    {
+                        "itemsInput": items,
+                        "paymentsInput": [
+                            {"methodId": method_id, "amount": str(10 * len(items))}
+                        ],
+                    },
+                    format="json",
+                )
+
+            return make
+
+        def run_request(offset):
+            def make(n):
+                product_id = product_ids[(offset + n) % len(product_ids)]
+                return factory.post(
+                    "/api/v1/production/runs/",
+                    {"product": product_id, "quantityProduced": "10"},
+                    format="json",
+                )
+
+            return make
+
+        sale_stats = [_WorkerStats() for _ in fixture["cashiers"]]
+        run_stats = [_WorkerStats() for _ in fixture["chefs"]]
+
+        threads = [
+            threading.Thread(
+                target=drive,
+                args=(
+                    user,
+                    sale_request(i),
+                    sale_view,
+                    options["sales_per_cashier"],
+                    sale_stats[i],
+                ),
+            )
+            for i, user in enumerate(fixture["cashiers"])
+        ] + [
+            threading.Thread(
+                target=drive,
+                args=(
+                    user,
+                    run_request(i),
+                    run_view,
+                    options["runs_per_chef"],
+                    run_stats[i],
+                ),
+            )
+            for i, user in enumerate(fixture["chefs"])
+        ]
+
+        # The main thread's connection must not hold a transaction open while
+        # the workers contend for the same rows.
+        connection.close()
+
+        wall_started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        wall_time = time.perf_counter() - wall_started
+
+        report = {
+            "database": connection.vendor,
+            "wall_time_seconds": round(wall_time, 3),
+            "sales": self._summarize(sale_stats, wall_time),
+            "integrity": self._check_integrity(fixture, options),
+        }
+        if run_stats:
+            report["production_runs"] = self._summarize(run_stats, wall_time)
+        return report
+
+    def _summarize(self, stats_list, wall_time):
+        latencies = sorted(lat for s in stats_list for lat in s.latencies)
+        statuses = Counter()
+        errors = Counter()
+        for s in stats_list:
+            statuses.update(s.statuses)
+            errors.update(s.errors)
+        succeeded = sum(v for k, v in statuses.items() if 200 <= k < 300)
+        lock_wait = sum(s.lock_wait for s in stats_list)
+        lock_statements = sum(s.lock_statements for s in stats_list)
+
+        return {
+            "requests": len(latencies),
+            "succeeded": succeeded,
+            "throughput_per_second": round(succeeded / wall_time, 2)
+            if wall_time
+            else 0.0,
+            "latency_ms": {
+                "p50": round(_percentile(latencies, 50) * 1000, 2),
+                "p95": round(_percentile(latencies, 95) * 1000, 2),
+                "p99": round(_percentile(latencies, 99) * 1000, 2),
+                "max": round(latencies[-1] * 1000, 2) if latencies else 0.0,
+            },
+            "lock_wait_ms": {
+                "total": round(lock_wait * 1000, 2),
+                "statements": lock_statements,
+                "avg": round(lock_wait / lock_statements * 1000, 3)
+                if lock_statements
+                else 0.0,
+            },
+            "status_codes": {str(k): v for k, v in sorted(statuses.items())},
+            "errors": dict(errors),
+        }
+
+    def _check_integrity(self, fixture, options):
+        products = []
+        for product in Product.objects.filter(
+            id__in=[p.id for p in fixture["products"]]
+        ):
+            sold = (
+                SaleItem.objects.filter(product=product).aggregate(q=Sum("quantity"))[
+                    "q"
+                ]
+                or 0
+            )
+            produced = int(
+                ProductionRun.objects.filter(product=product).aggregate(
+                    q=Sum("quantity_produced")
+                )["q"]
+                or 0
+            )
+            expected = options["stock"] + produced - sold
+            products.append(
+                {
+                    "product": product.name,
+                    "sold": sold,
+                    "produced": produced,
+                    "expected_stock": expected,
+                    "actual_stock": product.stock_quantity,
+                    "oversold": product.stock_quantity < 0,
+                    "lost_update": product.stock_quantity != expected,
+                }
+            )
+
+        bank = None
+        if fixture["bank_account"]:
+            account = BankAccount.objects.get(pk=fixture["bank_account"].pk)
+            synced = Sale.objects.filter(cashier__in=fixture["cashiers"]).aggregate(
+                t=Sum("payments__amount")
+            )["t"] or Decimal("0")
+            bank = {
+                "account": account.name,
+                "balance": account.balance,
+                "expected_balance": synced,
+                "drift": account.balance - synced,
+            }
+
+        return {
+            "products": products,
+            "oversold_products": sum(1 for p in products if p["oversold"]),
+            "lost_updates": sum(1 for p in products if p["lost_update"]),
+            "negative_bank_balances": BankAccount.objects.filter(balance__lt=0).count(),
+            "bank_sync": bank,
+        }
+
+    # ------------------------------------------------------------------
+    # Output
+    # ------------------------------------------------------------------
+
+    def _print_report(self, report):
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Load test finished on {report['database']} in "
+                f"{report['wall_time_seconds']}s"
+            )
+        )
+        sections = [("Checkouts", report["sales"])]
+        if "production_runs" in report:
+            sections.append(("Production runs", report["production_runs"]))
+
+        for title, summary in sections:
+            latency = summary["latency_ms"]
+            lock = summary["lock_wait_ms"]
+            self.stdout.write(f"\n{title}")
+            self.stdout.write(
+                f"  requests: {summary['requests']}  "
+                f"succeeded: {summary['succeeded']}  "
+                f"throughput: {summary['throughput_per_second']}/s"
+            )
+            self.stdout.write(
+                f"  latency ms  p50={latency['p50']}  p95={latency['p95']}  "
+                f"p99={latency['p99']}  max={latency['max']}"
+            )
+            self.stdout.write(
+                f"  lock wait ms  total={lock['total']}  "
+                f"statements={lock['statements']}  avg={lock['avg']}"
+            )
+            self.stdout.write(f"  status codes: {summary['status_codes']}")
+            if summary["errors"]:
+                self.stdout.write(self.style.WARNING(f"  errors: {summary['errors']}"))
+
+        integrity = report["integrity"]
+        self.stdout.write("\nIntegrity")
+        for product in integrity["products"]:
+            self.stdout.write(
+                f"  {product['product']}: sold={product['sold']} "
+                f"produced={product['produced']} "
+                f"stock={product['actual_stock']} "
+                f"(expected {product['expected_stock']})"
+            )
+        if integrity["bank_sync"]:
+            bank = integrity["bank_sync"]
+            self.stdout.write(
+                f"  {bank['account']}: balance={bank['balance']} "
+                f"(expected {bank['expected_balance']})"
+            )
+
+        problems = (
+            integrity["oversold_products"]
+            + integrity["lost_updates"]
+            + integrity["negative_bank_balances"]
+        )
+        if integrity["bank_sync"] and integrity["bank_sync"]["drift"]:
+            problems += 1
+        if problems:
+            self.stdout.write(
+                self.style.ERROR(
+                    f"  oversold={integrity['oversold_products']} "
+                    f"lost_updates={integrity['lost_updates']} "
+                    f"negative_balances={integrity['negative_bank_balances']}"
+                )
+            )
+        else:
+            self.stdout.write(self.style.SUCCESS("  no oversell or negative balances"))
@@ -0,0 +1,22 @@
+# Generated by Django 6.0 on 2026-10-19 10:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('production', '0006_ingredientusage_production__ingredi_0209f0_idx'),
+        ('sales', '0004_sale_receipt_issued'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='saleitem',
+            index=models.Index(fields=['product', 'sale'], name='sales_salei_product_be8a4f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='salepayment',
+            index=models.Index(fields=['method', 'sale'], name='sales_salep_method__ffcd7b_idx'),
+        ),
+    ]
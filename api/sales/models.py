@@ -57,6 +57,11 @@ class SaleItem(models.Model):
     )  # Price AT TIME OF SALE
     subtotal = models.DecimalField(max_digits=10, decimal_places=2)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["product", "sale"]),
+        ]
+
     def save(self, *args, **kwargs):
         self.subtotal = self.unit_price * self.quantity
         super().save(*args, **kwargs)
@@ -71,6 +76,11 @@ class SalePayment(models.Model):
     method = models.ForeignKey(PaymentMethod, on_delete=models.PROTECT)
     amount = models.DecimalField(max_digits=10, decimal_places=2)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["method", "sale"]),
+        ]
+
 
 class DailyClosing(models.Model):
     """
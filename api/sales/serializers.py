@@ -2,6 +2,7 @@ from django.db import transaction
 from django.db.models import F
 from rest_framework import serializers
 
+from core.tracing import span
 from production.models import Product
 
 from .models import DailyClosing, PaymentMethod, Sale, SaleItem, SalePayment
@@ -61,7 +62,11 @@ class SaleSerializer(serializers.ModelSerializer):
         # Handle both Sale instance and dict (during creation)
         if isinstance(obj, dict):
             return []
-        return list(obj.payments.values("method__name", "amount"))
+        # Reads the viewset's prefetch rather than querying once per sale.
+        return [
+            {"method__name": payment.method.name, "amount": payment.amount}
+            for payment in obj.payments.all()
+        ]
 
     def create(self, validated_data):
         items_data = validated_data.pop("items_input", None)
@@ -73,12 +78,13 @@ class SaleSerializer(serializers.ModelSerializer):
         if not payments_data:
             raise serializers.ValidationError("payments_input is required.")
 
-        with transaction.atomic():
+        with span("sale.create", items=len(items_data)), transaction.atomic():
             # 1. Create Sale
-            sale = Sale.objects.create(
-                cashier=self.context["request"].user,
-                receipt_issued=receipt_issued,
-            )
+            with span("sale.insert"):
+                sale = Sale.objects.create(
+                    cashier=self.context["request"].user,
+                    receipt_issued=receipt_issued,
+                )
 
             total_amount = 0
 
@@ -94,9 +100,10 @@ class SaleSerializer(serializers.ModelSerializer):
                     )
 
                 try:
-                    product = Product.objects.select_for_update().get(
-                        id=product_id, is_active=True
-                    )
+                    with span("sale.lock_product", product_id=product_id):
+                        product = Product.objects.select_for_update().get(
+                            id=product_id, is_active=True
+                        )
                 except Product.DoesNotExist:
                     raise serializers.ValidationError(
                         f"Product with id {product_id} not found or inactive"
@@ -111,18 +118,20 @@ class SaleSerializer(serializers.ModelSerializer):
 
                 price = product.selling_price
 
-                SaleItem.objects.create(
-                    sale=sale,
-                    product=product,
-                    quantity=qty,
-                    unit_price=price,
-                    subtotal=price * qty,
-                )
+                with span("sale.insert_item", product_id=product_id):
+                    SaleItem.objects.create(
+                        sale=sale,
+                        product=product,
+                        quantity=qty,
+                        unit_price=price,
+                        subtotal=price * qty,
+                    )
                 total_amount += price * qty
 
                 # Deduct stock
-                product.stock_quantity = F("stock_quantity") - qty
-                product.save(update_fields=["stock_quantity"])
+                with span("sale.update_stock", product_id=product_id):
+                    product.stock_quantity = F("stock_quantity") - qty
+                    product.save(update_fields=["stock_quantity"])
 
             # 3. Process Payments
             payment_total = 0
@@ -144,7 +153,8 @@ class SaleSerializer(serializers.ModelSerializer):
                         f"Payment method with id {method_id} not found or inactive"
                     )
 
-                SalePayment.objects.create(sale=sale, method=method, amount=amount)
+                with span("sale.insert_payment", method_id=method_id):
+                    SalePayment.objects.create(sale=sale, method=method, amount=amount)
                 payment_entries.append((method, amount))
                 payment_total += amount
 
@@ -155,7 +165,8 @@ class SaleSerializer(serializers.ModelSerializer):
                 )
 
             sale.total_amount = total_amount
-            sale.save()
+            with span("sale.save_total"):
+                sale.save()
 
             apply_sale_bank_sync(
                 payment_entries, "add", note=f"Sale #{sale.id} created"
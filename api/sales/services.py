@@ -3,6 +3,7 @@ from decimal import Decimal
 from django.db import transaction
 
 from core.models import BakerySettings
+from core.tracing import traced
 from treasury.models import BankAccount, BankTransaction
 from treasury.services import record_bank_activity
 
@@ -13,6 +14,7 @@ def _normalize_amount(amount) -> Decimal:
     return Decimal(str(amount))
 
 
+@traced("sale.bank_sync")
 @transaction.atomic
 def apply_sale_bank_sync(payment_entries, direction: str, note: str = "") -> None:
     """
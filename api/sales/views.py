@@ -1,16 +1,19 @@
-from datetime import datetime
 from decimal import Decimal
 
 from django.contrib.auth import get_user_model
 from django.db import transaction
 from django.db.models import Count, F, Sum
 from django.utils import timezone
-from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.dateparse import parse_datetime
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import permissions, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
+from core.conditional import ConditionalGetMixin
+from core.filters import DateRangeFilterBackend, date_range_kwargs
+from core.streaming import StreamingListMixin
+
 from .models import DailyClosing, PaymentMethod, Sale, SaleItem, SalePayment
 from .serializers import DailyClosingSerializer, PaymentMethodSerializer, SaleSerializer
 from .services import apply_sale_bank_sync
@@ -40,7 +43,7 @@ class IsAdmin(permissions.BasePermission):
         return request.user.role == "admin"
 
 
-class PaymentMethodViewSet(viewsets.ModelViewSet):
+class PaymentMethodViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """
     Admin can manage payment methods (CRUD).
     Cashiers can see active methods (read-only).
@@ -49,6 +52,7 @@ class PaymentMethodViewSet(viewsets.ModelViewSet):
     queryset = PaymentMethod.objects.all()
     serializer_class = PaymentMethodSerializer
     permission_classes = [IsAdmin]
+    etag_resources = ("payment-methods",)
 
     def get_queryset(self):
         # Admins see all, others see only active
@@ -57,7 +61,7 @@ class PaymentMethodViewSet(viewsets.ModelViewSet):
         return PaymentMethod.objects.filter(is_active=True)
 
 
-class SaleViewSet(viewsets.ModelViewSet):
+class SaleViewSet(StreamingListMixin, viewsets.ModelViewSet):
     queryset = (
         Sale.objects.select_related("cashier")
         .prefetch_related("items__product", "payments__method")
@@ -65,8 +69,9 @@ class SaleViewSet(viewsets.ModelViewSet):
     )
     serializer_class = SaleSerializer
     permission_classes = [IsCashierOrAdmin]
-    filter_backends = [DjangoFilterBackend]
+    filter_backends = [DjangoFilterBackend, DateRangeFilterBackend]
     filterset_fields = ["cashier", "receipt_issued"]
+    date_range_field = "created_at"
 
     def get_queryset(self):
         queryset = super().get_queryset()
@@ -76,28 +81,6 @@ class SaleViewSet(viewsets.ModelViewSet):
         if getattr(user, "role", None) == "cashier":
             queryset = queryset.filter(cashier=user)
 
-        # Use aware datetime boundaries instead of `created_at__date` extraction.
-        # This avoids DB timezone/date-cast differences across environments.
-        current_tz = timezone.get_current_timezone()
-
-        start_date_raw = self.request.query_params.get("start_date")
-        if start_date_raw:
-            start_date = parse_date(start_date_raw)
-            if start_date:
-                start_dt = timezone.make_aware(
-                    datetime.combine(start_date, datetime.min.time()), current_tz
-                )
-                queryset = queryset.filter(created_at__gte=start_dt)
-
-        end_date_raw = self.request.query_params.get("end_date")
-        if end_date_raw:
-            end_date = parse_date(end_date_raw)
-            if end_date:
-                end_dt = timezone.make_aware(
-                    datetime.combine(end_date, datetime.max.time()), current_tz
-                )
-                queryset = queryset.filter(created_at__lte=end_dt)
-
         return queryset
 
     @action(detail=False, methods=["get"], url_path="cashier-statement")
@@ -274,6 +257,8 @@ class SaleViewSet(viewsets.ModelViewSet):
 class DailyClosingViewSet(viewsets.ModelViewSet):
     queryset = DailyClosing.objects.order_by("-date")
     serializer_class = DailyClosingSerializer
+    filter_backends = [DateRangeFilterBackend]
+    date_range_field = "date"
     permission_classes = [permissions.IsAuthenticated]  # Cashier needs to Create
 
     def create(self, request, *args, **kwargs):
@@ -292,7 +277,9 @@ class DailyClosingViewSet(viewsets.ModelViewSet):
             )
 
         # 1. System Calculation
-        todays_sales = Sale.objects.filter(created_at__date=today)
+        todays_sales = Sale.objects.filter(
+            **date_range_kwargs("created_at", today, today)
+        )
         total_expected = (
             todays_sales.aggregate(Sum("total_amount"))["total_amount__sum"] or 0
         )
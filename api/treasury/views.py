@@ -3,6 +3,9 @@ from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, permissions, viewsets
 from rest_framework.exceptions import ValidationError
 
+from core.filters import DateRangeFilterBackend
+from core.streaming import StreamingListMixin
+
 from .models import BankAccount, BankTransaction, Expense
 from .serializers import (
     BankAccountSerializer,
@@ -35,15 +38,17 @@ class BankAccountViewSet(viewsets.ModelViewSet):
     ordering_fields = ["name", "bank_name", "balance", "updated_at", "created_at"]
 
 
-class BankTransactionViewSet(viewsets.ModelViewSet):
+class BankTransactionViewSet(StreamingListMixin, viewsets.ModelViewSet):
     queryset = BankTransaction.objects.select_related("account", "recorded_by").all()
     serializer_class = BankTransactionSerializer
     permission_classes = [IsAdminUser]
     filter_backends = [
         DjangoFilterBackend,
+        DateRangeFilterBackend,
         filters.SearchFilter,
         filters.OrderingFilter,
     ]
+    date_range_field = "created_at"
     filterset_fields = ["account", "transaction_type"]
     search_fields = [
         "notes",
@@ -54,14 +59,7 @@ class BankTransactionViewSet(viewsets.ModelViewSet):
     ordering_fields = ["created_at", "amount"]
 
     def get_queryset(self):
-        queryset = super().get_queryset().order_by("-created_at")
-        start_date = self.request.query_params.get("start_date")
-        end_date = self.request.query_params.get("end_date")
-        if start_date:
-            queryset = queryset.filter(created_at__gte=start_date)
-        if end_date:
-            queryset = queryset.filter(created_at__lte=end_date)
-        return queryset
+        return super().get_queryset().order_by("-created_at")
 
     def perform_create(self, serializer):
         serializer.save(recorded_by=self.request.user)
@@ -83,15 +81,17 @@ class BankTransactionViewSet(viewsets.ModelViewSet):
         instance.delete()
 
 
-class ExpenseViewSet(viewsets.ModelViewSet):
+class ExpenseViewSet(StreamingListMixin, viewsets.ModelViewSet):
     queryset = Expense.objects.select_related("account", "recorded_by").all()
     serializer_class = ExpenseSerializer
     permission_classes = [IsAdminUser]
     filter_backends = [
         DjangoFilterBackend,
+        DateRangeFilterBackend,
         filters.SearchFilter,
         filters.OrderingFilter,
     ]
+    date_range_field = "created_at"
     filterset_fields = ["status", "account"]
     search_fields = [
         "title",
@@ -104,14 +104,7 @@ class ExpenseViewSet(viewsets.ModelViewSet):
     ordering_fields = ["created_at", "amount"]
 
     def get_queryset(self):
-        queryset = super().get_queryset().order_by("-created_at")
-        start_date = self.request.query_params.get("start_date")
-        end_date = self.request.query_params.get("end_date")
-        if start_date:
-            queryset = queryset.filter(created_at__gte=start_date)
-        if end_date:
-            queryset = queryset.filter(created_at__lte=end_date)
-        return queryset
+        return super().get_queryset().order_by("-created_at")
 
     def perform_create(self, serializer):
         serializer.save(recorded_by=self.request.user)
@@ -0,0 +1,17 @@
+# Generated by Django 6.0 on 2026-10-19 09:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0008_alter_leaverecord_leave_type'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='payrollrecord',
+            index=models.Index(fields=['paid_at'], name='users_payro_paid_at_fbe5bc_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 6.0 on 2026-10-19 10:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0009_payrollrecord_users_payro_paid_at_fbe5bc_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='leaverecord',
+            index=models.Index(fields=['employee', 'start_date', 'end_date'], name='users_leave_employe_69fc2d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='shiftassignment',
+            index=models.Index(fields=['-shift_date', 'employee'], name='users_shift_shift_d_5a1c12_idx'),
+        ),
+    ]
@@ -92,6 +92,9 @@ class ShiftAssignment(models.Model):
     class Meta:
         unique_together = ("employee", "shift", "shift_date")
         ordering = ["-shift_date", "employee_id"]
+        indexes = [
+            models.Index(fields=["-shift_date", "employee"]),
+        ]
 
     def __str__(self):
         return f"{self.employee.full_name} - {self.shift.name} ({self.shift_date})"
@@ -155,6 +158,9 @@ class LeaveRecord(models.Model):
 
     class Meta:
         ordering = ["-start_date"]
+        indexes = [
+            models.Index(fields=["employee", "start_date", "end_date"]),
+        ]
 
     def __str__(self):
         return f"{self.employee.full_name} - {self.leave_type}"
@@ -192,6 +198,9 @@ class PayrollRecord(models.Model):
     class Meta:
         unique_together = ("employee", "period_start", "period_end")
         ordering = ["-period_start"]
+        indexes = [
+            models.Index(fields=["paid_at"]),
+        ]
 
     def __str__(self):
         return f"{self.employee.full_name} - {self.period_start:%Y-%m}"
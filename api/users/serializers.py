@@ -1,6 +1,7 @@
 from decimal import Decimal
 
 from django.contrib.auth import get_user_model
+from django.db.models import Sum
 from django.utils import timezone
 from rest_framework import serializers
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
@@ -660,14 +661,9 @@ class WasteSummarySerializer(serializers.Serializer):
 
     @classmethod
     def from_queryset(cls, usages):
-        total_volume = Decimal("0")
-        total_value = Decimal("0")
-        for usage in usages:
-            wastage = usage.wastage or Decimal("0")
-            total_volume += wastage
-            cost = usage.ingredient.average_cost_per_unit or Decimal("0")
-            total_value += wastage * cost
+        # Valued at each usage's recorded cost (IngredientUsage.wastage_cost)
+        totals = usages.aggregate(volume=Sum("wastage"), value=Sum("wastage_cost"))
         return {
-            "total_wastage_volume": total_volume,
-            "total_wastage_value": total_value,
+            "total_wastage_volume": totals["volume"] or Decimal("0"),
+            "total_wastage_value": totals["value"] or Decimal("0"),
         }
@@ -13,6 +13,7 @@ from rest_framework.response import Response
 from rest_framework_simplejwt.views import TokenObtainPairView
 
 from audit.models import AuditLog
+from core.filters import DateRangeFilterBackend, date_range_kwargs
 from inventory.models import Ingredient, Purchase
 from notifications.models import NotificationLog
 from production.models import Product, ProductionRun, Recipe
@@ -534,12 +535,13 @@ class EmployeeViewSet(viewsets.ModelViewSet):
 
             usages = IngredientUsage.objects.filter(
                 production_run__chef=employee.user,
-                production_run__date_produced__date__range=(
+                **date_range_kwargs(
+                    "production_run__date_produced",
                     record.period_start,
                     record.period_end,
                 ),
                 wastage__gt=0,
-            ).select_related("ingredient")
+            )
             waste_summary = WasteSummarySerializer.from_queryset(usages)
 
         payload = {
@@ -566,9 +568,11 @@ class EmployeeViewSet(viewsets.ModelViewSet):
 
         usages = IngredientUsage.objects.filter(
             production_run__chef=employee.user,
-            production_run__date_produced__date__range=(period_start, period_end),
+            **date_range_kwargs(
+                "production_run__date_produced", period_start, period_end
+            ),
             wastage__gt=0,
-        ).select_related("ingredient")
+        )
 
         return Response(
             {
@@ -592,8 +596,13 @@ class ShiftAssignmentViewSet(viewsets.ModelViewSet):
     queryset = ShiftAssignment.objects.select_related("employee", "shift").all()
     serializer_class = ShiftAssignmentSerializer
     permission_classes = [IsAdmin]
-    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
+    filter_backends = [
+        DjangoFilterBackend,
+        DateRangeFilterBackend,
+        filters.OrderingFilter,
+    ]
     filterset_fields = ["employee", "shift", "shift_date"]
+    date_range_field = "shift_date"
     ordering_fields = ["shift_date", "created_at"]
 
     @action(detail=False, methods=["post"], permission_classes=[IsAdmin])
@@ -707,8 +716,13 @@ class AttendanceRecordViewSet(viewsets.ModelViewSet):
     ).all()
     serializer_class = AttendanceRecordSerializer
     permission_classes = [IsAdmin]
-    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
+    filter_backends = [
+        DjangoFilterBackend,
+        DateRangeFilterBackend,
+        filters.OrderingFilter,
+    ]
     filterset_fields = ["assignment__employee", "status"]
+    date_range_field = "assignment__shift_date"
     ordering_fields = ["recorded_at"]
 
     @action(detail=False, methods=["post"], permission_classes=[IsAdmin])
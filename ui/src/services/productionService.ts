@@ -426,6 +426,8 @@ class ProductionService {
                     usage.actualAmount?.toString() || usage.actual_amount?.toString() || "0"
                 ),
                 wastage: parseFloat(usage.wastage?.toString() || "0"),
+                unit_cost: usage.unitCost != null ? Number(usage.unitCost) : null,
+                extended_cost: usage.extendedCost != null ? Number(usage.extendedCost) : null,
             })),
         };
     }
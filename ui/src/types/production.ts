@@ -84,6 +84,8 @@ export interface IngredientUsage {
     theoretical_amount: number;
     actual_amount: number;
     wastage: number;
+    unit_cost?: number | null;
+    extended_cost?: number | null;
 }
 
 export interface ProductionRun {